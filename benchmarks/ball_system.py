@@ -0,0 +1,69 @@
+"""Benchmark of the struct-of-arrays BallSystem against one system per ball.
+
+Launches N balls at random towards the hoop and reports the mean time of a
+physics tick when all of them live in one BallSystem (vectorized) and when
+every ball owns a one-slot system (the cost of per-object physics).
+
+Usage:
+    python -m benchmarks.ball_system [--counts 1 10 100 1000 10000] [--ticks 60]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from game.ball_system import BallSystem
+from game.hoop import BasketHoop
+
+GROUND_Y = 580
+
+
+def launch(system, count, rng):
+    """Add count balls to a system and shoot them with random velocities."""
+    slots = np.array([system.add(150, 400) for _ in range(count)])
+    velocity = np.column_stack((rng.uniform(6, 30, count), rng.uniform(-30, 0, count)))
+    system.shoot(slots, velocity, velocity[:, 0] * 0.01)
+
+
+def time_ticks(systems, hoop, ticks):
+    """Return the mean time of one tick of every system."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for system in systems:
+            system.step(0.5, 1.0, GROUND_Y, hoop)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--max-scalar", type=int, default=1000,
+                        help="largest count also run with one system per ball")
+    args = parser.parse_args()
+
+    hoop = BasketHoop(650, 200, GROUND_Y)
+    print(f"{'balls':>8}{'vectorized ms':>16}{'per-ball ms':>14}{'speedup':>10}")
+    for count in args.counts:
+        system = BallSystem(count)
+        launch(system, count, np.random.default_rng(0))
+        vectorized = time_ticks([system], hoop, args.ticks)
+
+        per_ball = ""
+        speedup = ""
+        if count <= args.max_scalar:
+            rng = np.random.default_rng(0)
+            systems = []
+            for _ in range(count):
+                single = BallSystem(1)
+                launch(single, 1, rng)
+                systems.append(single)
+            elapsed = time_ticks(systems, hoop, args.ticks)
+            per_ball = f"{elapsed * 1000:.2f}"
+            speedup = f"{elapsed / vectorized:.1f}"
+        print(f"{count:>8}{vectorized * 1000:>16.2f}{per_ball:>14}{speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Scaling benchmark for the tiled (threads) and banded (processes) rasterizers.
+
+Builds a heavy scene (many balls plus large textured polygons), renders it
+with 1 to N workers on each backend and reports the frame time and the
+speedup over one worker. Every result is checked against a reference drawn
+by the pixel-by-pixel primitives (scanline_texture, draw_circle,
+circle_scanline, draw_line_bresenham), so a kernel that disagrees with them
+shows up, not only a parallel split that disagrees with serial rendering.
+
+Usage:
+    python -m benchmarks.parallel_rasterizers [--max-workers N] [--balls 400] [--frames 5]
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from graphic.banded import BandRasterizer
+from graphic.drawlist import DirectDraw, DrawList
+from graphic.tiled import TiledRenderer, render_serial
+
+
+def build_scene(painter, width, height, balls, seed=0):
+    """
+    Draw a scene with textured polygons and many basketballs.
+
+    Args:
+        painter (DrawList | DirectDraw): Records the scene, or draws it
+            right away with the pixel primitives.
+        width (int): Framebuffer width.
+        height (int): Framebuffer height.
+        balls (int): Number of balls.
+        seed (int): Random seed.
+
+    Returns:
+        The painter.
+    """
+    rng = random.Random(seed)
+    texture = pygame.image.load("game/textures/grass.jpg")
+
+    # Large textured polygons (court and walls)
+    painter.texture_polygon(
+        [(0, height // 2), (width, height // 2), (width, height), (0, height)],
+        [(0, 0), (16, 0), (16, 8), (0, 8)],
+        texture
+    )
+    for _ in range(4):
+        x, y = rng.randrange(width), rng.randrange(height)
+        painter.texture_polygon(
+            [(x, y), (x + 300, y + 40), (x + 260, y + 280), (x - 30, y + 220)],
+            [(0, 0), (3, 0), (3, 3), (0, 3)],
+            texture
+        )
+
+    # Balls: outline, scanline fill and details
+    for _ in range(balls):
+        r = rng.randrange(8, 40)
+        x, y = rng.randrange(width), rng.randrange(height)
+        painter.circle(x, y, r, (0, 0, 0))
+        painter.fill_circle(x, y, r, (255, 165, 0), (0, 0, 0))
+        painter.line(x - r, y, x + r, y, (0, 0, 0))
+        painter.line(x, y - r, x, y + r, (0, 0, 0))
+    return painter
+
+
+def time_frames(render, frames):
+    """Return the mean time of a render call, after one warm-up frame."""
+    render()
+    start = time.perf_counter()
+    for _ in range(frames):
+        render()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    """Run the benchmark and print a scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--balls", type=int, default=400)
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    pygame.init()
+    width, height = args.width, args.height
+    drawlist = build_scene(DrawList(width, height), width, height, args.balls)
+
+    # Reference frame drawn by the pixel primitives themselves
+    reference = pygame.Surface((width, height))
+    reference.fill((0, 0, 0))
+    start = time.perf_counter()
+    build_scene(DirectDraw(reference), width, height, args.balls)
+    pixels = time.perf_counter() - start
+    expected = pygame.surfarray.array3d(reference)
+
+    surface = pygame.Surface((width, height))
+    surface.fill((0, 0, 0))
+    serial = time_frames(lambda: render_serial(drawlist, surface), args.frames)
+    matches = bool(np.array_equal(pygame.surfarray.array3d(surface), expected))
+    print(f"{len(drawlist)} commands at {width}x{height}, pixel primitives: {pixels * 1000:.0f} ms, "
+          f"serial kernels: {serial * 1000:.1f} ms/frame (identical: {matches})")
+    print(f"{'backend':<10}{'workers':>8}{'ms/frame':>12}{'speedup':>10}{'identical':>11}")
+
+    for backend in ("threads", "processes"):
+        base = None
+        for workers in range(1, args.max_workers + 1):
+            if backend == "threads":
+                surface = pygame.Surface((width, height))
+                surface.fill((0, 0, 0))
+                renderer = TiledRenderer(workers=workers)
+                elapsed = time_frames(lambda: renderer.render(drawlist, surface), args.frames)
+                result = pygame.surfarray.array3d(surface)
+            else:
+                renderer = BandRasterizer(width, height, workers=workers)
+                renderer.framebuffer.fill((0, 0, 0))
+                elapsed = time_frames(lambda: renderer.render(drawlist), args.frames)
+                result = renderer.framebuffer.pixels.copy()
+            renderer.close()
+
+            base = base or elapsed
+            identical = bool(np.array_equal(result, expected))
+            print(f"{backend:<10}{workers:>8}{elapsed * 1000:>12.1f}{base / elapsed:>10.2f}{str(identical):>11}")
+
+
+if __name__ == "__main__":
+    main()
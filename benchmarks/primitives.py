@@ -0,0 +1,318 @@
+"""Microbenchmarks of every rasterization primitive, with a regression gate.
+
+Runs each function of graphic/shapes.py, graphic/scan_line.py,
+graphic/floodfill.py, graphic/clipping.py and animation/animation.py on an
+offscreen surface across a size sweep (line length, radius, polygon side,
+fill area), and reports calls/s and pixels/s. The pixels a call writes are
+counted once per case with the profiler's set_pixel hook; the timed calls
+run the original functions. Times are the best of several rounds.
+
+--save-baseline stores the results as JSON; --baseline compares a run to
+one and exits with status 1 when a case got slower than the tolerance.
+
+Usage:
+    python -m benchmarks.primitives [--quick] [--filter circle]
+        [--save-baseline PATH] [--baseline PATH] [--tolerance 0.25]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from collections import namedtuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from animation import animation
+from graphic import clipping, floodfill, scan_line, shapes
+from graphic.profiling import PIXELS, Profiler
+
+SIZE = 512  # Side of the offscreen surface
+WINDOW = (0, 0, SIZE // 2 - 1, SIZE // 2 - 1)  # Clip window: shapes centered on its corner are half clipped
+CENTER = SIZE // 2
+COLOR = (255, 140, 0)
+BORDER = (0, 0, 0)
+
+Case = namedtuple("Case", "module name unit sizes make")
+Case.__doc__ = """Benchmarked function and its size sweep.
+
+make(function, surface, size) returns (run, reset): run() makes one call,
+reset() (or None) restores the surface before it, untimed.
+"""
+
+
+def square(side, x=CENTER, y=CENTER):
+    """Return the corners of a square centered on a point."""
+    h = side // 2
+    return [(x - h, y - h), (x + h, y - h), (x + h, y + h), (x - h, y + h)]
+
+
+def _texture():
+    """Return a small checkered texture."""
+    texture = pygame.Surface((64, 64))
+    for y in range(64):
+        for x in range(64):
+            texture.set_at((x, y), (40, 160, 40) if (x // 8 + y // 8) % 2 else (90, 200, 90))
+    return texture
+
+
+def _flood(function, surface, side):
+    """Flood fill the inside of a square outline, redrawn before every call."""
+    points = square(side)
+
+    def reset():
+        surface.fill((255, 255, 255))
+        shapes.draw_polygon(surface, points, BORDER)
+
+    return (lambda: function(surface, CENTER, CENTER, COLOR, BORDER)), reset
+
+
+def _sky(function, surface, side):
+    """Fill a square sky surface of a given side."""
+    sky = pygame.Surface((side, side))
+    return (lambda: function(sky, (30, 80, 180), (180, 220, 255))), None
+
+
+def _texture_polygon(function, surface, side):
+    """Texture map a square polygon."""
+    texture = _texture()
+    points = square(side)
+    uvs = [(0, 0), (4, 0), (4, 4), (0, 4)]
+    return (lambda: function(surface, points, uvs, texture, 64, 64)), None
+
+
+def _polygon(*args, clipped=False):
+    """Return a make() drawing a square, half outside the clip window if clipped."""
+    def make(function, surface, side):
+        points = square(side, *WINDOW[2:]) if clipped else square(side)
+        return (lambda: function(surface, points, *args)), None
+    return make
+
+
+def _points(*args):
+    """Return a make() calling the function with one point list built per size."""
+    def make(function, surface, size):
+        points = [(i, i) for i in range(size)]
+        return (lambda: function(points, *args)), None
+    return make
+
+
+def _call(*args):
+    """Return a make() calling the function with fixed arguments."""
+    return lambda function, surface, size: ((lambda: function(*args)), None)
+
+
+CASES = [
+    # graphic/shapes.py
+    Case(shapes, "set_pixel", "n", (1,),
+         lambda f, s, n: ((lambda: f(s, CENTER, CENTER, COLOR)), None)),
+    Case(shapes, "draw_line_bresenham", "length", (16, 128, 512),
+         lambda f, s, n: ((lambda: f(s, 0, 0, n * 4 // 5, n * 3 // 5, COLOR)), None)),
+    Case(shapes, "draw_polygon", "side", (16, 128, 480), _polygon(COLOR)),
+    Case(shapes, "draw_polygon_clipping", "side", (16, 128, 480), _polygon(WINDOW, COLOR, clipped=True)),
+    Case(shapes, "draw_circle", "r", (4, 32, 200),
+         lambda f, s, n: ((lambda: f(s, CENTER, CENTER, n, COLOR)), None)),
+    Case(shapes, "draw_arc", "r", (4, 32, 200),
+         lambda f, s, n: ((lambda: f(s, CENTER - n // 2, CENTER, n, CENTER, CENTER, n, COLOR)), None)),
+    Case(shapes, "draw_ellipse", "a", (8, 64, 240),
+         lambda f, s, n: ((lambda: f(s, CENTER, CENTER, n, n // 2, COLOR)), None)),
+    Case(shapes, "draw_hoop_net_basic", "a", (8, 32, 120),
+         lambda f, s, n: ((lambda: f(s, CENTER, CENTER - n // 2, n, n, COLOR)), None)),
+    Case(shapes, "draw_circle_clipping", "r", (4, 32, 200),
+         lambda f, s, n: ((lambda: f(s, *WINDOW[2:], n, *WINDOW, COLOR)), None)),
+    Case(shapes, "draw_arc_clipping", "r", (4, 32, 200),
+         lambda f, s, n: ((lambda: f(s, WINDOW[2] - n // 2, WINDOW[3], n, *WINDOW[2:], n, *WINDOW, COLOR)), None)),
+    Case(shapes, "draw_ellipse_clipping", "a", (8, 64, 240),
+         lambda f, s, n: ((lambda: f(s, *WINDOW[2:], n, n // 2, *WINDOW, COLOR)), None)),
+
+    # graphic/scan_line.py
+    Case(scan_line, "circle_scanline", "r", (4, 32, 200),
+         lambda f, s, n: ((lambda: f(s, CENTER, CENTER, n, COLOR, BORDER)), None)),
+    Case(scan_line, "hoop_scanline", "a", (8, 32, 120),
+         lambda f, s, n: ((lambda: f(s, CENTER, CENTER, n, n // 4, n - 4, max(1, n // 4 - 2), COLOR, BORDER)), None)),
+    Case(scan_line, "color_interpolate", "n", (1,), _call((30, 80, 180), (180, 220, 255), 0.5)),
+    Case(scan_line, "scanline_gradient_sky", "side", (32, 128, 512), _sky),
+    Case(scan_line, "scanline_polygon", "side", (16, 128, 480), _polygon(COLOR)),
+    Case(scan_line, "scanline_thick_line", "length", (16, 128, 512),
+         lambda f, s, n: ((lambda: f(s, 0, 0, n * 4 // 5, n * 3 // 5, 4, COLOR)), None)),
+    Case(scan_line, "scanline_polygon_clipping", "side", (16, 128, 480),
+         _polygon(COLOR, *WINDOW, clipped=True)),
+    Case(scan_line, "scanline_texture", "side", (16, 64, 256), _texture_polygon),
+
+    # graphic/floodfill.py
+    Case(floodfill, "flood_fill", "side", (8, 32, 128), _flood),
+
+    # graphic/clipping.py
+    Case(clipping, "space_code", "n", (1,), _call(CENTER, CENTER, *WINDOW)),
+    Case(clipping, "cohen_sutherland", "length", (16, 128, 512),
+         lambda f, s, n: ((lambda: f(WINDOW[2] - n // 2, WINDOW[3] - n // 3, WINDOW[2] + n // 2,
+                                     WINDOW[3] + n // 3, *WINDOW)), None)),
+
+    # animation/animation.py
+    Case(animation, "identity", "n", (1,), _call()),
+    Case(animation, "translation", "n", (1,), _call(10, 20)),
+    Case(animation, "scaling", "n", (1,), _call(2, 3)),
+    Case(animation, "rotation", "n", (1,), _call(30)),
+    Case(animation, "create_transformation", "n", (1,), _call()),
+    Case(animation, "multiply_matrices", "n", (1,), _call(animation.rotation(30), animation.translation(5, 5))),
+    Case(animation, "apply_transformation", "points", (10, 100, 1000), _points(animation.rotation(30))),
+    Case(animation, "window_viewport", "n", (1,), _call((0, 0, 800, 600), (10, 10, 170, 130))),
+    Case(animation, "transform_point", "n", (1,), _call(10, 20, animation.rotation(30))),
+    Case(animation, "get_scale_factors", "n", (1,), _call((0, 0, 800, 600), (10, 10, 170, 130))),
+    Case(animation, "transform_dimension", "n", (1,), _call(100, 50, 0.2, 0.2)),
+]
+
+
+def count_pixels(case, surface, size, profiler):
+    """Return the pixels one call of a case writes, through the profiler's hooks."""
+    profiler.enable()
+    try:
+        run, reset = case.make(getattr(case.module, case.name), surface, size)
+        if reset is not None:
+            reset()
+            profiler.end_frame()  # Leave the pixels of the reset out
+        run()
+        profiler.end_frame()
+    finally:
+        profiler.disable()
+    return sum(counters[PIXELS] for counters in profiler.last_frame.values())
+
+
+def time_call(run, reset, min_time, rounds):
+    """
+    Time one call, as the best of several rounds.
+
+    Args:
+        run (callable): One call.
+        reset (callable | None): Untimed setup before every call.
+        min_time (float): Minimum duration of a round, in seconds.
+        rounds (int): Number of rounds.
+
+    Returns:
+        float: Seconds per call.
+    """
+    # Calibrate the calls per round
+    calls = 1
+    while True:
+        elapsed = _round(run, reset, calls)
+        if elapsed >= min_time / 4 or calls >= 1 << 20:
+            break
+        calls *= 4
+    calls = max(1, int(calls * min_time / max(elapsed, 1e-9)))
+
+    best = min(_round(run, reset, calls) for _ in range(rounds))
+    return best / calls
+
+
+def _round(run, reset, calls):
+    """Return the time of a number of calls, resets excluded."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if reset is None:
+            start = time.perf_counter()
+            for _ in range(calls):
+                run()
+            return time.perf_counter() - start
+        elapsed = 0.0
+        for _ in range(calls):
+            reset()
+            start = time.perf_counter()
+            run()
+            elapsed += time.perf_counter() - start
+        return elapsed
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run_cases(cases, min_time, rounds):
+    """
+    Benchmark cases and print a table.
+
+    Returns:
+        dict: Result by case key ("function unit=size").
+    """
+    surface = pygame.Surface((SIZE, SIZE))
+    profiler = Profiler(history=1)
+    results = {}
+    print(f"{'primitive':<28}{'size':>12}{'us/call':>12}{'calls/s':>12}{'px/call':>10}{'Mpx/s':>9}")
+    for case in cases:
+        function = getattr(case.module, case.name)
+        for size in case.sizes:
+            surface.fill((255, 255, 255))
+            pixels = count_pixels(case, surface, size, profiler)
+            run, reset = case.make(function, surface, size)
+            seconds = time_call(run, reset, min_time, rounds)
+            key = f"{case.name} {case.unit}={size}"
+            results[key] = {"seconds_per_call": seconds, "pixels_per_call": pixels}
+            rate = f"{pixels / seconds / 1e6:.2f}" if pixels else "-"
+            print(f"{case.name:<28}{case.unit + '=' + str(size):>12}{seconds * 1e6:>12.2f}"
+                  f"{1 / seconds:>12.0f}{pixels:>10}{rate:>9}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results to a baseline.
+
+    Returns:
+        list: (key, baseline seconds, seconds) of the cases slower than
+            the baseline by more than the tolerance.
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            print(f"new case (not in baseline): {key}")
+            continue
+        before, after = reference["seconds_per_call"], result["seconds_per_call"]
+        if after > before * (1 + tolerance):
+            regressions.append((key, before, after))
+    return regressions
+
+
+def main():
+    """Run the benchmark, then save or check a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="shorter rounds, for a smoke test")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--filter", default=None, help="only run the functions containing this text")
+    parser.add_argument("--save-baseline", metavar="PATH", default=None)
+    parser.add_argument("--baseline", metavar="PATH", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown over the baseline, as a fraction (default: 0.25)")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if args.filter is None or args.filter in case.name]
+    results = run_cases(cases, 0.01 if args.quick else 0.05, 3 if args.quick else args.rounds)
+
+    if args.save_baseline:
+        meta = {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "surface": SIZE,
+        }
+        with open(args.save_baseline, "w") as file:
+            json.dump({"meta": meta, "results": results}, file, indent=1)
+        print(f"Baseline of {len(results)} cases written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before * 1e6:.2f} -> {after * 1e6:.2f} us/call "
+                  f"({after / before - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {args.tolerance:.0%} over {len(results)} cases")
+
+
+if __name__ == "__main__":
+    main()
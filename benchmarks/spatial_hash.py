@@ -0,0 +1,91 @@
+"""Benchmark of the spatial hash broadphase against brute-force scans.
+
+Spreads N balls over an area growing with N (constant density, like a
+crowded court) and reports the time to rehash them after a small move, to
+list the candidate pairs and to find the balls near the hoop, next to the
+all-pairs and all-balls scans they replace. A last column times a full
+BallSystem tick with ball-ball collisions on.
+
+Usage:
+    python -m benchmarks.spatial_hash [--counts 100 1000 10000] [--repeat 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.ball_system import GROUND_Y
+from game.ball_system import BallSystem
+from game.hoop import BasketHoop
+from game.spatial_hash import SpatialHash
+
+RADIUS = 15
+AREA_PER_BALL = 60 * 60  # Square pixels per ball
+
+
+def mean_time(function, repeat):
+    """Return the mean time of a call, in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def brute_pairs(position):
+    """Return the pairs of overlapping balls by testing every pair."""
+    delta = position[:, None] - position[None, :]
+    dist = np.hypot(delta[..., 0], delta[..., 1])
+    return np.nonzero(np.triu(dist < 2 * RADIUS, 1))
+
+
+def main():
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-brute", type=int, default=2000,
+                        help="largest count also run with the all-pairs scan")
+    args = parser.parse_args()
+
+    hoop = BasketHoop(650, 200, GROUND_Y)
+    xmin, ymin, xmax, ymax = hoop.bounds()
+    print(f"{'balls':>8}{'update ms':>11}{'pairs ms':>10}{'brute ms':>10}"
+          f"{'hoop ms':>9}{'scan ms':>9}{'tick ms':>9}")
+    for count in args.counts:
+        rng = np.random.default_rng(0)
+        side = np.sqrt(count * AREA_PER_BALL)
+        position = rng.uniform(0, side, (count, 2))
+        active = np.ones(count, dtype=bool)
+        grid = SpatialHash(2 * RADIUS)
+        grid.update(position, active)
+
+        def update():
+            position[:] += rng.normal(0, 1, position.shape)
+            grid.update(position, active)
+
+        def query():
+            return grid.query_rect(xmin, ymin, xmax, ymax)
+
+        def scan():
+            x, y = position[:, 0], position[:, 1]
+            return np.flatnonzero((x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax))
+
+        updated = mean_time(update, args.repeat)
+        paired = mean_time(grid.pairs, args.repeat)
+        brute = ""
+        if count <= args.max_brute:
+            brute = f"{mean_time(lambda: brute_pairs(position), args.repeat):.2f}"
+        queried = mean_time(query, args.repeat)
+        scanned = mean_time(scan, args.repeat)
+
+        # Same crowd, launched in place (a shared launch point would overlap them all)
+        system = BallSystem(count, ball_collisions=True)
+        slots = np.array([system.add(x, y - side, RADIUS) for x, y in position])
+        system.shoot(slots, rng.uniform(-5, 5, (count, 2)))
+        ticked = mean_time(lambda: system.step(0.5, 1.0, GROUND_Y, hoop), args.repeat)
+        print(f"{count:>8}{updated:>11.2f}{paired:>10.2f}{brute:>10}"
+              f"{queried:>9.3f}{scanned:>9.3f}{ticked:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
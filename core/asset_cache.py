@@ -0,0 +1,240 @@
+"""Content-addressed on-disk cache of preprocessed assets.
+
+Decoded textures, gradients and rasterized tiles are stored as .npy files
+named after a hash of everything they depend on: the bytes of the source
+file, the generator parameters and the source code of the modules that
+generate them, so editing an algorithm or an image never serves a stale
+entry. Entries are loaded with np.load(mmap_mode='c') and wrapped in
+surfaces without a copy: a warm start only maps files, and processes
+loading the same asset share its pages.
+
+The mapping is copy-on-write, so surfaces coming out of the cache can be
+drawn on like any other: the first write to a page gives the process a
+private copy of it, and the file on disk is never modified. A read-only
+mapping would not do, since pygame does not check the buffer and drawing on
+it crashes the process.
+
+Every edit produces new keys and the entries of the old ones are never read
+again, so the directory is capped: loading an entry marks it as used, and
+the least recently used entries are deleted when the cache opens and after
+every store, until the directory fits in max_bytes.
+"""
+import hashlib
+import inspect
+import os
+import threading
+
+import numpy as np
+import pygame
+
+# Default cache directory, at the root of the project
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "assets")
+
+# Default size cap of the cache directory
+MAX_BYTES = 128 * 1024 * 1024
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(*sources):
+    """
+    Return a digest of the source code of modules, classes or functions.
+
+    Args:
+        *sources: Objects accepted by inspect.getsource.
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(inspect.getsource(source).encode())
+    return digest.hexdigest()
+
+
+def surface_pixels(surface):
+    """Return the RGB pixels of a surface as a (height, width, 3) uint8 array."""
+    width, height = surface.get_size()
+    return np.frombuffer(pygame.image.tobytes(surface, "RGB"), np.uint8).reshape(height, width, 3)
+
+
+def pixels_surface(pixels):
+    """Wrap (height, width, 3) uint8 pixels in a surface, without a copy."""
+    height, width = pixels.shape[:2]
+    return pygame.image.frombuffer(pixels, (width, height), "RGB")
+
+
+class DiskCache:
+    """Directory of .npy files addressed by the hash of their inputs."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        """
+        Initialize the cache and prune it. The directory is created on the
+        first store.
+
+        Args:
+            directory (str): Directory of the entries.
+            max_bytes (int | None): Size cap of the directory. None never
+                deletes entries.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.prune()
+
+    @staticmethod
+    def key(*parts, sources=()):
+        """
+        Build the key of an entry.
+
+        Args:
+            *parts: Generator name and parameters; their repr is hashed.
+            sources (tuple): Modules or functions generating the entry,
+                whose source code is hashed too.
+
+        Returns:
+            str: Hex digest naming the entry.
+        """
+        digest = hashlib.sha256(repr(parts).encode())
+        if sources:
+            digest.update(source_digest(*sources).encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Return the file of an entry."""
+        return os.path.join(self.directory, key + ".npy")
+
+    def load(self, key):
+        """
+        Map an entry.
+
+        Returns:
+            numpy.ndarray | None: Copy-on-write memory-mapped array, None if
+                the entry is missing or unreadable.
+        """
+        path = self.path(key)
+        try:
+            array = np.load(path, mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+        # Mark the entry as used, for prune()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return array
+
+    def store(self, key, array):
+        """
+        Write an entry atomically, so concurrent processes never read a
+        partial file, and map it back.
+
+        Returns:
+            numpy.ndarray: The memory-mapped entry.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(temporary, path)
+        array = self.load(key)
+        self.prune()
+        return array
+
+    def prune(self, max_bytes=None):
+        """
+        Delete the least recently used entries until the directory fits in
+        the size cap. Entries of outdated keys are never used again, so they
+        go first.
+
+        Args:
+            max_bytes (int | None): Size cap. Defaults to the cache's one.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is None:
+            return 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+
+        entries = []
+        for name in names:
+            if not name.endswith(".npy"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Removed by another process, or still mapped on Windows
+                continue
+            total -= size
+            deleted += 1
+        self.evicted += deleted
+        return deleted
+
+    def array(self, key, compute):
+        """
+        Return an entry, computing and storing it on a miss.
+
+        Args:
+            key (str): Entry key, from key().
+            compute (callable): compute() returning the array.
+
+        Returns:
+            numpy.ndarray: The memory-mapped entry.
+        """
+        array = self.load(key)
+        if array is not None:
+            self.hits += 1
+            return array
+        self.misses += 1
+        return self.store(key, compute())
+
+    def surface(self, key, render):
+        """
+        Return a cached surface, rendering and storing it on a miss.
+
+        Args:
+            key (str): Entry key, from key().
+            render (callable): render() returning a surface. Only its RGB
+                pixels are kept; colorkeys must be set again on the result.
+
+        Returns:
+            pygame.Surface: Copy-on-write surface over the mapped pixels.
+        """
+        return pixels_surface(self.array(key, lambda: surface_pixels(render())))
+
+    def texture(self, path):
+        """
+        Return the decoded pixels of an image file, keyed by its bytes.
+
+        Args:
+            path (str): Path to the image file.
+
+        Returns:
+            pygame.Surface: Copy-on-write surface over the mapped pixels.
+        """
+        key = self.key("texture", file_digest(path))
+        return self.surface(key, lambda: pygame.image.load(path))
@@ -0,0 +1,199 @@
+"""Asset loading helpers and a background asset manager.
+
+The manager loads assets on a thread pool and hands out handles right away,
+so the first frame does not wait for decoding and rasterization. Anything
+touching the display (pixel format conversion, starting the music) runs on
+the main thread when a handle is resolved: by poll() once per frame, or by
+wait() when the asset is needed before it arrived. With a DiskCache, the
+decoded and generated assets are mapped from disk instead of being built
+again on every launch.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pygame
+
+
+def load_texture(path):
+    """
+    Load an image file into a surface.
+
+    The image is converted to the display pixel format only when a display
+    exists, so textures can also be loaded headless or in worker processes.
+
+    Args:
+        path (str): Path to the image file.
+
+    Returns:
+        pygame.Surface: The loaded image.
+    """
+    return display_format(pygame.image.load(path))
+
+
+def display_format(image):
+    """Convert an image to the display pixel format, if there is a display."""
+    if pygame.display.get_surface() is not None:
+        return image.convert()
+    return image
+
+
+class AssetHandle:
+    """Asset that may still be loading."""
+
+    def __init__(self, name, future, finish=None):
+        """
+        Initialize a handle.
+
+        Args:
+            name (str): Asset name, for progress reports.
+            future (concurrent.futures.Future): Result of the background load.
+            finish (callable | None): finish(value) returning the final
+                asset, run on the thread that resolves the handle.
+        """
+        self.name = name
+        self.future = future
+        self.finish = finish
+        self.callbacks = []
+        self.resolved = False
+        self.value = None
+
+    @property
+    def ready(self):
+        """True once the background load is over."""
+        return self.future.done()
+
+    def on_ready(self, callback):
+        """
+        Register callback(value), called when the handle is resolved (at
+        once if it already is).
+        """
+        self.callbacks.append(callback)
+        if self.resolved:
+            callback(self.value)
+
+    def wait(self):
+        """
+        Block until the asset is loaded, and resolve the handle.
+
+        Returns:
+            The asset. Errors of the load are raised here.
+        """
+        if not self.resolved:
+            value = self.future.result()
+            if self.finish is not None:
+                value = self.finish(value)
+            self.value = value
+            self.resolved = True
+            for callback in self.callbacks:
+                callback(value)
+        return self.value
+
+    def get(self, default=None):
+        """Return the asset if it is loaded, default otherwise."""
+        return self.wait() if self.ready else default
+
+
+def resolve(asset):
+    """Return an asset, waiting for it if it is a handle."""
+    return asset.wait() if isinstance(asset, AssetHandle) else asset
+
+
+class AssetManager:
+    """Class loading assets on background threads."""
+
+    def __init__(self, workers=2, cache=None):
+        """
+        Initialize the manager.
+
+        Args:
+            workers (int): Loader threads. 0 loads every asset on submit, on
+                the calling thread.
+            cache (DiskCache | None): On-disk cache of the decoded textures
+                and generated surfaces. None builds them every time.
+        """
+        self.executor = ThreadPoolExecutor(workers, "assets") if workers > 0 else None
+        self.cache = cache
+        self.handles = []
+
+    def submit(self, name, load, *args, finish=None):
+        """
+        Start loading an asset.
+
+        Args:
+            name (str): Asset name, for progress reports.
+            load (callable): load(*args) returning the asset, run on a
+                loader thread. It must not touch the display.
+            *args: Arguments of load.
+            finish (callable | None): finish(value) returning the final
+                asset, run on the main thread.
+
+        Returns:
+            AssetHandle: Handle of the asset.
+        """
+        if self.executor is not None:
+            future = self.executor.submit(load, *args)
+        else:
+            future = Future()
+            try:
+                future.set_result(load(*args))
+            except Exception as error:
+                future.set_exception(error)
+        handle = AssetHandle(name, future, finish)
+        self.handles.append(handle)
+        return handle
+
+    def texture(self, path):
+        """Start loading an image; it is converted to the display format on resolve."""
+        load = self.cache.texture if self.cache is not None else pygame.image.load
+        return self.submit(path, load, path, finish=display_format)
+
+    def surface(self, name, render, *parameters, sources=()):
+        """
+        Start generating a surface, or mapping it from the disk cache.
+
+        Args:
+            name (str): Asset name, also part of the cache key.
+            render (callable): render() returning the surface.
+            *parameters: Everything the surface depends on, for the cache key.
+            sources (tuple): Modules or functions generating the surface;
+                editing them invalidates the cached copy.
+
+        Returns:
+            AssetHandle: Handle of the surface.
+        """
+        if self.cache is None:
+            return self.submit(name, render)
+        key = self.cache.key(name, *parameters, sources=sources)
+        return self.submit(name, self.cache.surface, key, render)
+
+    @property
+    def progress(self):
+        """(loaded, total) asset counts."""
+        return sum(handle.ready for handle in self.handles), len(self.handles)
+
+    @property
+    def done(self):
+        """True when every asset is resolved."""
+        return all(handle.resolved for handle in self.handles)
+
+    def poll(self):
+        """
+        Resolve the handles whose load is over. Call it once per frame from
+        the main thread.
+
+        Returns:
+            list: The handles resolved by this call.
+        """
+        resolved = [handle for handle in self.handles if not handle.resolved and handle.ready]
+        for handle in resolved:
+            handle.wait()
+        return resolved
+
+    def wait_all(self):
+        """Block until every asset is loaded and resolve them."""
+        for handle in self.handles:
+            handle.wait()
+
+    def shutdown(self):
+        """Stop the loader threads, dropping the loads not started yet."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,221 @@
+"""Autoplayer driving the game through synthetic mouse and keyboard events.
+
+The shot is solved analytically: the game moves the ball along a discrete
+parabola, so the drag that puts the ball center on the hoop center after n
+ticks has a closed form for every n. The candidates falling steepest into the
+hoop are refined on the integer mouse positions around them with the
+trajectory predictor, keeping the scoring drag at the center of its scoring
+neighbourhood. The events go through pygame's queue, so every shot exercises
+the same start_drag, update_drag and release_drag path as a player.
+"""
+import random
+
+import pygame
+
+# Autoplayer states
+READY, AIMED, FLYING = range(3)
+
+
+class ShotSolver:
+    """Class finding slingshot drags that score."""
+
+    def __init__(self, predictor, launch_scale, max_drag=100, search=4):
+        """
+        Initialize the solver.
+
+        Args:
+            predictor (TrajectoryPredictor): Predictor of the court.
+            launch_scale (float): Launch speed per pixel of drag.
+            max_drag (float): Longest drag the slingshot allows.
+            search (int): Half side, in pixels, of the refinement search.
+        """
+        self.predictor = predictor
+        self.launch_scale = launch_scale
+        self.max_drag = max_drag
+        self.search = search
+        self._solutions = {}
+
+    def candidates(self, ix, iy, xt, yt):
+        """
+        Invert the discrete parabola: the drags putting the ball center on a
+        target after every tick count.
+
+        Args:
+            ix, iy (float): Rest position of the ball (the slingshot anchor).
+            xt, yt (float): Target point.
+
+        Returns:
+            list: (dx, dy) drags within reach, falling steepest first.
+        """
+        gravity = self.predictor.gravity
+        dt = self.predictor.dt
+        scale = self.launch_scale
+        drags = []
+        for n in range(1, int(self.predictor.horizon / dt) + 1):
+            # Released at (ix - dx, iy - dy) with velocity scale * (dx, dy)
+            k = dt * n * scale - 1
+            if k <= 0:
+                continue
+            dx = (xt - ix) / k
+            dy = (yt - iy - gravity * dt * dt * n * (n + 1) / 2) / k
+            if dx * dx + dy * dy > self.max_drag * self.max_drag:
+                continue
+            vy = scale * dy + gravity * dt * n  # Vertical speed on arrival
+            if vy > 0:
+                drags.append((vy / max(abs(scale * dx), 1e-9), dx, dy))
+        drags.sort(reverse=True)
+        return [(dx, dy) for _, dx, dy in drags]
+
+    def _scores(self, ix, iy, dx, dy, r):
+        """Tell if a drag scores according to the predictor."""
+        vx, vy = dx * self.launch_scale, dy * self.launch_scale
+        return self.predictor.predict(ix - dx, iy - dy, vx, vy, r).event == "score"
+
+    def solve(self, ix, iy, hoop, r):
+        """
+        Find an integer drag scoring from a rest position into a hoop.
+
+        Args:
+            ix, iy (float): Rest position of the ball.
+            hoop (BasketHoop): Target hoop.
+            r (float): Ball radius.
+
+        Returns:
+            tuple | None: (dx, dy) drag, None if no drag scores.
+        """
+        key = (ix, iy, hoop.xc, hoop.yc, r)
+        if key in self._solutions:
+            return self._solutions[key]
+
+        solution = None
+        limit = self.max_drag * self.max_drag
+        for gx, gy in self.candidates(ix, iy, hoop.xc, hoop.yc):
+            # Refine on the integer drags around the analytic one
+            hits = [
+                (dx, dy)
+                for dx in range(round(gx) - self.search, round(gx) + self.search + 1)
+                for dy in range(round(gy) - self.search, round(gy) + self.search + 1)
+                if dx * dx + dy * dy <= limit and self._scores(ix, iy, dx, dy, r)
+            ]
+            if hits:
+                cx = sum(dx for dx, _ in hits) / len(hits)
+                cy = sum(dy for _, dy in hits) / len(hits)
+                solution = min(hits, key=lambda hit: (hit[0] - cx) ** 2 + (hit[1] - cy) ** 2)
+                break
+        self._solutions[key] = solution
+        return solution
+
+    def miss(self, ix, iy, hoop, r, rng):
+        """
+        Find a drag that does not score, short of the scoring one.
+
+        Returns:
+            tuple: (dx, dy) drag.
+        """
+        dx, dy = self.solve(ix, iy, hoop, r) or (self.max_drag / 2, -self.max_drag / 2)
+        for _ in range(10):
+            factor = rng.uniform(0.3, 0.7)
+            drag = (round(dx * factor), round(dy * factor))
+            if not self._scores(ix, iy, *drag, r):
+                return drag
+        return (-round(dx), round(dy))  # Away from the hoop
+
+
+class AutoPlayer:
+    """Class playing the game by posting events before every frame."""
+
+    def __init__(self, miss_rate=0.0, seed=None, reset_delay=30, timeout=60):
+        """
+        Initialize the autoplayer.
+
+        Args:
+            miss_rate (float): Fraction of shots missed on purpose, so the
+                lives run out and the game over and reset paths run too.
+            seed (int | None): Seed of the miss decisions.
+            reset_delay (int): Frames the game over screen stays before R.
+            timeout (int): Frames to wait for a posted shot to show up
+                before trying again.
+        """
+        self.miss_rate = miss_rate
+        self.rng = random.Random(seed)
+        self.reset_delay = reset_delay
+        self.timeout = timeout
+        self.solver = None
+        self.state = READY
+        self.waited = 0
+        self.shots = 0
+        self.planned_misses = 0
+        self.scores = 0
+        self.resets = 0
+        self._last_score = 0
+
+    def update(self, game):
+        """
+        Look at the rendered state and post the events of the next action.
+
+        Args:
+            game (Game): The game, before it handles the frame's events.
+        """
+        if game.show_start_screen:
+            _post(pygame.KEYDOWN, key=pygame.K_SPACE)
+            return
+
+        snapshot = game.view_snapshot
+        if snapshot.score > self._last_score:
+            self.scores += snapshot.score - self._last_score
+        self._last_score = snapshot.score
+
+        if snapshot.game_over:
+            self.waited += 1
+            if self.waited >= self.reset_delay:
+                _post(pygame.KEYDOWN, key=pygame.K_r)
+                self.resets += 1
+                self.state = READY
+                self.waited = 0
+            return
+
+        ball = snapshot.ball
+        if self.state == AIMED:
+            # Wait for the shot to reach the rendered snapshots
+            self.waited += 1
+            if ball.is_shot:
+                self.state = FLYING
+            elif self.waited >= self.timeout:
+                self.state = READY
+        elif self.state == FLYING and not ball.is_shot:
+            self.state = READY
+
+        if self.state == READY and not ball.is_shot:
+            self._shoot(game, ball)
+
+    def _shoot(self, game, ball):
+        """Post the drag and release of one shot."""
+        if self.solver is None:
+            self.solver = ShotSolver(game.trajectory, game.view_ball.LAUNCH_SCALE)
+        hoop = game.view_hoop
+        r = game.view_ball.r
+        ix, iy = ball.initial_x, ball.initial_y
+
+        drag = None
+        if self.rng.random() >= self.miss_rate:
+            drag = self.solver.solve(ix, iy, hoop, r)
+        if drag is None:
+            drag = self.solver.miss(ix, iy, hoop, r, self.rng)
+            self.planned_misses += 1
+        dx, dy = drag
+
+        # Like a player's, the events are in screen coordinates
+        camera = game.screen.camera
+        start = camera.to_screen(ix, iy)
+        end = camera.to_screen(ix - dx, iy - dy)
+        _post(pygame.MOUSEBUTTONDOWN, button=1, pos=start)
+        _post(pygame.MOUSEMOTION, pos=end, rel=(-dx, -dy), buttons=(1, 0, 0))
+        _post(pygame.MOUSEBUTTONUP, button=1, pos=end)
+        self.shots += 1
+        self.state = AIMED
+        self.waited = 0
+
+
+def _post(event_type, **attributes):
+    """Post a synthetic event on pygame's queue."""
+    pygame.event.post(pygame.event.Event(event_type, **attributes))
@@ -0,0 +1,542 @@
+"""Game loop: event handling, game rules and frame rendering."""
+import hashlib
+import math
+import time
+
+import pygame
+
+from core.asset_cache import DiskCache, source_digest
+from core.assets import AssetManager
+from core.screen import (
+    Screen, TiledLayer, WIDTH, HEIGHT, minimap_bounds, minimap_window, zoom_bounds
+)
+from core.simulation import SimulationThread, interpolate, take_snapshot
+from core.timestep import FixedTimestep, REFERENCE_RATE
+from core.viewport import Viewport
+from game.ball import BasketBall
+from game.ball_system import BallSystem
+from game.hoop import BasketHoop
+from game.score_board import ScoreBoard
+from game.trajectory import TrajectoryPredictor, draw_trajectory
+from game import ground
+from game.ground import Ground
+from graphic import clipping, drawlist, scan_line, shapes
+from graphic.backends import create_backend
+from graphic.profiling import Profiler, draw_profile_overlay
+from graphic.scan_line import scanline_thick_line
+from graphic.text import draw_text, get_font
+from menu.start_screen import StartScreen
+
+
+class Game:
+    """Class holding the game state and the frame pipeline."""
+
+    MAX_GROUND_TIME = 30  # Reference ticks allowed on ground before penalty
+    GRAVITY = 0.5  # Per reference tick
+    MAX_STEP_DISTANCE = 30  # Pixels moved per substep, keeps the ground and rules checks accurate
+    MAX_BOUNCES = 4  # Hoop impacts resolved per substep
+    REST_SPEED = 1.0  # Speed below which a ball touching the hoop counts as resting
+    VIEWPORT_KEYS = {pygame.K_v: "minimap", pygame.K_z: "hoop_zoom"}  # Key cycling each viewport's render mode
+
+    # Court layout, also simulated by core.shot_sweep
+    LAUNCH = (150, 400)  # Resting position of the ball
+    BALL_RADIUS = 15
+    GROUND_Y = 580
+    HOOP_Y = 200
+    HOOP_INSET = 150  # Distance from the hoop to the right end of the court
+
+    def __init__(self, headless=False, show_menu=True, fps=60, recorder=None, threaded=False,
+                 rate=REFERENCE_RATE, lockstep=False, autoplayer=None, render_every=1,
+                 court_width=WIDTH, asset_cache=True, profiler=None, renderer="pixels"):
+        """
+        Initialize the screen, the start screen and the game objects.
+
+        Args:
+            headless (bool): Render offscreen with dummy video and audio drivers.
+            show_menu (bool): Start on the start screen.
+            fps (int): Frame rate limit. 0 runs unthrottled.
+            recorder (FrameRecorder | None): Records every displayed frame.
+            threaded (bool): Run the simulation on its own thread at a fixed
+                rate and render interpolated snapshots on the main thread.
+            rate (float): Physics ticks per second.
+            lockstep (bool): Run exactly one tick per frame instead of
+                following real time, for reproducible headless runs.
+            autoplayer (AutoPlayer | None): Plays the game by posting events
+                before every frame.
+            render_every (int): Draw and display one frame out of this many;
+                the others only handle events and run the ticks, for fast
+                unattended runs.
+            court_width (int): Width of the court. The hoop stands near its
+                right end and the camera scrolls when it is wider than the screen.
+            asset_cache (bool): Map the decoded textures and the rasterized sky
+                and ground tiles from the on-disk cache, filling it on a miss.
+            profiler (Profiler | None): Per-primitive profiler. An enabled one
+                records from the first frame; F3 shows its overlay, enabling
+                it while shown.
+            renderer (str): Rasterization backend of the scenery (ground
+                tiles and hoop layer), one of graphic.backends.BACKENDS:
+                "pixels" runs the pixel algorithms, "tiled" and "banded"
+                record a DrawList and rasterize it on threads or processes.
+        """
+        self.court_width = court_width
+
+        # Assets load in the background while the start screen shows
+        self.assets = AssetManager(cache=DiskCache() if asset_cache else None)
+        self.screen = Screen(headless=headless, court_width=court_width, assets=self.assets)
+        self.screen.recorder = recorder
+        self.canvas = self.screen.canvas
+        self.backend = create_backend(renderer, self.screen.camera.court_width, HEIGHT)
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.profile_overlay = False
+        self._keep_profiling = self.profiler.enabled
+
+        # Initialize start screen
+        self.start_screen = StartScreen(music=not headless, assets=self.assets)
+        self.show_start_screen = show_menu
+
+        # Initialize game objects
+        self.balls = BallSystem()
+        self.ball = BasketBall(*self.LAUNCH, self.BALL_RADIUS, system=self.balls)
+        self.hoop = BasketHoop(*self.hoop_position(court_width), self.GROUND_Y)
+        grass = self.assets.texture("game/textures/grass.jpg")
+        self.ground = Ground(self.GROUND_Y, court_width + 100, HEIGHT, grass.wait, self.backend)
+        self._ground_key = None  # (ground state, disk cache key) of the ground tiles
+        self.score_board = ScoreBoard()
+
+        # Render-side copies, only updated from snapshots so the renderer
+        # never reads objects the simulation is changing
+        self.view_ball = BasketBall(*self.LAUNCH, self.BALL_RADIUS)
+        self.view_hoop = BasketHoop(*self.hoop_position(court_width), self.GROUND_Y)
+        self.view_score = ScoreBoard()
+
+        # Static scenery is rasterized once and reused every frame; the ground
+        # as tiles rasterized when they first scroll into view
+        self.screen.add(TiledLayer(
+            "ground", self._ground_tile, Ground.TILE_WIDTH, key=self.ground.layer_key
+        ))
+        self.screen.add_layer(
+            "hoop", lambda surface: self.backend.paint(surface, self.view_hoop.paint),
+            key=self.view_hoop.layer_key, world=True
+        )
+
+        # Minimap of the whole court and zoom on the hoop while the ball is in flight
+        self.screen.add_viewport(Viewport(
+            "minimap", minimap_window(court_width), minimap_bounds, refresh_rate=15
+        ))
+        self.screen.add_viewport(Viewport(
+            "hoop_zoom",
+            self.view_hoop.zoom_window(),
+            zoom_bounds,
+            background=(135, 206, 235),
+            window_source=self.view_hoop.zoom_window,
+            visible=lambda: self.view_ball.is_shot
+        ))
+        self.scene = [self.ground, self.view_hoop, self.view_ball]
+
+        # Game state variables
+        self.scored = False
+        self.game_over = False
+        self.ground_contact_limit = 0
+        self.running = True
+        self.frame_count = 0
+        self.tick = 0
+        self.timestep = FixedTimestep(rate)
+        self.lockstep = lockstep
+        self.trajectory = TrajectoryPredictor(
+            self.view_hoop, self.ground.points[0][1], self.GRAVITY, self.timestep.scale,
+            width=court_width
+        )
+        self.frame_time = 0.0
+        self.simulation = SimulationThread(self, rate=rate) if threaded else None
+        self._previous = self._current = self.snapshot()
+        self.view_snapshot = self._current
+        self.autoplayer = autoplayer
+        self.render_every = render_every
+
+    @classmethod
+    def hoop_position(cls, court_width=WIDTH):
+        """Return the (x, y) center of the hoop on a court of the given width."""
+        return court_width - cls.HOOP_INSET, cls.HOOP_Y
+
+    def handle_event(self, event):
+        """
+        Handle a single pygame event.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
+        """
+        if not self.handle_view_event(event):
+            self.handle_sim_event(event)
+
+    def handle_view_event(self, event):
+        """
+        Handle the events owned by the main thread: quit, start screen and
+        display settings.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
+
+        Returns:
+            bool: True if the event was consumed.
+        """
+        if event.type == pygame.QUIT:
+            self.running = False
+
+        # Handle start screen events
+        if self.show_start_screen:
+            if self.start_screen.handle_event(event):
+                self.show_start_screen = False
+                self.screen.request_full_redraw()
+            return True
+
+        # Switch the render mode of one viewport: V for the minimap, Z for the hoop zoom
+        if event.type == pygame.KEYDOWN and event.key in self.VIEWPORT_KEYS:
+            self.screen.cycle_viewport_mode(self.VIEWPORT_KEYS[event.key])
+            return True
+
+        # Toggle the profiler overlay with F3; instrumentation only runs while needed
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.profile_overlay = not self.profile_overlay
+            if self.profile_overlay:
+                self.profiler.enable()
+            elif not self._keep_profiling:
+                self.profiler.disable()
+            self.screen.request_full_redraw()
+            return True
+        return False
+
+    def handle_sim_event(self, event):
+        """
+        Handle the events changing the simulation: slingshot and reset.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
+        """
+        ball = self.ball
+
+        # Handle mouse events for slingshot
+        if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+            if event.button == 1:  # Left click
+                ball.start_drag(*event.pos)
+
+        elif event.type == pygame.MOUSEMOTION and not self.game_over:
+            if ball.is_dragging:
+                ball.update_drag(*event.pos)
+
+        elif event.type == pygame.MOUSEBUTTONUP and not self.game_over:
+            if event.button == 1 and ball.is_dragging:
+                ball.release_drag()
+                self.scored = False
+                self.ground_contact_limit = 0
+
+        # Reset game with R key
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+            self.reset()
+
+    def reset(self):
+        """Restart the game with score 0 and full lives."""
+        self.ball.reset()
+        self.score_board.set_score(0)
+        self.score_board.lives = 5
+        self.scored = False
+        self.game_over = False
+
+    def _lose_ball(self):
+        """Lose a life if the shot missed and put the ball back."""
+        if not self.scored:
+            self.score_board.lose_life()
+            if self.score_board.is_game_over():
+                self.game_over = True
+        self.ball.reset()
+        self.scored = False
+
+    def update(self):
+        """
+        Advance the ball physics and apply the game rules for one tick.
+
+        The physics is the vectorized BallSystem step: gravity once per
+        tick, swept hoop collisions, so the ball cannot skip the backboard
+        or the scoring zone, and substeps only when the ball moves further
+        than its diameter in a tick.
+        """
+        ball = self.ball
+        hoop = self.hoop
+        ground_y = self.ground.points[0][1]
+        dt = self.timestep.scale
+
+        self.tick += 1
+        if not ball.is_shot:
+            return
+
+        scored = self.balls.step(
+            self.GRAVITY, dt, ground_y, hoop, self.MAX_STEP_DISTANCE, self.MAX_BOUNCES
+        )
+
+        # Check if ball scored
+        if ball.slot in scored:
+            self.score_board.add_points(1)
+            self.scored = True
+            ball.reset()
+            return
+
+        # Check if ball is out of bounds
+        if ball.is_out_of_bounds(self.court_width, HEIGHT):
+            self._lose_ball()
+
+        # On the ground, or resting on the hoop
+        elif self.balls.resting(ground_y, hoop, self.REST_SPEED)[ball.slot]:
+            self.ground_contact_limit += dt
+            if self.ground_contact_limit >= self.MAX_GROUND_TIME:
+                self._lose_ball()
+                self.ground_contact_limit = 0
+
+    def snapshot(self, now=None):
+        """
+        Capture the simulation state.
+
+        Args:
+            now (float | None): Time of the snapshot. Defaults to the current time.
+
+        Returns:
+            Snapshot: Immutable copy of the ball, hoop and score state.
+        """
+        if now is None:
+            now = time.perf_counter()
+        return take_snapshot(
+            self.ball, self.hoop, self.score_board,
+            self.scored, self.game_over, self.tick, now
+        )
+
+    def apply_snapshot(self, snapshot):
+        """Copy a snapshot into the render-side objects."""
+        self.view_snapshot = snapshot
+        ball = self.view_ball
+        state = snapshot.ball
+        ball.xc, ball.yc, ball.angle = state.x, state.y, state.angle
+        ball.initial_x, ball.initial_y = state.initial_x, state.initial_y
+        ball.is_shot, ball.is_dragging = state.is_shot, state.is_dragging
+
+        self.view_hoop.xc, self.view_hoop.yc = snapshot.hoop
+        self.view_score.score = snapshot.score
+        self.view_score.lives = snapshot.lives
+
+    def _ground_tile(self, xmin, xmax):
+        """
+        Rasterize a ground tile, or map it from the disk cache. The key of
+        the tiles is rebuilt whenever the ground changes, so the tiles of an
+        older ground are never mapped.
+        """
+        cache = self.assets.cache
+        if cache is None:
+            return self.ground.render_tile(xmin, xmax)
+
+        state = self.ground.layer_key()
+        if self._ground_key is None or self._ground_key[0] != state:
+            texture = hashlib.sha256(pygame.image.tobytes(self.ground.texture, "RGB")).hexdigest()
+            sources = source_digest(ground, shapes, scan_line, clipping, drawlist)
+            points, colors, _ = state
+            self._ground_key = (state, (points, colors, Ground.TEXTURE_PERIOD, texture, sources))
+        key = cache.key("ground tile", self._ground_key[1], xmin, xmax)
+        return self.ground.render_tile(xmin, xmax, lambda rasterize: cache.surface(key, rasterize))
+
+    def render(self, snapshot):
+        """
+        Render a snapshot of the game on the canvas.
+
+        Args:
+            snapshot (Snapshot): State to draw.
+        """
+        screen = self.screen
+        canvas = self.canvas
+        self.apply_snapshot(snapshot)
+        ball = self.view_ball
+
+        # The camera follows the ball; static layers are recomposed when it scrolls
+        screen.follow(ball.xc)
+        offset = (-screen.camera.x, 0)
+
+        # Screen rendering (sky, ground and hoop come from the static layers,
+        # only the regions drawn on the previous frame are restored)
+        screen.begin_frame(canvas)
+
+        # Draw game objects
+        ball.draw(canvas, offset)
+        screen.mark_dirty(ball.get_bounds(offset))
+
+        # Viewports (resampling modes read the world captured here)
+        screen.capture_world(canvas)
+        screen.render_viewports(canvas, self.scene)
+
+        self.view_score.draw(canvas)
+        screen.mark_dirty(self.view_score.get_bounds())
+
+        # Draw slingshot line and info when dragging
+        if ball.is_dragging:
+            self._draw_slingshot()
+
+        if self.profile_overlay:
+            screen.mark_dirty(draw_profile_overlay(canvas, self.profiler))
+
+        # Display game over message
+        if snapshot.game_over:
+            rect = draw_text(
+                canvas, "GAME OVER! Press R to restart", get_font(None, 48), (255, 0, 0),
+                center=(400, 300)
+            )
+            screen.mark_dirty(rect)
+
+    def _draw_slingshot(self):
+        """Draw the slingshot arrow, the projected trajectory and the drag info."""
+        screen = self.screen
+        canvas = self.canvas
+        ball = self.view_ball
+        x0, y0 = screen.camera.to_screen(ball.initial_x, ball.initial_y)
+        x1, y1 = screen.camera.to_screen(ball.xc, ball.yc)
+
+        # Calculate distance and angle
+        dx = ball.initial_x - ball.xc
+        dy = ball.initial_y - ball.yc
+        distance = math.sqrt(dx**2 + dy**2)
+        angle_rad = math.atan2(-dy, dx)
+        angle_deg = math.degrees(angle_rad)
+
+        # Draw main line (thicker)
+        screen.mark_dirty(_rect(scanline_thick_line(
+            canvas, x0, y0, x1, y1, 4, (255, 255, 255)
+        )))
+
+        # Draw arrow head
+        if distance > 5:
+            arrow_length = 15
+            arrow_angle = 25  # degrees
+
+            # Calculate arrow head points
+            angle1 = angle_rad + math.radians(180 - arrow_angle)
+            angle2 = angle_rad + math.radians(180 + arrow_angle)
+
+            point1_x = x1 + arrow_length * math.cos(angle1)
+            point1_y = y1 - arrow_length * math.sin(angle1)
+            point2_x = x1 + arrow_length * math.cos(angle2)
+            point2_y = y1 - arrow_length * math.sin(angle2)
+
+            # Draw arrow head
+            for point_x, point_y in ((point1_x, point1_y), (point2_x, point2_y)):
+                screen.mark_dirty(_rect(scanline_thick_line(
+                    canvas, x1, y1, point_x, point_y, 4, (255, 255, 255)
+                )))
+
+        # Draw projected trajectory (dotted line), up to where the shot first
+        # scores or hits something; green when it scores
+        vx, vy = ball.launch_velocity()
+        prediction = self.trajectory.predict(ball.xc, ball.yc, vx, vy, ball.r)
+        color = (100, 255, 100) if prediction.event == "score" else (230, 230, 230)
+        bounds = draw_trajectory(
+            canvas, prediction, color,
+            spacing=max(1, round(5 / self.timestep.scale)),
+            contact_color=(255, 255, 0),
+            offset=(-screen.camera.x, 0)
+        )
+        if bounds is not None:
+            screen.mark_dirty(_rect(bounds))
+
+        # Display drag info
+        info_text = f"Range: {distance:.1f}  Angle: {angle_deg:.1f}°"
+        rect = draw_text(canvas, info_text, get_font(None, 20), (255, 255, 0), topleft=(x0 - 80, y0 - 40))
+        screen.mark_dirty(rect)
+
+    def step(self):
+        """
+        Run one iteration of the main loop: events, update, render, display.
+
+        Returns:
+            bool: False once the game was asked to quit.
+        """
+        if self.autoplayer is not None:
+            self.autoplayer.update(self)
+
+        self.assets.poll()
+        simulation = self.simulation
+        draw = self.frame_count % self.render_every == 0
+        present = self.render if draw else self.apply_snapshot
+        handled = False
+        for event in pygame.event.get():
+            if self.handle_view_event(event):
+                continue
+            event = self._to_world(event)
+            if simulation is not None:
+                simulation.post(event)
+            else:
+                self.handle_sim_event(event)
+                handled = True
+
+        # Show start screen
+        if self.show_start_screen:
+            self.start_screen.update_animation()
+            self.start_screen.draw(self.canvas)
+            self.screen.request_full_redraw()
+        elif simulation is not None:
+            # Draw one tick in the past, between the two latest snapshots
+            snapshot = simulation.snapshots.sample(time.perf_counter(), simulation.tick_duration)
+            if snapshot is not None:
+                present(snapshot)
+        else:
+            # Run the ticks due since the last frame and draw between the last two
+            steps = self.timestep.advance(self.timestep.dt if self.lockstep else self.frame_time)
+            for _ in range(steps):
+                self._previous = self._current
+                self.update()
+                self._current = self.snapshot()
+            if handled and not steps:
+                self._current = self.snapshot()
+            alpha = 1.0 if self.lockstep else self.timestep.alpha
+            present(interpolate(self._previous, self._current, alpha))
+
+        if draw or self.show_start_screen:
+            self.screen.update()
+        if self.profiler.enabled:
+            self.profiler.end_frame()
+        self.frame_time = self.clock.tick(self.fps) / 1000.0
+        self.frame_count += 1
+        return self.running
+
+    def _to_world(self, event):
+        """Return a mouse event with its screen position moved to the world."""
+        if not hasattr(event, "pos") or self.screen.camera.x == 0:
+            return event
+        attributes = dict(event.dict, pos=self.screen.camera.to_world(*event.pos))
+        return pygame.event.Event(event.type, attributes)
+
+    def run(self, max_frames=None):
+        """
+        Run the main loop until quit or until max_frames frames were rendered.
+
+        Args:
+            max_frames (int | None): Stop after this many frames.
+
+        Returns:
+            float: Wall time spent in the loop, in seconds.
+        """
+        start = time.perf_counter()
+        if self.simulation is not None:
+            self.simulation.start()
+        try:
+            while self.running:
+                if max_frames is not None and self.frame_count >= max_frames:
+                    break
+                self.step()
+        finally:
+            if self.simulation is not None:
+                self.simulation.stop()
+            if self.screen.recorder is not None:
+                self.screen.recorder.close()
+            self.assets.shutdown()
+            self.backend.close()
+        return time.perf_counter() - start
+
+
+def _rect(bounds):
+    """Convert inclusive (xmin, ymin, xmax, ymax) bounds to a pygame.Rect."""
+    xmin, ymin, xmax, ymax = bounds
+    return pygame.Rect(xmin, ymin, xmax - xmin + 1, ymax - ymin + 1)
@@ -0,0 +1,230 @@
+"""Session recording through a shared memory ring buffer.
+
+The game process only copies each finished frame into a free slot of the
+ring; a separate encoder process drains the slots and writes them to disk.
+When the encoder falls behind the ring fills up and new frames are dropped,
+so recording never blocks the game loop.
+"""
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+# Output formats
+FORMAT_RAW = "raw"   # Concatenated RGB24 frames
+FORMAT_PNG = "png"   # One PNG file per frame inside a directory
+FORMAT_Y4M = "y4m"   # YUV4MPEG2 stream, 4:4:4, readable by ffmpeg/mpv
+FORMATS = (FORMAT_RAW, FORMAT_PNG, FORMAT_Y4M)
+
+# Header slots (int64) at the start of the shared memory block
+_WRITE = 0    # Frames published by the game
+_READ = 1     # Frames consumed by the encoder
+_CLOSED = 2   # Set by the game when no more frames will come
+_HEADER_SIZE = 8 * 8
+
+
+def _frame_to_rgb(raw, width, height, pitch, shifts):
+    """
+    Decode a raw 32-bit frame into an RGB array.
+
+    Args:
+        raw (numpy.ndarray): Raw frame bytes (pitch * height).
+        width (int): Frame width.
+        height (int): Frame height.
+        pitch (int): Bytes per row.
+        shifts (tuple): Bit shifts of the red, green and blue channels.
+
+    Returns:
+        numpy.ndarray: (height, width, 3) uint8 array.
+    """
+    pixels = raw.view(np.uint32).reshape(height, pitch // 4)[:, :width]
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    for channel, shift in enumerate(shifts[:3]):
+        rgb[:, :, channel] = (pixels >> shift) & 0xFF
+    return rgb
+
+
+def _rgb_to_yuv444(rgb):
+    """
+    Convert an RGB frame to BT.601 limited range Y, U and V planes.
+
+    Args:
+        rgb (numpy.ndarray): (height, width, 3) uint8 array.
+
+    Returns:
+        bytes: Y, U and V planes, one after the other.
+    """
+    r, g, b = (rgb[:, :, i].astype(np.float32) for i in range(3))
+    y = 16 + 0.257 * r + 0.504 * g + 0.098 * b
+    u = 128 - 0.148 * r - 0.291 * g + 0.439 * b
+    v = 128 + 0.439 * r - 0.368 * g - 0.071 * b
+    planes = np.stack([y, u, v])
+    return np.clip(np.rint(planes), 0, 255).astype(np.uint8).tobytes()
+
+
+def _encoder_main(shm_name, slots, slot_size, width, height, pitch, shifts, path, fmt, fps):
+    """
+    Encoder process: drain the ring buffer into the output file.
+
+    Args:
+        shm_name (str): Name of the shared memory block.
+        slots (int): Number of frame slots in the ring.
+        slot_size (int): Bytes per slot.
+        width (int): Frame width.
+        height (int): Frame height.
+        pitch (int): Bytes per row of a raw frame.
+        shifts (tuple): Bit shifts of the red, green and blue channels.
+        path (str): Output file, or directory for the PNG sequence.
+        fmt (str): One of FORMATS.
+        fps (int): Frame rate written to the y4m header.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header = np.ndarray((_HEADER_SIZE // 8,), dtype=np.int64, buffer=shm.buf)
+    frames = np.ndarray((slots, slot_size), dtype=np.uint8, buffer=shm.buf, offset=_HEADER_SIZE)
+
+    out = None
+    if fmt == FORMAT_PNG:
+        os.makedirs(path, exist_ok=True)
+    else:
+        out = open(path, "wb")
+        if fmt == FORMAT_Y4M:
+            out.write(f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C444\n".encode("ascii"))
+
+    index = 0
+    try:
+        while True:
+            read = int(header[_READ])
+            if read >= int(header[_WRITE]):
+                if header[_CLOSED]:
+                    break
+                time.sleep(0.002)
+                continue
+
+            rgb = _frame_to_rgb(frames[read % slots], width, height, pitch, shifts)
+
+            # The slot can be reused as soon as it is decoded
+            header[_READ] = read + 1
+
+            if fmt == FORMAT_RAW:
+                out.write(rgb.tobytes())
+            elif fmt == FORMAT_Y4M:
+                out.write(b"FRAME\n")
+                out.write(_rgb_to_yuv444(rgb))
+            else:
+                image = pygame.image.frombuffer(rgb.tobytes(), (width, height), "RGB")
+                pygame.image.save(image, os.path.join(path, f"frame_{index:06d}.png"))
+            index += 1
+    finally:
+        if out is not None:
+            out.close()
+        del header
+        del frames
+        shm.close()
+
+
+class FrameRecorder:
+    """Class recording finished frames through a separate encoder process."""
+
+    def __init__(self, path, fmt=FORMAT_Y4M, slots=16, fps=60):
+        """
+        Initialize the recorder. Nothing is allocated until start().
+
+        Args:
+            path (str): Output file, or directory for the PNG sequence.
+            fmt (str): One of FORMATS.
+            slots (int): Frames the ring can hold before dropping.
+            fps (int): Frame rate written to the y4m header.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown recording format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.slots = slots
+        self.fps = fps
+        self.recorded = 0
+        self.dropped = 0
+        self._shm = None
+        self._header = None
+        self._frames = None
+        self._process = None
+        self._size = None
+
+    def start(self, surface):
+        """
+        Allocate the ring buffer for frames shaped like the surface and
+        spawn the encoder process.
+
+        Args:
+            surface (pygame.Surface): Surface that will be recorded (32 bits per pixel).
+        """
+        if surface.get_bytesize() != 4:
+            raise ValueError("FrameRecorder needs a 32 bits per pixel surface")
+
+        width, height = surface.get_size()
+        pitch = surface.get_pitch()
+        slot_size = pitch * height
+        self._size = (width, height)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + self.slots * slot_size)
+        self._header = np.ndarray((_HEADER_SIZE // 8,), dtype=np.int64, buffer=self._shm.buf)
+        self._header[:] = 0
+        self._frames = np.ndarray((self.slots, slot_size), dtype=np.uint8, buffer=self._shm.buf, offset=_HEADER_SIZE)
+
+        self._process = multiprocessing.Process(
+            target=_encoder_main,
+            args=(
+                self._shm.name, self.slots, slot_size, width, height, pitch,
+                surface.get_shifts(), self.path, self.fmt, self.fps
+            ),
+            daemon=True
+        )
+        self._process.start()
+
+    def push(self, surface):
+        """
+        Copy a finished frame into the ring buffer.
+
+        Args:
+            surface (pygame.Surface): The frame to record.
+
+        Returns:
+            bool: False if the frame was dropped because the ring was full.
+        """
+        if self._shm is None:
+            self.start(surface)
+        if surface.get_size() != self._size:
+            self.dropped += 1
+            return False
+
+        write = int(self._header[_WRITE])
+        if write - int(self._header[_READ]) >= self.slots:
+            self.dropped += 1
+            return False
+
+        # A single memcpy of the raw pixel buffer
+        np.copyto(self._frames[write % self.slots], np.frombuffer(surface.get_buffer(), dtype=np.uint8))
+        self._header[_WRITE] = write + 1
+        self.recorded += 1
+        return True
+
+    def close(self, timeout=None):
+        """
+        Stop recording, wait for the encoder to drain the ring and release it.
+
+        Args:
+            timeout (float | None): Seconds to wait for the encoder.
+        """
+        if self._shm is None:
+            return
+        self._header[_CLOSED] = 1
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._header = None
+        self._frames = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
@@ -1,354 +1,549 @@
 """Module for managing the game screen using Pygame."""
+import os
+
 import pygame
 
-from animation.animation import *
-from game.ball import BasketBall
-from game.ground import Ground
-from game.hoop import BasketHoop
-from graphic.shapes import *
-from graphic.scan_line import *
-from graphic.clipping import cohen_sutherland
+from core.assets import AssetManager
+from core.viewport import RENDER_VECTOR, VIEWPORT_MODES
+from graphic import scan_line
+from graphic.scan_line import scanline_gradient_sky
 
 WIDTH, HEIGHT = 800, 600
 world_bounds = (0, 0, WIDTH, HEIGHT)
-minimap_bounds = (10, 10, 160, 120)
+minimap_bounds = (10, 10, 169, 129)
+zoom_bounds = (620, 10, 790, 140)
+
+# Color treated as transparent on non-opaque static layers
+LAYER_COLORKEY = (255, 0, 255)
+
+# Fraction of the screen above which a full flip replaces partial updates
+DIRTY_AREA_THRESHOLD = 0.5
+
+
+def merge_rects(rects):
+    """
+    Merge overlapping or touching rectangles until none of them intersect.
+
+    Args:
+        rects (list[pygame.Rect]): Rectangles to merge.
+
+    Returns:
+        list[pygame.Rect]: Disjoint rectangles covering every input rectangle.
+    """
+    merged = [pygame.Rect(r) for r in rects]
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        while merged:
+            rect = merged.pop()
+            i = 0
+            while i < len(merged):
+                # Inflate by one so touching rects are merged too
+                if rect.inflate(2, 2).colliderect(merged[i]):
+                    rect.union_ip(merged.pop(i))
+                    changed = True
+                else:
+                    i += 1
+            result.append(rect)
+        merged = result
+    return merged
+
+
+def minimap_window(court_width, rect=minimap_bounds):
+    """
+    Return the world window showing the whole court in the minimap, with the
+    aspect ratio of the minimap and the ground at the bottom.
+
+    Args:
+        court_width (int): Width of the court in world pixels.
+        rect (tuple): (xmin, ymin, xmax, ymax) inclusive minimap bounds.
+    """
+    width = rect[2] - rect[0] + 1
+    height = rect[3] - rect[1] + 1
+    window_height = max(HEIGHT, court_width * height / width)
+    return (0, HEIGHT - window_height, court_width, HEIGHT)
+
+
+class Camera:
+    """Horizontal scrolling camera over a court that may be wider than the screen."""
+
+    def __init__(self, court_width=WIDTH, width=WIDTH, smoothing=0.25):
+        """
+        Initialize the camera on the left end of the court.
+
+        Args:
+            court_width (int): Width of the court in world pixels.
+            width (int): Width of the view in pixels.
+            smoothing (float): Fraction of the distance to the target covered
+                per frame; 1 follows the target immediately.
+        """
+        self.court_width = max(court_width, width)
+        self.width = width
+        self.smoothing = smoothing
+        self.x = 0
+
+    @property
+    def window(self):
+        """(xmin, ymin, xmax, ymax) world window seen on the screen."""
+        return (self.x, 0, self.x + self.width, HEIGHT)
+
+    def follow(self, x):
+        """
+        Move towards centering a world x-coordinate, staying inside the court.
+        The offset stays a whole number of pixels, so the cached layers and
+        tiles are blitted without resampling.
+
+        Args:
+            x (float): World x-coordinate to center.
+
+        Returns:
+            bool: True if the camera moved.
+        """
+        target = min(max(x - self.width / 2, 0), self.court_width - self.width)
+        step = (target - self.x) * self.smoothing
+        if abs(target - self.x) <= 1:
+            step = target - self.x
+        moved = int(round(self.x + step))
+        if moved == self.x:
+            return False
+        self.x = moved
+        return True
+
+    def to_screen(self, x, y):
+        """Transform a world point into screen coordinates."""
+        return x - self.x, y
+
+    def to_world(self, x, y):
+        """Transform a screen point into world coordinates."""
+        return x + self.x, y
+
+
+class Layer:
+    """Static layer rasterized once into a cached surface."""
+
+    def __init__(self, name, draw, key=None, opaque=False, world=False):
+        """
+        Initialize a static layer.
+
+        Args:
+            name (str): Layer name, used to invalidate it.
+            draw (callable): draw(surface) rasterizing the layer content.
+            key (callable | None): Returns the owner state the layer depends on.
+                The layer is rebuilt whenever this value changes.
+            opaque (bool): True if the layer covers the whole surface.
+            world (bool): True if the layer is drawn in world coordinates,
+                on a surface as wide as the court, and scrolls with the camera.
+                Screen layers stay fixed.
+        """
+        self.name = name
+        self.draw = draw
+        self.key = key
+        self.opaque = opaque
+        self.world = world
+        self.surface = None
+        self.valid = False
+        self._last_key = None
+
+    def invalidate(self):
+        """Force the layer to be rasterized again on the next compose."""
+        self.valid = False
+
+    def is_stale(self):
+        """Check if the cached surface no longer matches its owner."""
+        if self.key is not None:
+            key = self.key()
+            if key != self._last_key:
+                self._last_key = key
+                self.valid = False
+        return not self.valid
+
+    def render(self, size):
+        """
+        Rasterize the layer into its cached surface.
+
+        Args:
+            size (tuple): (width, height) of the layer surface.
+        """
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+        if not self.opaque:
+            self.surface.fill(LAYER_COLORKEY)
+            self.surface.set_colorkey(LAYER_COLORKEY)
+        self.draw(self.surface)
+        self.valid = True
+
+    def blit(self, surface, camera, window=None):
+        """
+        Copy the layer seen through a world window on a surface.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            camera (Camera): Camera of the screen.
+            window (tuple | None): (xmin, ymin, xmax, ymax) world window the
+                surface shows. Defaults to the camera window.
+        """
+        xmin, _, xmax, _ = window or camera.window
+        if self.world:
+            surface.blit(self.surface, (0, 0), pygame.Rect(xmin, 0, xmax - xmin, HEIGHT))
+            return
+        # Screen layers are repeated across wider windows
+        width = self.surface.get_width()
+        for x in range(0, xmax - xmin, width):
+            surface.blit(self.surface, (x, 0))
+
+
+class TiledLayer(Layer):
+    """
+    Static world layer cached as tiles of fixed width, rasterized the first
+    time they scroll into view and reused afterwards.
+    """
+
+    def __init__(self, name, render_tile, tile_width, key=None):
+        """
+        Initialize a tiled layer.
+
+        Args:
+            name (str): Layer name, used to invalidate it.
+            render_tile (callable): render_tile(xmin, xmax) rasterizing the
+                world columns [xmin, xmax) and returning (surface, y), the
+                tile and the world y of its top row, or None if the tile is
+                empty.
+            tile_width (int): Width of a tile in world pixels.
+            key (callable | None): Returns the owner state the layer depends on.
+        """
+        super().__init__(name, None, key, world=True)
+        self.render_tile = render_tile
+        self.tile_width = tile_width
+        self.tiles = {}
+        self.rendered = 0
+
+    def render(self, size):
+        """Drop every tile; they are rasterized again as they are shown."""
+        self.tiles.clear()
+        self.valid = True
+
+    def tile(self, column):
+        """Return the cached tile of a column, rasterizing it on first use."""
+        if column not in self.tiles:
+            xmin = column * self.tile_width
+            self.tiles[column] = self.render_tile(xmin, xmin + self.tile_width)
+            self.rendered += 1
+        return self.tiles[column]
+
+    def blit(self, surface, camera, window=None):
+        """Copy the tiles overlapping a world window on a surface."""
+        xmin, _, xmax, _ = window or camera.window
+        first = max(0, xmin // self.tile_width)
+        last = (xmax - 1) // self.tile_width
+        for column in range(first, last + 1):
+            tile = self.tile(column)
+            if tile is not None:
+                image, y = tile
+                surface.blit(image, (column * self.tile_width - xmin, y))
+
 
 class Screen:
     """Class representing the game screen."""
 
-    def __init__(self):
+    def __init__(self, headless=False, court_width=WIDTH, assets=None):
+        """
+        Initialize pygame and the drawing canvas.
+
+        Args:
+            headless (bool): Use the dummy SDL video and audio drivers and draw
+                on an offscreen canvas; nothing is shown and update() only
+                does the frame bookkeeping.
+            court_width (int): Width of the world; wider than the screen, the
+                camera scrolls to follow the play.
+            assets (AssetManager | None): Manager rasterizing the sky in the
+                background. None rasterizes it right away.
+        """
+        self.headless = headless
+        self.assets = assets if assets is not None else AssetManager(workers=0)
+        self.camera = Camera(court_width)
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
-        self.canvas = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.background = pygame.Surface((WIDTH, HEIGHT))
+        if headless:
+            self.canvas = pygame.Surface((WIDTH, HEIGHT))
+        else:
+            self.canvas = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.sky = None  # AssetHandle of the sky surface
+
+        # Static layers, composited in order before the dynamic objects
+        self.layers = []
+        self.composite = pygame.Surface((WIDTH, HEIGHT))
+        self._composite_valid = False
+        self.add_layer("sky", lambda surface: surface.blit(self.background, (0, 0)), opaque=True)
+
         self.render_sky()
         pygame.display.set_caption("Basketball Arcade")
 
+        # Offscreen copy of the whole court, sampled by the resampling
+        # viewports: the static layers, with the visible part of the last
+        # finished frame on top
+        self.frame = pygame.Surface((self.camera.court_width, HEIGHT))
+        self.world = pygame.Surface((self.camera.court_width, HEIGHT))
+        self._world_valid = False
+        self.viewports = []
+
+        # Dirty rectangles: regions drawn on the previous and current frame
+        self.dirty_threshold = DIRTY_AREA_THRESHOLD
+        self._previous_rects = []
+        self._dirty_rects = []
+        self._full_redraw = True
+
+        # Optional FrameRecorder fed with every finished frame
+        self.recorder = None
+
+    @property
+    def background(self):
+        """Sky surface, waiting for it if it is still being rasterized."""
+        return self.sky.wait()
+
     def render_sky(self, top_color=(30, 80, 180), bottom_color=(180, 220, 255)): # noqa
-        """Clear the screen with the given color."""
-        scanline_gradient_sky(
-            self.background,
-            top_color,
-            bottom_color
+        """Rasterize the sky gradient, on a loader thread of the asset manager."""
+        def render():
+            surface = pygame.Surface((WIDTH, HEIGHT))
+            scanline_gradient_sky(surface, top_color, bottom_color)
+            return surface
+
+        self.sky = self.assets.surface(
+            "sky", render, WIDTH, HEIGHT, top_color, bottom_color, sources=(scan_line,)
         )
+        self.invalidate_layer("sky")
 
     def clear(self): # noqa
         """Clear the screen with a sky gradient."""
         self.canvas.blit(self.background, (0, 0))
 
+    def add_layer(self, name, draw, key=None, opaque=False, world=False):
+        """
+        Register a static layer on top of the existing ones.
+
+        Args:
+            name (str): Layer name.
+            draw (callable): draw(surface) rasterizing the layer content.
+            key (callable | None): Returns the owner state; a change rebuilds the layer.
+            opaque (bool): True if the layer covers the whole screen.
+            world (bool): True if the layer is drawn in world coordinates and
+                scrolls with the camera.
+
+        Returns:
+            Layer: The registered layer.
+        """
+        return self.add(Layer(name, draw, key, opaque, world))
+
+    def add(self, layer):
+        """
+        Register a prebuilt layer (a TiledLayer for instance) on top of the
+        existing ones.
+
+        Returns:
+            Layer: The registered layer.
+        """
+        self.layers.append(layer)
+        self._composite_valid = False
+        self._world_valid = False
+        return layer
+
+    def follow(self, x):
+        """
+        Scroll the camera towards a world x-coordinate. A move rebuilds the
+        composite from the cached layers and redraws the whole frame.
+
+        Args:
+            x (float): World x-coordinate to center.
+        """
+        if self.camera.follow(x):
+            self._composite_valid = False
+
+    def invalidate_layer(self, name):
+        """
+        Mark a static layer as changed so it is rasterized again.
+
+        Args:
+            name (str): Name of the layer to invalidate.
+        """
+        for layer in self.layers:
+            if layer.name == name:
+                layer.invalidate()
+                self._composite_valid = False
+                self._world_valid = False
+
+    def compose(self, surface):
+        """
+        Draw every static layer on the surface.
+
+        Only stale layers are rasterized again; the prebuilt layers are
+        merged into a cached composite, so a frame without changes costs
+        a single blit.
+
+        Args:
+            surface: The pygame surface to draw the layers on.
+        """
+        self._rebuild_layers()
+        surface.blit(self.composite, (0, 0))
+
+    def _rebuild_layers(self):
+        """
+        Rasterize stale layers and rebuild the composite if needed.
+
+        Returns:
+            bool: True if the composite changed.
+        """
+        for layer in self.layers:
+            if layer.is_stale():
+                size = self.world.get_size() if layer.world else self.composite.get_size()
+                layer.render(size)
+                self._composite_valid = False
+                self._world_valid = False
+
+        if self._composite_valid:
+            return False
+
+        self.composite.fill((0, 0, 0))
+        for layer in self.layers:
+            layer.blit(self.composite, self.camera)
+        self._composite_valid = True
+        return True
+
     def update(self): # noqa
-        """Update the display."""
-        pygame.display.flip()
+        """
+        Update the display.
 
-    def display_minimap(self, surface, ball:BasketBall, hoop:BasketHoop, ground: Ground): # noqa
+        Pushes only the regions drawn on this and the previous frame, or
+        the whole frame after a full redraw or when the dirty area passes
+        the threshold. The finished frame is also handed to the recorder.
         """
-        Render a minimap showing the ball and hoop positions.
+        if not self.headless:
+            rects = merge_rects(self._previous_rects + self._dirty_rects)
+            dirty_area = sum(rect.width * rect.height for rect in rects)
+            if self._full_redraw or dirty_area > self.dirty_threshold * WIDTH * HEIGHT:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+
+        if self.recorder is not None:
+            self.recorder.push(self.canvas)
+
+        self._previous_rects = self._dirty_rects
+        self._dirty_rects = []
+        self._full_redraw = False
+
+    def mark_dirty(self, rect):
+        """
+        Report a region drawn on the current frame.
 
         Args:
-            surface: The pygame surface to draw the minimap on.
-            ball (BasketBall): The basketball object to display.
-            hoop (BasketHoop): The basketball hoop object to display.
-        """
-        world_to_minimap = window_viewport(world_bounds, minimap_bounds)
-
-        # Get scale factors
-        sx, sy = get_scale_factors(world_bounds, minimap_bounds)
-
-        # Transform ball position (coordinates - uses transform_point)
-        ball_mini_x, ball_mini_y = transform_point(ball.xc, ball.yc, world_to_minimap)
-        ball_mini_r = int(ball.r * min(sx, sy))  # Scaled radius
-
-        # Transform hoop position (coordinates - uses transform_point)
-        hoop_mini_x, hoop_mini_y = transform_point(hoop.xc, hoop.yc, world_to_minimap)
-
-        # Transform hoop dimensions (uses transform_dimension, not transform_point!)
-        hoop_mini_a_outer, hoop_mini_b_outer = transform_dimension(hoop.a_outer, hoop.b_outer, sx, sy)
-        hoop_mini_a_inner, hoop_mini_b_inner = transform_dimension(hoop.a_inner, hoop.b_inner, sx, sy)
-        # Transform ground points
-
-        ground_mini_start = transform_point(ground.points[0][0], ground.points[0][1], world_to_minimap)
-        ground_mini_end = transform_point(ground.points[1][0], ground.points[1][1], world_to_minimap)
-
-        # Get minimap clipping window coordinates
-        xmin, ymin, xmax, ymax = minimap_bounds[0], minimap_bounds[1], minimap_bounds[0] + minimap_bounds[2] - 1, minimap_bounds[1] + minimap_bounds[3] - 1
-
-        # Draw on minimap (simplified versions)
-        # Ground on minimap (uses polygon clipping)
-        draw_polygon_clipping(
-            surface,
-            [
-                (int(ground_mini_start[0]), int(ground_mini_start[1])),
-                (int(ground_mini_end[0]), int(ground_mini_end[1])),
-                (int(ground_mini_end[0]), ymax),
-                (int(ground_mini_start[0]), ymax)
-            ],
-            (xmin, ymin, xmax, ymax),
-            ground.colors["fill"]
-        )
-        scanline_polygon_clipping(
-            surface,
-            [
-                (int(ground_mini_start[0]), int(ground_mini_start[1])),
-                (int(ground_mini_end[0]), int(ground_mini_end[1])),
-                (int(ground_mini_end[0]), ymax),
-                (int(ground_mini_start[0]), ymax)
-            ],
-            ground.colors["fill"],
-            xmin, ymin, xmax, ymax
-        )
+            rect: pygame.Rect or (x, y, width, height) of the drawn region.
+        """
+        rect = pygame.Rect(rect).clip(self.canvas.get_rect())
+        if rect.width > 0 and rect.height > 0:
+            self._dirty_rects.append(rect)
 
-        # Ball on minimap (uses circle clipping)
-        draw_circle_clipping(
-            surface,
-            int(ball_mini_x),
-            int(ball_mini_y),
-            max(1, ball_mini_r),  # Use scaled radius, minimum 1 pixel
-            xmin, ymin, xmax, ymax,
-            ball.colors["fill"]
-        )
-        circle_scanline(
-            surface,
-            int(ball_mini_x),
-            int(ball_mini_y),
-            max(1, ball_mini_r),
-            ball.colors["fill"],
-            ball.colors["border_and_details"],
-            (xmin, ymin, xmax, ymax)
-        )
-    
-        # Pole on minimap (draw behind the hoop)
-        pole_top_y = hoop.yc - hoop.b_outer
-        pole_mini_top_x, pole_mini_top_y = transform_point(hoop.xc + hoop.a_outer, pole_top_y, world_to_minimap)
-        pole_mini_top_outer_x, pole_mini_top_outer_y = transform_point(hoop.xc + hoop.a_outer + hoop.pole_width, pole_top_y, world_to_minimap)
-        pole_mini_bottom_x, pole_mini_bottom_y = transform_point(hoop.xc + hoop.a_outer, hoop.ground_y, world_to_minimap)
-        pole_mini_bottom_outer_x, pole_mini_bottom_outer_y = transform_point(hoop.xc + hoop.a_outer + hoop.pole_width, hoop.ground_y, world_to_minimap)
-        
-        pole_mini_points = [
-            (int(pole_mini_top_x), int(pole_mini_top_y)),
-            (int(pole_mini_top_outer_x), int(pole_mini_top_outer_y)),
-            (int(pole_mini_bottom_outer_x), int(pole_mini_bottom_outer_y)),
-            (int(pole_mini_bottom_x), int(pole_mini_bottom_y))
-        ]
-        
-        draw_polygon_clipping(surface, pole_mini_points, (xmin, ymin, xmax, ymax), hoop.colors["border"])
-        scanline_polygon_clipping(surface, pole_mini_points, hoop.colors["pole"], xmin, ymin, xmax, ymax)
-
-        # Backboard on minimap (draw behind the hoop)
-        backboard_x = hoop.xc + hoop.a_outer - 5
-        backboard_y = hoop.yc - hoop.backboard_height // 2 - 10  # Same offset as in draw method
-        
-        backboard_mini_top_left = transform_point(backboard_x, backboard_y, world_to_minimap)
-        backboard_mini_top_right = transform_point(backboard_x + hoop.backboard_thickness, backboard_y, world_to_minimap)
-        backboard_mini_bottom_left = transform_point(backboard_x, backboard_y + hoop.backboard_height, world_to_minimap)
-        backboard_mini_bottom_right = transform_point(backboard_x + hoop.backboard_thickness, backboard_y + hoop.backboard_height, world_to_minimap)
-        
-        backboard_mini_points = [
-            (int(backboard_mini_top_left[0]), int(backboard_mini_top_left[1])),
-            (int(backboard_mini_top_right[0]), int(backboard_mini_top_right[1])),
-            (int(backboard_mini_bottom_right[0]), int(backboard_mini_bottom_right[1])),
-            (int(backboard_mini_bottom_left[0]), int(backboard_mini_bottom_left[1]))
-        ]
-        
-        draw_polygon_clipping(surface, backboard_mini_points, (xmin, ymin, xmax, ymax), hoop.colors["backboard_border"])
-        scanline_polygon_clipping(surface, backboard_mini_points, hoop.colors["backboard"], xmin, ymin, xmax, ymax)
-
-        # Hoop on minimap (outer ellipse - uses ellipse clipping)
-        draw_ellipse_clipping(
-            surface,
-            int(hoop_mini_x),
-            int(hoop_mini_y),
-            int(hoop_mini_a_outer),
-            int(hoop_mini_b_outer),
-            xmin, ymin, xmax, ymax,
-            hoop.colors["fill"]
-        )
+    def request_full_redraw(self):
+        """Redraw and push the whole frame on the next begin_frame/update."""
+        self._full_redraw = True
 
-        # Hoop on minimap (inner ellipse - uses ellipse clipping)
-        draw_ellipse_clipping(
-            surface,
-            int(hoop_mini_x),
-            int(hoop_mini_y),
-            int(hoop_mini_a_inner),
-            int(hoop_mini_b_inner),
-            xmin, ymin, xmax, ymax,
-            hoop.colors["fill"]
-        )
+    def begin_frame(self, surface):
+        """
+        Prepare the surface for the dynamic objects of a new frame.
 
-        # Hoop scanline rendering
-        hoop_scanline(
-            surface,
-            int(hoop_mini_x),
-            int(hoop_mini_y),
-            int(hoop_mini_a_outer),
-            int(hoop_mini_b_outer),
-            int(hoop_mini_a_inner),
-            int(hoop_mini_b_inner),
-            hoop.colors["fill"],
-            hoop.colors["border"]
-        )
-        
-        # Draw minimap border to show clipping boundaries
-        minimap_border = [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]
-        draw_polygon(surface, minimap_border, (255, 255, 255))
+        Regions drawn on the previous frame are restored from the static
+        composite; everything else is still valid on the surface. Falls back
+        to a full compose when requested or when a static layer changed.
+
+        Args:
+            surface: The pygame surface being rendered.
+        """
+        if self._rebuild_layers():
+            self._full_redraw = True
+
+        if self._full_redraw:
+            surface.blit(self.composite, (0, 0))
+            return
+
+        for rect in merge_rects(self._previous_rects):
+            surface.blit(self.composite, rect, rect)
 
-    def display_hoop_zoom(self, surface, ball: BasketBall, hoop: BasketHoop):
+    def add_viewport(self, viewport):
         """
-        Viewport com zoom na região da cesta.
-        Só aparece quando a bola foi arremessada.
+        Register a viewport drawn on top of the world.
+
+        Args:
+            viewport (Viewport): The viewport to add.
+
+        Returns:
+            Viewport: The registered viewport.
         """
-        if not ball.is_shot:
+        self.viewports.append(viewport)
+        return viewport
+
+    def get_viewport(self, name):
+        """Return the viewport with the given name, or None."""
+        for viewport in self.viewports:
+            if viewport.name == name:
+                return viewport
+        return None
+
+    def capture_world(self, surface):
+        """
+        Copy the finished world into the offscreen frame buffer.
+
+        Must be called after the world is drawn and before the viewports,
+        so the viewports never sample each other. Skipped when every
+        viewport re-renders the scene itself.
+
+        Args:
+            surface: The pygame surface holding the rendered world.
+        """
+        if all(viewport.mode == RENDER_VECTOR for viewport in self.viewports):
             return
+        if self.camera.court_width > WIDTH:
+            # Off-screen parts of the court only show the static layers
+            if not self._world_valid:
+                self._rebuild_layers()
+                window = (0, 0, self.camera.court_width, HEIGHT)
+                self.world.fill((0, 0, 0))
+                for layer in self.layers:
+                    layer.blit(self.world, self.camera, window)
+                self._world_valid = True
+            self.frame.blit(self.world, (0, 0))
+        self.frame.blit(surface, (self.camera.x, 0))
+
+    def cycle_viewport_mode(self, name):
+        """
+        Switch one viewport to the next render mode; the others keep theirs.
 
-        # Janela no mundo (região ao redor da cesta)
-        hoop_window = (hoop.xc - 50, hoop.yc - 40, hoop.xc + 50, hoop.yc + 40)
-
-        # Viewport no canto superior direito - formato (xmin, ymin, xmax, ymax)
-        zoom_bounds = (620, 10, 790, 140)
-
-        # Matriz de transformação
-        world_to_zoom = window_viewport(hoop_window, zoom_bounds)
-        sx, sy = get_scale_factors(hoop_window, zoom_bounds)
-
-        # Limites de clipping da viewport
-        vxmin, vymin = zoom_bounds[0], zoom_bounds[1]
-        vxmax, vymax = zoom_bounds[2], zoom_bounds[3]
-
-        # 1. FUNDO DA VIEWPORT
-        bg_points = [(vxmin, vymin), (vxmax, vymin), (vxmax, vymax), (vxmin, vymax)]
-        scanline_polygon(surface, bg_points, (135, 206, 235))  # Azul céu
-
-        # 2. POSTE (parte visível)
-        pole_top_y = hoop.yc - hoop.b_outer
-        pole_points_world = [
-            (hoop.xc + hoop.a_outer, pole_top_y),
-            (hoop.xc + hoop.a_outer + hoop.pole_width, pole_top_y),
-            (hoop.xc + hoop.a_outer + hoop.pole_width, hoop.ground_y),
-            (hoop.xc + hoop.a_outer, hoop.ground_y)
-        ]
-        pole_points_zoom = [transform_point(p[0], p[1], world_to_zoom) for p in pole_points_world]
-        pole_points_zoom = [(int(p[0]), int(p[1])) for p in pole_points_zoom]
-
-        draw_polygon_clipping(surface, pole_points_zoom, (vxmin, vymin, vxmax, vymax), hoop.colors["border"])
-        scanline_polygon_clipping(surface, pole_points_zoom, hoop.colors["pole"], vxmin, vymin, vxmax, vymax)
-
-        # 3. TABELA (BACKBOARD)
-        backboard_x = hoop.xc + hoop.a_outer - 5
-        backboard_y = hoop.yc - hoop.backboard_height // 2 - 10
-        backboard_points_world = [
-            (backboard_x, backboard_y),
-            (backboard_x + hoop.backboard_thickness, backboard_y),
-            (backboard_x + hoop.backboard_thickness, backboard_y + hoop.backboard_height),
-            (backboard_x, backboard_y + hoop.backboard_height)
-        ]
-        backboard_points_zoom = [transform_point(p[0], p[1], world_to_zoom) for p in backboard_points_world]
-        backboard_points_zoom = [(int(p[0]), int(p[1])) for p in backboard_points_zoom]
-
-        draw_polygon_clipping(surface, backboard_points_zoom, (vxmin, vymin, vxmax, vymax), hoop.colors["backboard_border"])
-        scanline_polygon_clipping(surface, backboard_points_zoom, hoop.colors["backboard"], vxmin, vymin, vxmax, vymax)
-
-        # 4. REDE (linhas com clipping)
-        net_yc = hoop.yc + hoop.b_inner
-        net_a = hoop.a_inner
-        net_height = hoop.net_height
-        spacing = 6
-        max_offset = 4
-
-        for x in range(hoop.xc - net_a, hoop.xc + net_a + 1, spacing):
-            for i in range(0, net_height, spacing):
-                t = i / net_height
-                offset = int(max_offset * (1 - t))
-
-                # Linha direita (\)
-                x0, y0 = x + offset, net_yc + i
-                x1, y1 = x, net_yc + i + spacing
-                zx0, zy0 = transform_point(x0, y0, world_to_zoom)
-                zx1, zy1 = transform_point(x1, y1, world_to_zoom)
-                visible, cx0, cy0, cx1, cy1 = cohen_sutherland(zx0, zy0, zx1, zy1, vxmin, vymin, vxmax, vymax)
-                if visible:
-                    draw_line_bresenham(surface, int(cx0), int(cy0), int(cx1), int(cy1), hoop.colors["net"])
-
-                # Linha esquerda (/)
-                x0, y0 = x - offset, net_yc + i
-                x1, y1 = x, net_yc + i + spacing
-                zx0, zy0 = transform_point(x0, y0, world_to_zoom)
-                zx1, zy1 = transform_point(x1, y1, world_to_zoom)
-                visible, cx0, cy0, cx1, cy1 = cohen_sutherland(zx0, zy0, zx1, zy1, vxmin, vymin, vxmax, vymax)
-                if visible:
-                    draw_line_bresenham(surface, int(cx0), int(cy0), int(cx1), int(cy1), hoop.colors["net"])
-
-        # 5. CESTA (elipses)
-        hoop_zx, hoop_zy = transform_point(hoop.xc, hoop.yc, world_to_zoom)
-        hoop_za_outer = int(hoop.a_outer * sx)
-        hoop_zb_outer = int(hoop.b_outer * sy)
-        hoop_za_inner = int(hoop.a_inner * sx)
-        hoop_zb_inner = int(hoop.b_inner * sy)
-
-        draw_ellipse_clipping(surface, int(hoop_zx), int(hoop_zy), hoop_za_outer, hoop_zb_outer, vxmin, vymin, vxmax, vymax, hoop.colors["border"])
-        draw_ellipse_clipping(surface, int(hoop_zx), int(hoop_zy), hoop_za_inner, hoop_zb_inner, vxmin, vymin, vxmax, vymax, hoop.colors["border"])
-        hoop_scanline(surface, int(hoop_zx), int(hoop_zy), hoop_za_outer, hoop_zb_outer, hoop_za_inner, hoop_zb_inner, hoop.colors["fill"], hoop.colors["border"])
-
-        # 6. BOLA
-        ball_zx, ball_zy = transform_point(ball.xc, ball.yc, world_to_zoom)
-        ball_zr = int(ball.r * min(sx, sy))
-
-        draw_circle_clipping(surface, int(ball_zx), int(ball_zy), ball_zr, vxmin, vymin, vxmax, vymax, ball.colors["border_and_details"])
-        circle_scanline(surface, int(ball_zx), int(ball_zy), ball_zr, ball.colors["fill"], ball.colors["border_and_details"], (vxmin, vymin, vxmax, vymax))
-
-        cos_a = math.cos(ball.angle)
-        sin_a = math.sin(ball.angle)
-        def rotate_around(px, py, cx, cy):
-            dx, dy = px - cx, py - cy
-            return dx * cos_a - dy * sin_a + cx, dx * sin_a + dy * cos_a + cy
-
-        # Rotated horizontal line
-        h1_x, h1_y = rotate_around(ball_zx - ball_zr, ball_zy, ball_zx, ball_zy)
-        h2_x, h2_y = rotate_around(ball_zx + ball_zr, ball_zy, ball_zx, ball_zy)
-        visible, cx0, cy0, cx1, cy1 = cohen_sutherland(h1_x, h1_y, h2_x, h2_y, vxmin, vymin, vxmax, vymax)
-        if visible:
-            draw_line_bresenham(surface, int(cx0), int(cy0), int(cx1), int(cy1), ball.colors["border_and_details"])
-
-        # Rotated vertical line
-        v1_x, v1_y = rotate_around(ball_zx, ball_zy - ball_zr, ball_zx, ball_zy)
-        v2_x, v2_y = rotate_around(ball_zx, ball_zy + ball_zr, ball_zx, ball_zy)
-        visible, cx0, cy0, cx1, cy1 = cohen_sutherland(v1_x, v1_y, v2_x, v2_y, vxmin, vymin, vxmax, vymax)
-        if visible:
-            draw_line_bresenham(surface, int(cx0), int(cy0), int(cx1), int(cy1), ball.colors["border_and_details"])
-
-        r_arc = int(ball_zr * 1.6)  # Radius for the arcs
-
-        # Rotated right arc
-        arc_right_x, arc_right_y = rotate_around(ball_zx + ball_zr, ball_zy, ball_zx, ball_zy)
-        draw_arc_clipping(
-            surface, 
-            int(arc_right_x), 
-            int(arc_right_y), 
-            r_arc, 
-            int(ball_zx), 
-            int(ball_zy), 
-            ball_zr, 
-            vxmin, 
-            vymin, 
-            vxmax, 
-            vymax, 
-            ball.colors["border_and_details"]
-            )
-
-        # Rotated left arc
-        arc_left_x, arc_left_y = rotate_around(ball_zx - ball_zr, ball_zy, ball_zx, ball_zy)
-        draw_arc_clipping(
-            surface, 
-            int(arc_left_x), 
-            int(arc_left_y), 
-            r_arc, 
-            int(ball_zx), 
-            int(ball_zy), 
-            ball_zr, 
-            vxmin, 
-            vymin, 
-            vxmax, 
-            vymax, 
-            ball.colors["border_and_details"]
-            )
-
-        # 7. BORDA DA VIEWPORT
-        border = [(vxmin, vymin), (vxmax, vymin), (vxmax, vymax), (vxmin, vymax)]
-        draw_polygon(surface, border, (255, 255, 255))
\ No newline at end of file
+        Args:
+            name (str): Name of the viewport.
+
+        Returns:
+            str | None: The new mode, None if there is no such viewport.
+        """
+        viewport = self.get_viewport(name)
+        if viewport is None:
+            return None
+        index = (VIEWPORT_MODES.index(viewport.mode) + 1) % len(VIEWPORT_MODES)
+        viewport.set_mode(VIEWPORT_MODES[index])
+        return viewport.mode
+
+    def render_viewports(self, surface, scene, now=None):
+        """
+        Draw every visible viewport, refreshing the ones that are due.
+
+        Args:
+            surface: The pygame surface to draw the viewports on.
+            scene (list): Objects with draw_viewport(surface, viewport), in draw order.
+            now (float | None): Current time in seconds.
+        """
+        for viewport in self.viewports:
+            if not viewport.is_visible():
+                # Shown again later: render a fresh image right away
+                viewport.invalidate()
+                continue
+            viewport.draw(surface, scene, self.frame, now)
+            self.mark_dirty(viewport.screen_rect)
@@ -0,0 +1,334 @@
+"""Headless Monte Carlo sweep of the shot space, to tune the physics.
+
+Random slingshot drags are launched by the thousand into one BallSystem and
+stepped with the same call the game makes every tick; the game rules (score,
+out of bounds, time on the ground) are applied as array operations. Every
+launch therefore ends exactly like the same shot played as the first shot of
+a fresh interactive game, which --verify checks by replaying launches
+through Game. The results are a score-probability heat map over the drag
+vector and a few statistics.
+
+Usage:
+    python -m core.shot_sweep [--launches 1000000] [--workers 4]
+                              [--heatmap sweep.png] [--stats sweep.json]
+                              [--restitution 0.65] [--friction 0.98]
+                              [--launch-scale 0.3] [--score-window 26 6]
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pygame
+
+from core.game import Game
+from core.screen import WIDTH, HEIGHT
+from core.timestep import FixedTimestep, REFERENCE_RATE
+from game.ball import BasketBall
+from game.ball_system import BallSystem
+from game.hoop import BasketHoop
+
+# Court of the interactive game, at its default width
+LAUNCH = Game.LAUNCH
+BALL_RADIUS = Game.BALL_RADIUS
+HOOP = Game.hoop_position(WIDTH)
+GROUND_Y = Game.GROUND_Y
+MAX_DRAG = 100  # Longest slingshot drag, see BasketBall.update_drag
+
+# Outcomes of a launch
+FLYING, SCORED, OUT, GROUNDED = range(4)
+OUTCOMES = ("flying", "scored", "out", "grounded")
+
+DEFAULTS = {
+    "launch_scale": BasketBall.LAUNCH_SCALE,
+    "restitution": BallSystem.RESTITUTION,
+    "friction": BallSystem.FRICTION,
+    "score_window": (26, 6),
+    "rate": REFERENCE_RATE,
+}
+
+
+def drag_positions(dx, dy):
+    """
+    Place the dragged balls like BasketBall.update_drag does.
+
+    Args:
+        dx, dy (numpy.ndarray): Drag vectors, launch point minus mouse.
+
+    Returns:
+        tuple: (x, y) ball centers at release.
+    """
+    dx = np.array(dx, dtype=float)
+    dy = np.array(dy, dtype=float)
+    distance = (dx ** 2 + dy ** 2) ** 0.5
+    long = distance > MAX_DRAG
+    ratio = MAX_DRAG / distance[long]
+    dx[long] *= ratio
+    dy[long] *= ratio
+    return LAUNCH[0] - dx, LAUNCH[1] - dy
+
+
+def simulate(dx, dy, launch_scale=DEFAULTS["launch_scale"], restitution=DEFAULTS["restitution"],
+             friction=DEFAULTS["friction"], score_window=DEFAULTS["score_window"],
+             rate=DEFAULTS["rate"], max_ticks=None):
+    """
+    Simulate a batch of launches until every one of them ends.
+
+    Args:
+        dx, dy (numpy.ndarray): Drag vectors, launch point minus mouse.
+        launch_scale (float): Launch speed per pixel of drag.
+        restitution (float): Ground bounce energy retention.
+        friction (float): Rolling friction.
+        score_window (tuple): (a, b) semi-axes of the scoring ellipse.
+        rate (float): Physics ticks per second.
+        max_ticks (int | None): Ticks simulated before giving up on the
+            launches still flying. Defaults to a minute of game time.
+
+    Returns:
+        tuple: (outcome, ticks) arrays, the outcome code of every launch and
+            the tick it ended on.
+    """
+    dt = FixedTimestep(rate).scale
+    if max_ticks is None:
+        max_ticks = math.ceil(60 * rate)
+    hoop = BasketHoop(*HOOP, GROUND_Y)
+    hoop.score_a, hoop.score_b = score_window
+
+    count = len(dx)
+    system = BallSystem(count)
+    system.RESTITUTION = restitution
+    system.FRICTION = friction
+    slots = system.add_many(np.full(count, LAUNCH[0]), np.full(count, LAUNCH[1]), BALL_RADIUS)
+
+    # Release, like BasketBall.release_drag
+    x, y = drag_positions(dx, dy)
+    system.position[slots, 0] = x
+    system.position[slots, 1] = y
+    vx = (system.initial[slots, 0] - x) * launch_scale
+    vy = (system.initial[slots, 1] - y) * launch_scale
+    system.shoot(slots, np.column_stack((vx, vy)), vx * 0.01)
+
+    outcome = np.full(system.capacity, FLYING, dtype=np.int8)
+    ticks = np.zeros(system.capacity, dtype=np.int32)
+    contact = np.zeros(system.capacity)
+
+    def finish(done, code, tick):
+        outcome[done] = code
+        ticks[done] = tick
+        system.is_shot[done] = False
+
+    # The rules of Game.update, for every ball in flight
+    for tick in range(1, max_ticks + 1):
+        if not system.is_shot.any():
+            break
+        scored = system.step(
+            Game.GRAVITY, dt, GROUND_Y, hoop, Game.MAX_STEP_DISTANCE, Game.MAX_BOUNCES
+        )
+        finish(scored, SCORED, tick)
+
+        out = system.out_of_bounds(WIDTH, HEIGHT)
+        finish(out[system.is_shot[out]], OUT, tick)
+
+        resting = system.resting(GROUND_Y, hoop, Game.REST_SPEED)
+        contact[resting] += dt
+        finish(resting & (contact >= Game.MAX_GROUND_TIME), GROUNDED, tick)
+
+    return outcome[slots], ticks[slots]
+
+
+def _simulate_chunk(task):
+    """Pool worker: simulate one chunk of launches."""
+    dx, dy, params = task
+    return simulate(dx, dy, **params)
+
+
+def sample_drags(count, rng):
+    """Draw drag vectors uniformly over the disk of allowed drags."""
+    radius = MAX_DRAG * np.sqrt(rng.random(count))
+    angle = rng.uniform(0, 2 * np.pi, count)
+    return radius * np.cos(angle), radius * np.sin(angle)
+
+
+def sweep(count, params, workers=1, chunk=50000, seed=0):
+    """
+    Simulate random launches, in parallel chunks.
+
+    Returns:
+        tuple: (dx, dy, outcome, ticks) arrays.
+    """
+    dx, dy = sample_drags(count, np.random.default_rng(seed))
+    tasks = [(dx[i:i + chunk], dy[i:i + chunk], params) for i in range(0, count, chunk)]
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_simulate_chunk, tasks)
+    else:
+        results = [_simulate_chunk(task) for task in tasks]
+    outcome = np.concatenate([result[0] for result in results])
+    ticks = np.concatenate([result[1] for result in results])
+    return dx, dy, outcome, ticks
+
+
+def heat_map(dx, dy, outcome, bins=100):
+    """
+    Bin the launches by drag vector.
+
+    Returns:
+        tuple: (probability, launches) (bins, bins) arrays indexed [dy, dx],
+            the probability being NaN in the bins without launches.
+    """
+    edges = np.linspace(-MAX_DRAG, MAX_DRAG, bins + 1)
+    launches, _, _ = np.histogram2d(dy, dx, (edges, edges))
+    scores, _, _ = np.histogram2d(dy[outcome == SCORED], dx[outcome == SCORED], (edges, edges))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability = scores / launches
+    return probability, launches
+
+
+def save_heat_map(path, probability, cell=4, low=(20, 20, 60), high=(255, 220, 0),
+                  empty=(60, 60, 60)):
+    """
+    Save a heat map as an image, one square of cell pixels per bin, with the
+    drag dx growing to the right and dy growing down.
+    """
+    t = np.nan_to_num(probability, nan=0.0)[..., None]
+    if np.nanmax(probability, initial=0.0) > 0:
+        t = t / np.nanmax(probability)
+    image = np.array(low) + (np.array(high) - np.array(low)) * t
+    image[np.isnan(probability)] = empty
+    image = np.repeat(np.repeat(image, cell, axis=0), cell, axis=1)
+    surface = pygame.surfarray.make_surface(image.transpose(1, 0, 2).astype(np.uint8))
+    pygame.image.save(surface, path)
+
+
+def statistics(dx, dy, outcome, ticks, probability, launches, min_launches=20):
+    """Summarize a sweep."""
+    scored = outcome == SCORED
+    stats = {
+        "launches": int(len(outcome)),
+        "outcomes": {name: int((outcome == code).sum()) for code, name in enumerate(OUTCOMES)},
+        "score_rate": float(scored.mean()) if len(outcome) else 0.0,
+        "mean_ticks_to_score": float(ticks[scored].mean()) if scored.any() else None,
+    }
+    reliable = np.where(launches >= min_launches, np.nan_to_num(probability, nan=0.0), -1.0)
+    best = np.unravel_index(np.argmax(reliable), reliable.shape)
+    if reliable[best] > 0:
+        step = 2 * MAX_DRAG / probability.shape[0]
+        stats["best_bin"] = {
+            "dx": -MAX_DRAG + (best[1] + 0.5) * step,
+            "dy": -MAX_DRAG + (best[0] + 0.5) * step,
+            "probability": float(probability[best]),
+            "launches": int(launches[best]),
+        }
+    return stats
+
+
+def replay(game, dx, dy, max_ticks):
+    """
+    Play one launch in an interactive Game through its event handler and
+    update, as the first shot of a fresh game.
+
+    Returns:
+        tuple: (scored, tick) with tick the one the shot ended on, 0 if it
+            did not end within max_ticks.
+    """
+    game.reset()
+    x, y = drag_positions([dx], [dy])
+    game.handle_sim_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=LAUNCH))
+    game.handle_sim_event(pygame.event.Event(pygame.MOUSEMOTION, pos=(LAUNCH[0] - dx, LAUNCH[1] - dy)))
+    game.handle_sim_event(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(x[0], y[0])))
+    for tick in range(1, max_ticks + 1):
+        game.update()
+        if not game.ball.is_shot:
+            return game.score_board.score == 1, tick
+    return False, 0
+
+
+def verify(count, params, seed=1):
+    """
+    Replay random launches in the interactive game and compare the results.
+
+    Returns:
+        int: Number of launches whose outcome or end tick differ.
+    """
+    dx, dy = sample_drags(count, np.random.default_rng(seed))
+    max_ticks = math.ceil(60 * params["rate"])
+    outcome, ticks = simulate(dx, dy, max_ticks=max_ticks, **params)
+
+    game = Game(headless=True, show_menu=False, fps=0, rate=params["rate"], court_width=WIDTH)
+    game.balls.RESTITUTION = params["restitution"]
+    game.balls.FRICTION = params["friction"]
+    game.ball.LAUNCH_SCALE = params["launch_scale"]
+    game.hoop.score_a, game.hoop.score_b = params["score_window"]
+
+    mismatches = 0
+    for i in range(count):
+        scored, tick = replay(game, dx[i], dy[i], max_ticks)
+        if scored != (outcome[i] == SCORED) or tick != ticks[i]:
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    """Run a sweep and report it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--launches", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=50000, help="launches per batch")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bins", type=int, default=100, help="heat map bins per axis")
+    parser.add_argument("--launch-scale", type=float, default=DEFAULTS["launch_scale"])
+    parser.add_argument("--restitution", type=float, default=DEFAULTS["restitution"])
+    parser.add_argument("--friction", type=float, default=DEFAULTS["friction"])
+    parser.add_argument("--score-window", type=float, nargs=2, default=DEFAULTS["score_window"],
+                        metavar=("A", "B"), help="semi-axes of the scoring ellipse")
+    parser.add_argument("--rate", type=float, default=DEFAULTS["rate"])
+    parser.add_argument("--heatmap", metavar="PATH", default=None, help="save the heat map image")
+    parser.add_argument("--stats", metavar="PATH", default=None, help="save the statistics as JSON")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="replay N launches in the interactive game and compare")
+    args = parser.parse_args()
+
+    params = {
+        "launch_scale": args.launch_scale,
+        "restitution": args.restitution,
+        "friction": args.friction,
+        "score_window": tuple(args.score_window),
+        "rate": args.rate,
+    }
+
+    start = time.perf_counter()
+    dx, dy, outcome, ticks = sweep(args.launches, params, args.workers, args.chunk, args.seed)
+    elapsed = time.perf_counter() - start
+
+    probability, launches = heat_map(dx, dy, outcome, args.bins)
+    stats = statistics(dx, dy, outcome, ticks, probability, launches)
+    stats["params"] = params
+    stats["seconds"] = elapsed
+
+    print(f"{stats['launches']} launches in {elapsed:.1f}s "
+          f"({stats['launches'] / elapsed:.0f} launches/s)")
+    for name, value in stats["outcomes"].items():
+        print(f"  {name:>9}: {value}")
+    print(f"  score rate: {stats['score_rate']:.4%}")
+    if "best_bin" in stats:
+        best = stats["best_bin"]
+        print(f"  best drag: ({best['dx']:.1f}, {best['dy']:.1f}) "
+              f"scores {best['probability']:.1%} of {best['launches']} launches")
+
+    if args.heatmap:
+        save_heat_map(args.heatmap, probability)
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as file:
+            json.dump(stats, file, indent=2)
+    if args.verify:
+        mismatches = verify(args.verify, params)
+        print(f"verify: {args.verify - mismatches}/{args.verify} launches match the interactive game")
+        if mismatches:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Simulation thread publishing immutable snapshots of the game state.
+
+The simulation runs at a fixed rate on its own thread and publishes a
+Snapshot after every tick. The renderer never touches the simulated objects:
+it draws the latest snapshots, interpolating between the two most recent
+ones, so a slow frame never delays physics and a physics spike never drops
+a frame.
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+
+BallState = namedtuple("BallState", "x y angle initial_x initial_y is_shot is_dragging")
+HoopState = namedtuple("HoopState", "xc yc")
+Snapshot = namedtuple("Snapshot", "tick time ball hoop score lives scored game_over")
+
+
+def take_snapshot(ball, hoop, score_board, scored, game_over, tick, now):
+    """
+    Capture the game state in an immutable snapshot.
+
+    Args:
+        ball (BasketBall): The simulated ball.
+        hoop (BasketHoop): The simulated hoop.
+        score_board (ScoreBoard): The simulated score board.
+        scored (bool): If the current shot already scored.
+        game_over (bool): If the game is over.
+        tick (int): Simulation tick number.
+        now (float): Time of the snapshot, in seconds.
+
+    Returns:
+        Snapshot: The captured state.
+    """
+    return Snapshot(
+        tick,
+        now,
+        BallState(
+            ball.xc, ball.yc, ball.angle, ball.initial_x, ball.initial_y,
+            ball.is_shot, ball.is_dragging
+        ),
+        HoopState(hoop.xc, hoop.yc),
+        score_board.score,
+        score_board.lives,
+        scored,
+        game_over
+    )
+
+
+def interpolate(previous, latest, alpha):
+    """
+    Blend the ball of two snapshots.
+
+    The ball is only interpolated while it keeps flying between both
+    snapshots; a reset, a release or a drag jumps to the latest state.
+
+    Args:
+        previous (Snapshot): Older snapshot.
+        latest (Snapshot): Newer snapshot.
+        alpha (float): 0 returns previous, 1 returns latest.
+
+    Returns:
+        Snapshot: The interpolated snapshot.
+    """
+    a, b = previous.ball, latest.ball
+    if previous is latest or not (a.is_shot and b.is_shot):
+        return latest
+
+    ball = b._replace(
+        x=a.x + (b.x - a.x) * alpha,
+        y=a.y + (b.y - a.y) * alpha,
+        angle=a.angle + (b.angle - a.angle) * alpha
+    )
+    return latest._replace(ball=ball)
+
+
+class SnapshotBuffer:
+    """Thread-safe holder of the two most recent snapshots."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._previous = None
+        self._latest = None
+
+    def publish(self, snapshot):
+        """Store a new snapshot, keeping the previous one for interpolation."""
+        with self._lock:
+            self._previous = self._latest or snapshot
+            self._latest = snapshot
+
+    def latest_pair(self):
+        """
+        Return the two most recent snapshots.
+
+        Returns:
+            tuple: (previous, latest), or (None, None) before the first publish.
+        """
+        with self._lock:
+            return self._previous, self._latest
+
+    def sample(self, now, delay):
+        """
+        Return the state shown at time now - delay, interpolated between
+        the two most recent snapshots.
+
+        Args:
+            now (float): Current time, in seconds.
+            delay (float): Render delay, usually one simulation tick.
+
+        Returns:
+            Snapshot | None: The interpolated snapshot.
+        """
+        previous, latest = self.latest_pair()
+        if latest is None:
+            return None
+        span = latest.time - previous.time
+        if span <= 0:
+            return latest
+        alpha = (now - delay - previous.time) / span
+        return interpolate(previous, latest, max(0.0, min(1.0, alpha)))
+
+
+class SimulationThread(threading.Thread):
+    """Thread running the game simulation at a fixed rate."""
+
+    def __init__(self, game, rate=60, max_lag=0.25):
+        """
+        Initialize the simulation thread.
+
+        Args:
+            game (Game): Game whose simulation runs on this thread.
+            rate (float): Ticks per second.
+            max_lag (float): Seconds behind schedule after which the missed
+                ticks are skipped instead of run back to back.
+        """
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.rate = rate
+        self.max_lag = max_lag
+        self.inputs = queue.Queue()
+        self.snapshots = SnapshotBuffer()
+        self._stop_event = threading.Event()
+
+    @property
+    def tick_duration(self):
+        """Duration of a tick, in seconds."""
+        return 1.0 / self.rate
+
+    def post(self, event):
+        """Queue an input event for the simulation."""
+        self.inputs.put(event)
+
+    def stop(self):
+        """Ask the thread to stop and wait for it."""
+        self._stop_event.set()
+        self.join()
+
+    def run(self):
+        """Run ticks on schedule until stopped."""
+        game = self.game
+        next_tick = time.perf_counter()
+        self.snapshots.publish(game.snapshot(next_tick))
+
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            if now < next_tick:
+                self._stop_event.wait(next_tick - now)
+                continue
+
+            while True:
+                try:
+                    event = self.inputs.get_nowait()
+                except queue.Empty:
+                    break
+                game.handle_sim_event(event)
+
+            if not game.show_start_screen:
+                game.update()
+            self.snapshots.publish(game.snapshot(next_tick))
+
+            next_tick += self.tick_duration
+            if time.perf_counter() - next_tick > self.max_lag:
+                next_tick = time.perf_counter()
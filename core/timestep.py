@@ -0,0 +1,62 @@
+"""Fixed-timestep accumulator for the physics.
+
+Real elapsed time is accumulated and consumed in ticks of constant duration,
+so the simulation only depends on the number of ticks and the inputs, never
+on the frame rate. The remainder left in the accumulator gives the
+interpolation factor between the last two ticks for rendering.
+"""
+REFERENCE_RATE = 60  # Rate the per-tick physics constants are tuned for
+
+
+class FixedTimestep:
+    """Class converting elapsed time into a whole number of fixed ticks."""
+
+    def __init__(self, rate=REFERENCE_RATE, max_steps=5):
+        """
+        Initialize the accumulator.
+
+        Args:
+            rate (float): Ticks per second.
+            max_steps (int): Maximum ticks run per frame. Time beyond it is
+                dropped, so a slow frame cannot snowball into slower ones.
+        """
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped = 0
+
+    @property
+    def scale(self):
+        """Duration of a tick in reference ticks, to scale per-tick constants."""
+        return REFERENCE_RATE / self.rate
+
+    @property
+    def alpha(self):
+        """Fraction of a tick left in the accumulator, in [0, 1)."""
+        return self.accumulator / self.dt
+
+    def advance(self, elapsed):
+        """
+        Accumulate elapsed time and return the ticks to run.
+
+        Args:
+            elapsed (float): Time since the previous call, in seconds.
+
+        Returns:
+            int: Number of ticks to run now.
+        """
+        self.accumulator += elapsed
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self.accumulator -= self.dt
+            steps += 1
+
+        if self.accumulator >= self.dt:
+            self.dropped += int(self.accumulator // self.dt)
+            self.accumulator %= self.dt
+
+        self.ticks += steps
+        return steps
+
@@ -0,0 +1,219 @@
+"""Viewports showing a window of the world on a region of the screen."""
+import time
+
+import pygame
+
+from animation.animation import window_viewport, transform_point, get_scale_factors
+from graphic.resample import resample_nearest, resample_box
+from graphic.shapes import draw_polygon
+
+# Viewport render modes: re-rasterize the scene through the viewport
+# transform, or resample the finished frame with a nearest/box filter
+RENDER_VECTOR = "vector"
+RENDER_NEAREST = "nearest"
+RENDER_BOX = "box"
+VIEWPORT_MODES = (RENDER_VECTOR, RENDER_NEAREST, RENDER_BOX)
+
+RESAMPLERS = {
+    RENDER_NEAREST: resample_nearest,
+    RENDER_BOX: resample_box,
+}
+
+# Color treated as transparent on viewports without background
+VIEWPORT_COLORKEY = (255, 0, 255)
+
+
+class Viewport:
+    """Class representing a window of the world shown on a screen region."""
+
+    def __init__(
+        self,
+        name,
+        window,
+        rect,
+        refresh_rate=None,
+        mode=RENDER_VECTOR,
+        background=None,
+        border_color=(255, 255, 255),
+        window_source=None,
+        visible=None
+    ):
+        """
+        Initialize a viewport.
+
+        Args:
+            name (str): Viewport name.
+            window (tuple): (xmin, ymin, xmax, ymax) world window.
+            rect (tuple): (xmin, ymin, xmax, ymax) inclusive screen bounds.
+            refresh_rate (float | None): Target refreshes per second. Between
+                refreshes the last image is reused. None refreshes every frame.
+            mode (str): One of VIEWPORT_MODES.
+            background (tuple | None): Fill color, or None to show the world behind.
+            border_color (tuple | None): Color of the viewport border.
+            window_source (callable | None): Returns the current world window,
+                for viewports following an object.
+            visible (callable | None): Returns False to hide the viewport.
+        """
+        self.name = name
+        self.rect = rect
+        self.refresh_rate = refresh_rate
+        self.mode = mode
+        self.background = background
+        self.border_color = border_color
+        self.window_source = window_source
+        self.visible = visible
+
+        xmin, ymin, xmax, ymax = rect
+        self.width = xmax - xmin + 1
+        self.height = ymax - ymin + 1
+
+        # Clipping window in viewport (local) coordinates
+        self.clip = (0, 0, self.width - 1, self.height - 1)
+
+        self.image = pygame.Surface((self.width, self.height))
+        if background is None:
+            self.image.set_colorkey(VIEWPORT_COLORKEY)
+
+        self.window = None
+        self._transform = None
+        self._scale = None
+        self._last_refresh = None
+        self.set_window(window)
+
+    def set_window(self, window):
+        """
+        Change the world window, dropping the cached transform if it moved.
+
+        Args:
+            window (tuple): (xmin, ymin, xmax, ymax) world window.
+        """
+        window = tuple(window)
+        if window == self.window:
+            return
+        self.window = window
+        self._transform = None
+        self._scale = None
+        self.invalidate()
+
+    def set_mode(self, mode):
+        """
+        Change the render mode.
+
+        Args:
+            mode (str): One of VIEWPORT_MODES.
+        """
+        if mode != self.mode:
+            self.mode = mode
+            self.invalidate()
+
+    @property
+    def transform(self):
+        """Window to viewport matrix, computed once per window."""
+        if self._transform is None:
+            self._transform = window_viewport(self.window, (0, 0, self.width, self.height))
+        return self._transform
+
+    @property
+    def scale(self):
+        """(sx, sy) scale factors from world to viewport."""
+        if self._scale is None:
+            self._scale = get_scale_factors(self.window, (0, 0, self.width, self.height))
+        return self._scale
+
+    @property
+    def screen_rect(self):
+        """The viewport region on the screen as a pygame.Rect."""
+        return pygame.Rect(self.rect[0], self.rect[1], self.width, self.height)
+
+    def to_viewport(self, x, y):
+        """
+        Transform a world point into viewport coordinates.
+
+        Args:
+            x (float): World x-coordinate.
+            y (float): World y-coordinate.
+
+        Returns:
+            tuple[int, int]: Point in viewport coordinates.
+        """
+        vx, vy = transform_point(x, y, self.transform)
+        return int(vx), int(vy)
+
+    def scale_length(self, length):
+        """
+        Transform a world length (radius, width) into viewport pixels.
+
+        Args:
+            length (float): Length in world units.
+
+        Returns:
+            int: Length in viewport pixels.
+        """
+        sx, sy = self.scale
+        return int(length * min(sx, sy))
+
+    def is_visible(self):
+        """Check if the viewport should be drawn this frame."""
+        return self.visible is None or self.visible()
+
+    def invalidate(self):
+        """Force a refresh on the next draw."""
+        self._last_refresh = None
+
+    def needs_refresh(self, now):
+        """
+        Check if the cached image is older than the target refresh period.
+
+        Args:
+            now (float): Current time in seconds.
+        """
+        if self._last_refresh is None or self.refresh_rate is None:
+            return True
+        return now - self._last_refresh >= 1.0 / self.refresh_rate
+
+    def refresh(self, scene, frame):
+        """
+        Render the viewport image.
+
+        Args:
+            scene (list): Objects with draw_viewport(surface, viewport), in draw order.
+            frame (pygame.Surface): Offscreen copy of the world, used by the
+                resampling modes.
+        """
+        if self.mode == RENDER_VECTOR:
+            self.image.fill(self.background or VIEWPORT_COLORKEY)
+            for item in scene:
+                item.draw_viewport(self.image, self)
+        else:
+            RESAMPLERS[self.mode](frame, self.window, self.image, self.clip)
+
+        if self.border_color is not None:
+            xmin, ymin, xmax, ymax = self.clip
+            border = [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]
+            draw_polygon(self.image, border, self.border_color)
+
+    def draw(self, surface, scene, frame, now=None):
+        """
+        Draw the viewport on the surface, refreshing its image if due.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            scene (list): Objects with draw_viewport(surface, viewport), in draw order.
+            frame (pygame.Surface): Offscreen copy of the world.
+            now (float | None): Current time in seconds. Defaults to the clock.
+
+        Returns:
+            bool: True if the image was refreshed.
+        """
+        if now is None:
+            now = time.perf_counter()
+        if self.window_source is not None:
+            self.set_window(self.window_source())
+
+        refreshed = self.needs_refresh(now)
+        if refreshed:
+            self.refresh(scene, frame)
+            self._last_refresh = now
+
+        surface.blit(self.image, (self.rect[0], self.rect[1]))
+        return refreshed
@@ -1,192 +1,168 @@
 """BasketBall class representing a basketball with drawing and movement capabilities."""
 
 import math
+from game.ball_system import BallSystem
 from graphic.scan_line import circle_scanline
 from graphic.shapes import draw_circle, draw_line_bresenham, draw_arc
+from graphic.sprites import IndexedSprite, SpriteCache
 
 
-class BasketBall:
-    """Class representing a basketball."""
+def _slot_field(name, column=None, cast=float):
+    """Property reading and writing one slot of a BallSystem array."""
+    if column is None:
+        def get(self):
+            return cast(getattr(self.system, name)[self.slot])
+
+        def set(self, value):
+            getattr(self.system, name)[self.slot] = value
+    else:
+        def get(self):
+            return cast(getattr(self.system, name)[self.slot, column])
 
-    # --- Physics constants (arcade-tuned) ---
-    RESTITUTION = 0.65      # Bounce energy retention
-    FRICTION = 0.98         # Horizontal rolling friction
-    ROLL_THRESHOLD = 0.5    # Min vertical speed to stop bouncing
+        def set(self, value):
+            getattr(self.system, name)[self.slot, column] = value
+    return property(get, set)
 
-    def __init__(self, xc, yc, r=15, fill_color=(255, 165, 0), border_color=(0, 0, 0)):
+
+class BasketBall:
+    """Class representing a basketball, as a view into one slot of a BallSystem."""
+
+    # --- Slingshot ---
+    LAUNCH_SCALE = 0.3      # Launch speed per pixel of slingshot drag
+
+    # --- Sprite cache ---
+    ANGLE_STEPS = 64        # Rotations cached over a half turn
+
+    # State stored in the system arrays
+    xc = _slot_field("position", 0)
+    yc = _slot_field("position", 1)
+    initial_x = _slot_field("initial", 0)
+    initial_y = _slot_field("initial", 1)
+    r = _slot_field("radius", cast=int)  # Radius
+    angle = _slot_field("angle")  # Current angle in radians
+    angular_velocity = _slot_field("angular_velocity")  # Angular velocity
+    is_shot = _slot_field("is_shot", cast=bool)
+    is_dragging = _slot_field("is_dragging", cast=bool)
+
+    def __init__(self, xc, yc, r=15, fill_color=(255, 165, 0), border_color=(0, 0, 0), system=None):
         """
         Initialize a basketball object.
 
         Args:
             xc (float): Initial x-coordinate of the ball's center.
             yc (float): Initial y-coordinate of the ball's center.
+            system (BallSystem | None): System storing the ball. A private
+                one-slot system is created when omitted.
         """
-        self.initial_x = xc
-        self.initial_y = yc
-        self.xc = xc
-        self.yc = yc
-        self.velocity = [0.0, 0.0]
-        self.r = r  # Radius
-        self.is_shot = False
-        self.is_dragging = False
+        self.system = system if system is not None else BallSystem(1)
+        self.slot = self.system.add(xc, yc, r)
         self.drag_start = None
-        self.angle = 0.0  # Current angle in radians
-        self.angular_velocity = 0.0  # Angular velocity
         self.colors = {
             "fill": fill_color,  # Orange
             "border_and_details": border_color  # Black
         }
 
-    def _rotate_point(self, x, y):
+    def sprite(self, r=None, details=True):
         """
-        Rotate a point (x, y) around the center of the ball.
+        Get the pre-rendered sprite of the ball at its current angle.
 
         Args:
-            x (float): x-coordinate of the point to rotate.
-            y (float): y-coordinate of the point to rotate.
+            r (int | None): Radius of the sprite. Defaults to the ball radius.
+            details (bool): Draw the rotated lines and arcs.
 
         Returns:
-            tuple: (x_new, y_new) rotated coordinates.
+            IndexedSprite: Cached sprite, centered on its origin. Its palette
+                entries are the fill and the border colors.
         """
-        dx = x - self.xc
-        dy = y - self.yc
-        cos_a = math.cos(self.angle)
-        sin_a = math.sin(self.angle)
-        x_new = dx * cos_a - dy * sin_a + self.xc
-        y_new = dx * sin_a + dy * cos_a + self.yc
-        return x_new, y_new
+        # The details are symmetric under a half turn, so only [0, pi) is cached
+        step = int(round(self.angle % math.pi / math.pi * self.ANGLE_STEPS)) % self.ANGLE_STEPS
+        return _SPRITES.get(self.r if r is None else r, step if details else None)
 
-    def draw(self, surface):
+    @property
+    def palette(self):
+        """Colors of the sprite palette entries: fill, then border and details."""
+        return (self.colors["fill"], self.colors["border_and_details"])
+
+    def draw(self, surface, offset=(0, 0)):
         """
-        Draw the basketball on the given surface.
+        Draw the basketball on the given surface as a single clipped stamp
+        of its cached sprite.
 
         Args:
             surface: The pygame surface to draw on.
+            offset (tuple): (dx, dy) added to the world position, the
+                camera translation.
         """
-        # Convert coordinates to integers for drawing
-        xc = int(self.xc)
-        yc = int(self.yc)
-
-        # Draw the outer circle and cross details
-        draw_circle(surface, xc, yc, self.r, self.colors["border_and_details"])
-
-        # Fill the circle using scan-line algorithm
-        circle_scanline(
-            surface,
-            xc,
-            yc,
-            self.r,
-            self.colors["fill"],
-            self.colors["border_and_details"],
-        )
+        self.sprite().stamp(surface, int(self.xc) + offset[0], int(self.yc) + offset[1], self.palette)
 
-        # Rotated horizontal line
-        h1_x, h1_y = self._rotate_point(xc - self.r, yc)
-        h2_x, h2_y = self._rotate_point(xc + self.r, yc)
-        draw_line_bresenham(surface, int(h1_x), int(h1_y), int(h2_x), int(h2_y), self.colors["border_and_details"])
-
-        # Rotated vertical line
-        v1_x, v1_y = self._rotate_point(xc, yc - self.r)
-        v2_x, v2_y = self._rotate_point(xc, yc + self.r)
-        draw_line_bresenham(surface, int(v1_x), int(v1_y), int(v2_x), int(v2_y), self.colors["border_and_details"])
-
-        r_arc = int(self.r * 1.6)  # Radius for the arcs
-
-        # Rotated right arc
-        arc_right_x, arc_right_y = self._rotate_point(xc + self.r, yc)
-        draw_arc(
-            surface,
-            int(arc_right_x),
-            int(arc_right_y),
-            r_arc,
-            xc,
-            yc,
-            self.r,
-            self.colors["border_and_details"]
-        )
+    def draw_vector(self, surface, details=True):
+        """
+        Rasterize the basketball on the given surface with the outline,
+        scan-line fill, rotated lines and arcs algorithms.
 
-        # Rotated left arc
-        arc_left_x, arc_left_y = self._rotate_point(xc - self.r, yc)
-        draw_arc(
-            surface,
-            int(arc_left_x),
-            int(arc_left_y),
-            r_arc,
-            xc,
-            yc,
-            self.r,
-            self.colors["border_and_details"]
+        Args:
+            surface: The pygame surface to draw on.
+            details (bool): Draw the rotated lines and arcs.
+        """
+        _draw_ball(
+            surface, self.xc, self.yc, self.r, self.angle,
+            self.colors["fill"], self.colors["border_and_details"], details
         )
 
-    def shot(self, vx, vy):
+    def draw_viewport(self, surface, viewport):
         """
-        Set the initial velocity of the basketball.
+        Draw the basketball through a viewport transform, stamping the
+        sprite of the scaled radius clipped to the viewport window. The
+        rotated details are skipped when the ball is too small to show them.
 
         Args:
-            vx (float): Velocity in x-direction.
-            vy (float): Velocity in y-direction.
+            surface: The viewport surface.
+            viewport (Viewport): Viewport providing the transform and clip window.
         """
-        self.velocity = [vx, vy]
-        self.is_shot = True
+        xc, yc = viewport.to_viewport(self.xc, self.yc)
+        r = max(1, viewport.scale_length(self.r))
+        self.sprite(r, details=r >= 6).stamp(surface, xc, yc, self.palette, viewport.clip)
 
-    def update(self, gravity=0.5, ground_y=None):
+    def get_bounds(self, offset=(0, 0)):
         """
-        Update the position of the basketball based on its velocity and gravity.
+        Get the screen region covered by the ball when drawn.
 
         Args:
-            gravity (float): Gravity acceleration value. Default is 0.5.
-            ground_y (float | None): Y coordinate of the ground.
-        """
-        if not self.is_shot:
-            return
-
-        # Apply gravity
-        self.velocity[1] += gravity
+            offset (tuple): (dx, dy) camera translation, as in draw().
 
-        # Integrate motion
-        self.xc += self.velocity[0]
-        self.yc += self.velocity[1]
+        Returns:
+            tuple: (x, y, width, height) bounding box of the stamped sprite.
+        """
+        sprite = self.sprite()
+        return (
+            int(self.xc) + offset[0] - sprite.origin[0], int(self.yc) + offset[1] - sprite.origin[1],
+            sprite.width, sprite.height
+        )
 
-        # Apply rotation (visual only)
-        self.angle += self.angular_velocity
+    @property
+    def velocity(self):
+        """Velocity [vx, vy], as a writable view into the system array."""
+        return self.system.velocity[self.slot]
 
-        # Ground collision
-        if ground_y is not None:
-            self._resolve_ground_collision(ground_y)
+    @velocity.setter
+    def velocity(self, value):
+        self.system.velocity[self.slot] = value
 
-    def _resolve_ground_collision(self, ground_y):
+    def shot(self, vx, vy):
         """
-        Resolve collision between the ball and the ground.
+        Set the initial velocity of the basketball.
 
         Args:
-            ground_y (float): Y coordinate of the ground surface.
+            vx (float): Velocity in x-direction.
+            vy (float): Velocity in y-direction.
         """
-        if self.yc + self.r >= ground_y:
-            # Position correction
-            self.yc = ground_y - self.r
-
-            # Bounce only if falling
-            if self.velocity[1] > 0:
-                self.velocity[1] = -self.velocity[1] * self.RESTITUTION
-
-            # Rolling friction
-            self.velocity[0] *= self.FRICTION
-
-            # Stop bouncing -> rolling
-            if abs(self.velocity[1]) < self.ROLL_THRESHOLD:
-                self.velocity[1] = 0
-                self.angular_velocity = self.velocity[0] * 0.02
+        self.velocity = [vx, vy]
+        self.is_shot = True
 
     def reset(self):
         """Reset the ball to its initial position and state."""
-        self.xc = self.initial_x
-        self.yc = self.initial_y
-        self.velocity = [0.0, 0.0]
-        self.is_shot = False
-        self.is_dragging = False
+        self.system.reset(self.slot)
         self.drag_start = None
-        self.angle = 0.0
-        self.angular_velocity = 0.0
 
     def is_out_of_bounds(self, width, height):
         """
@@ -244,12 +220,104 @@ class BasketBall:
             self.xc = self.initial_x - dx
             self.yc = self.initial_y - dy
 
+    def launch_velocity(self):
+        """
+        Return the velocity the slingshot gives for the current drag.
+
+        Returns:
+            tuple: (vx, vy) per reference tick.
+        """
+        return (
+            (self.initial_x - self.xc) * self.LAUNCH_SCALE,
+            (self.initial_y - self.yc) * self.LAUNCH_SCALE
+        )
+
     def release_drag(self):
         """Release the slingshot and shoot the ball."""
         if self.is_dragging:
-            vx = (self.initial_x - self.xc) * 0.3
-            vy = (self.initial_y - self.yc) * 0.3
+            vx, vy = self.launch_velocity()
             self.angular_velocity = vx * 0.01
             self.shot(vx, vy)
             self.is_dragging = False
             self.drag_start = None
+
+
+def _draw_ball(surface, x, y, r, angle, fill_color, border_color, details=True):
+    """
+    Rasterize a basketball with the outline, scan-line fill, rotated lines
+    and arcs algorithms.
+
+    Args:
+        surface: The pygame surface to draw on.
+        x, y (float): Center of the ball; the details rotate around it.
+        r (int): Radius of the ball.
+        angle (float): Rotation of the details, in radians.
+        fill_color (tuple): Color of the inside of the ball.
+        border_color (tuple): Color of the outline and the details.
+        details (bool): Draw the rotated lines and arcs.
+    """
+    # Convert coordinates to integers for drawing
+    xc = int(x)
+    yc = int(y)
+
+    # Draw the outer circle and cross details
+    draw_circle(surface, xc, yc, r, border_color)
+
+    # Fill the circle using scan-line algorithm
+    circle_scanline(surface, xc, yc, r, fill_color, border_color)
+
+    if not details:
+        return
+
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+
+    def rotate(px, py):
+        """Rotate a point around the center of the ball."""
+        dx = px - x
+        dy = py - y
+        return dx * cos_a - dy * sin_a + x, dx * sin_a + dy * cos_a + y
+
+    # Rotated horizontal line
+    h1_x, h1_y = rotate(xc - r, yc)
+    h2_x, h2_y = rotate(xc + r, yc)
+    draw_line_bresenham(surface, int(h1_x), int(h1_y), int(h2_x), int(h2_y), border_color)
+
+    # Rotated vertical line
+    v1_x, v1_y = rotate(xc, yc - r)
+    v2_x, v2_y = rotate(xc, yc + r)
+    draw_line_bresenham(surface, int(v1_x), int(v1_y), int(v2_x), int(v2_y), border_color)
+
+    r_arc = int(r * 1.6)  # Radius for the arcs
+
+    # Rotated right and left arcs
+    arc_right_x, arc_right_y = rotate(xc + r, yc)
+    draw_arc(surface, int(arc_right_x), int(arc_right_y), r_arc, xc, yc, r, border_color)
+    arc_left_x, arc_left_y = rotate(xc - r, yc)
+    draw_arc(surface, int(arc_left_x), int(arc_left_y), r_arc, xc, yc, r, border_color)
+
+
+def _render_sprite(r, step):
+    """
+    Rasterize the indexed ball sprite of a radius and rotation step.
+
+    Args:
+        r (int): Ball radius.
+        step (int | None): Rotation step, None to draw without details.
+
+    Returns:
+        IndexedSprite: Sprite centered on its origin, with the fill color in
+            palette entry 1 and the border color in entry 2. It has a pixel
+            of margin around the ball: 2 * r + 3 pixels square.
+    """
+    c = r + 1
+    angle = 0.0 if step is None else step * math.pi / BasketBall.ANGLE_STEPS
+
+    def draw(surface, indices):
+        _draw_ball(surface, c, c, r, angle, indices[0], indices[1], details=step is not None)
+
+    return IndexedSprite.render(2 * c + 1, 2 * c + 1, (c, c), draw, colors=2)
+
+
+# Sprites shared by every ball whatever its colors, keyed by (radius, rotation step)
+_SPRITES = SpriteCache(_render_sprite, capacity=512)
@@ -0,0 +1,348 @@
+"""Struct-of-arrays storage and vectorized physics for many basketballs.
+
+Every ball property lives in a NumPy array indexed by slot, and one step of
+the whole system is a handful of array operations, so thousands of balls in
+flight cost about as much Python as one. BasketBall objects are views into
+one slot of a system.
+"""
+import numpy as np
+
+from game.collision import reflect_many
+from game.spatial_hash import SpatialHash
+
+
+class BallSystem:
+    """Class storing ball states in arrays and stepping them together."""
+
+    # --- Physics constants (arcade-tuned), shared with BasketBall ---
+    RESTITUTION = 0.65      # Bounce energy retention
+    FRICTION = 0.98         # Horizontal speed kept per reference tick on the ground
+    ROLL_THRESHOLD = 0.5    # Min vertical speed to stop bouncing
+    ROLL_SPIN = 0.02        # Angular velocity per unit of rolling speed
+    BALL_RESTITUTION = 0.8  # Bounce energy retention between two balls
+
+    def __init__(self, capacity=16, cell_size=None, ball_collisions=False):
+        """
+        Allocate empty slots.
+
+        Args:
+            capacity (int): Initial number of slots. Grows when full.
+            cell_size (float | None): Cell side of the spatial hash used as
+                broadphase. None steps without one, unless ball collisions
+                are enabled (64 pixels then).
+            ball_collisions (bool): Collide the balls in flight with each other.
+        """
+        if cell_size is None and ball_collisions:
+            cell_size = 64
+        self.grid = SpatialHash(cell_size) if cell_size is not None else None
+        self.ball_collisions = ball_collisions
+        self.capacity = 0
+        self.position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.initial = np.zeros((0, 2))
+        self.radius = np.zeros(0, dtype=np.int64)
+        self.angle = np.zeros(0)
+        self.angular_velocity = np.zeros(0)
+        self.is_shot = np.zeros(0, dtype=bool)
+        self.is_dragging = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self._grow(capacity)
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def _grow(self, capacity):
+        """Resize every array to a new capacity, keeping the slots."""
+        for name in ("position", "velocity", "initial", "radius", "angle",
+                     "angular_velocity", "is_shot", "is_dragging", "active"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def add(self, xc, yc, r=15):
+        """
+        Place a resting ball in a free slot.
+
+        Args:
+            xc (float): Initial x-coordinate of the ball's center.
+            yc (float): Initial y-coordinate of the ball's center.
+            r (int): Ball radius.
+
+        Returns:
+            int: The slot of the ball.
+        """
+        free = np.flatnonzero(~self.active)
+        if len(free) == 0:
+            slot = self.capacity
+            self._grow(max(1, 2 * self.capacity))
+        else:
+            slot = int(free[0])
+
+        self.active[slot] = True
+        self.radius[slot] = r
+        self.initial[slot] = (xc, yc)
+        self.reset(slot)
+        return slot
+
+    def add_many(self, xc, yc, r=15):
+        """
+        Place many resting balls at once, in free slots.
+
+        Args:
+            xc, yc (numpy.ndarray): Initial centers of the balls.
+            r (int): Ball radius, or array of radii.
+
+        Returns:
+            numpy.ndarray: The slots of the balls.
+        """
+        count = len(xc)
+        free = np.flatnonzero(~self.active)
+        if len(free) < count:
+            start = self.capacity
+            self._grow(max(2 * self.capacity, self.capacity + count - len(free)))
+            free = np.concatenate((free, np.arange(start, self.capacity)))
+        slots = free[:count]
+
+        self.active[slots] = True
+        self.radius[slots] = r
+        self.initial[slots, 0] = xc
+        self.initial[slots, 1] = yc
+        self.reset(slots)
+        return slots
+
+    def remove(self, slot):
+        """Free a slot."""
+        self.active[slot] = False
+        self.is_shot[slot] = False
+
+    def reset(self, slots):
+        """
+        Put balls back at rest on their initial position.
+
+        Args:
+            slots: Slot index, array of indices or boolean mask.
+        """
+        self.position[slots] = self.initial[slots]
+        self.velocity[slots] = 0.0
+        self.angle[slots] = 0.0
+        self.angular_velocity[slots] = 0.0
+        self.is_shot[slots] = False
+        self.is_dragging[slots] = False
+
+    def shoot(self, slots, velocity, angular_velocity=0.0):
+        """
+        Launch balls.
+
+        Args:
+            slots: Slot index, array of indices or boolean mask.
+            velocity: (vx, vy) or array of velocities.
+            angular_velocity: Angular velocity, or array of them.
+        """
+        self.velocity[slots] = velocity
+        self.angular_velocity[slots] = angular_velocity
+        self.is_shot[slots] = True
+
+    def step(self, gravity=0.5, dt=1.0, ground_y=None, hoop=None,
+             max_step_distance=30, max_bounces=4):
+        """
+        Advance every ball in flight by one tick.
+
+        Gravity is applied once; the motion is split in substeps for the
+        balls moving further than max_step_distance, and every substep
+        stops at the hoop impacts to bounce, like the interactive game.
+        Rolling friction decays with the time spent on the ground and the
+        ground bounce is resolved once at the end of the tick, so neither
+        depends on the tick rate or on the number of substeps.
+
+        Args:
+            gravity (float): Gravity acceleration, per reference tick.
+            dt (float): Tick duration, in reference ticks.
+            ground_y (float | None): Y coordinate of the ground.
+            hoop (BasketHoop | None): Hoop to collide with and score in.
+            max_step_distance (float): Maximum distance moved per substep.
+            max_bounces (int): Hoop impacts resolved per substep.
+
+        Returns:
+            numpy.ndarray: Slots of the balls that passed through the hoop.
+                They stop at the scoring point.
+        """
+        flying = np.flatnonzero(self.active & self.is_shot)
+        if len(flying) == 0:
+            return flying
+
+        self.velocity[flying, 1] += gravity * dt
+        speed = np.hypot(self.velocity[flying, 0], self.velocity[flying, 1])
+        counts = np.maximum(1, np.ceil(speed * dt / max_step_distance))
+
+        # Broadphase: only the balls that can reach the hoop this tick are swept
+        near_hoop = np.ones(self.capacity, dtype=bool)
+        if hoop is not None and self.grid is not None:
+            self.grid.update(self.position, self.active)
+            reach = speed.max() * dt + self.radius[flying].max()
+            xmin, ymin, xmax, ymax = hoop.bounds()
+            near_hoop[:] = False
+            near_hoop[self.grid.query_rect(xmin - reach, ymin - reach, xmax + reach, ymax + reach)] = True
+
+        scored = np.zeros(self.capacity, dtype=bool)
+        grounded = np.zeros(self.capacity, dtype=bool)
+        for k in range(int(counts.max())):
+            moving = (counts > k) & ~scored[flying]
+            slots = flying[moving]
+            dt_sub = dt / counts[moving]
+            near = near_hoop[slots]
+            self._move(slots[near], dt_sub[near], ground_y, hoop, max_bounces, scored, grounded)
+            self._advance(slots[~near], dt_sub[~near], ground_y, grounded)
+        self._bounce_ground(np.flatnonzero(grounded & ~scored), gravity * dt)
+
+        if self.ball_collisions:
+            self.grid.update(self.position, self.active)
+            self._collide_balls()
+        return np.flatnonzero(scored)
+
+    def _collide_balls(self):
+        """
+        Separate and bounce the overlapping balls in flight, testing only the
+        candidate pairs of the spatial hash.
+        """
+        i, j = self.grid.pairs()
+        both = self.is_shot[i] & self.is_shot[j]
+        i, j = i[both], j[both]
+        if len(i) == 0:
+            return
+
+        # Narrowphase
+        delta = self.position[j] - self.position[i]
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        overlap = self.radius[i] + self.radius[j] - dist
+        touching = (overlap > 0) & (dist > 0)
+        i, j = i[touching], j[touching]
+        if len(i) == 0:
+            return
+        normal = delta[touching] / dist[touching, None]
+
+        # Push both balls apart by half the overlap each
+        correction = normal * (overlap[touching, None] / 2)
+        np.subtract.at(self.position, i, correction)
+        np.add.at(self.position, j, correction)
+
+        # Exchange the normal velocity of approaching balls (equal masses)
+        closing = np.einsum("ij,ij->i", self.velocity[j] - self.velocity[i], normal)
+        impulse = normal * (np.minimum(closing, 0.0) * (1 + self.BALL_RESTITUTION) / 2)[:, None]
+        np.add.at(self.velocity, i, impulse)
+        np.subtract.at(self.velocity, j, impulse)
+
+    def _move(self, slots, dt, ground_y, hoop, max_bounces, scored, grounded):
+        """Move balls for dt (array), stopping at every hoop impact to bounce."""
+        if hoop is None:
+            self._advance(slots, dt, ground_y, grounded)
+            return
+
+        for _ in range(max_bounces):
+            if len(slots) == 0:
+                return
+            px, py = self.position[slots, 0], self.position[slots, 1]
+            dx, dy = self.velocity[slots, 0] * dt, self.velocity[slots, 1] * dt
+            t, nx, ny, restitution = hoop.sweep_many(px, py, dx, dy, self.radius[slots])
+            score = hoop.sweep_score_many(px, py, dx, dy)
+
+            scoring = np.isfinite(score) & (score <= t)
+            self._advance(slots[scoring], dt[scoring] * score[scoring], None, grounded)
+            scored[slots[scoring]] = True
+
+            free = ~scoring & np.isinf(t)
+            self._advance(slots[free], dt[free], ground_y, grounded)
+
+            hit = ~scoring & ~free
+            slots, dt, t = slots[hit], dt[hit], t[hit]
+            self._advance(slots, dt * t, ground_y, grounded)
+            vx, vy = reflect_many(
+                self.velocity[slots, 0], self.velocity[slots, 1],
+                nx[hit], ny[hit], restitution[hit]
+            )
+            self.velocity[slots, 0] = vx
+            self.velocity[slots, 1] = vy
+            dt = dt * (1 - t)
+
+    def _advance(self, slots, dt, ground_y, grounded):
+        """
+        Move balls along their velocity for dt (array) and keep them above
+        the ground, slowing the ones touching it by the rolling friction.
+        The balls reaching the ground are flagged in grounded.
+        """
+        if len(slots) == 0:
+            return
+        self.position[slots] += self.velocity[slots] * dt[:, None]
+        self.angle[slots] += self.angular_velocity[slots] * dt
+
+        if ground_y is None:
+            return
+
+        # Ground contact
+        touching = self.position[slots, 1] + self.radius[slots] >= ground_y
+        ground = slots[touching]
+        if len(ground) == 0:
+            return
+        # Position correction
+        self.position[ground, 1] = ground_y - self.radius[ground]
+
+        # Rolling friction, for the time spent on the ground
+        self.velocity[ground, 0] *= self.FRICTION ** dt[touching]
+        grounded[ground] = True
+
+    def _bounce_ground(self, slots, gravity_step):
+        """
+        Bounce the balls that touched the ground during the tick, once.
+
+        Args:
+            slots (numpy.ndarray): Slots of the balls.
+            gravity_step (float): Speed gravity added during the tick. A ball
+                bouncing slower than that rolls, or it would hop at low rates.
+        """
+        if len(slots) == 0:
+            return
+
+        # Bounce only if falling
+        vy = self.velocity[slots, 1]
+        vy = np.where(vy > 0, -vy * self.RESTITUTION, vy)
+
+        # Stop bouncing -> rolling
+        rolling = np.abs(vy) < max(self.ROLL_THRESHOLD, gravity_step)
+        vy[rolling] = 0
+        self.velocity[slots, 1] = vy
+        self.angular_velocity[slots[rolling]] = self.velocity[slots[rolling], 0] * self.ROLL_SPIN
+
+    def resting(self, ground_y, hoop=None, rest_speed=1.0):
+        """
+        Find the balls in flight that lie on the ground, or that stay nearly
+        still against the hoop. A slow ball in mid-air, like at the apex of
+        a lob, is not resting.
+
+        Args:
+            ground_y (float): Y coordinate of the ground.
+            hoop (BasketHoop | None): Hoop the balls can rest on.
+            rest_speed (float): Speed below which a ball on the hoop rests.
+
+        Returns:
+            numpy.ndarray: Boolean mask over the slots.
+        """
+        on_ground = self.position[:, 1] >= ground_y - self.radius
+        if hoop is not None:
+            slow = np.hypot(self.velocity[:, 0], self.velocity[:, 1]) < rest_speed
+            slow[slow] = hoop.touching_many(
+                self.position[slow, 0], self.position[slow, 1], self.radius[slow]
+            )
+            on_ground |= slow
+        return self.active & self.is_shot & on_ground
+
+    def out_of_bounds(self, width, height, margin=50):
+        """
+        Find the balls far outside the game area.
+
+        Returns:
+            numpy.ndarray: Their slots.
+        """
+        x, y = self.position[:, 0], self.position[:, 1]
+        outside = (x < -margin) | (x > width + margin) | (y < -margin) | (y > height + margin)
+        return np.flatnonzero(self.active & outside)
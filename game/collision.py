@@ -0,0 +1,194 @@
+"""Continuous (swept) collision tests for moving circles.
+
+Every test takes arrays of circle centers p at the start of a step and
+their displacements d over the step, and returns, for each circle, the
+first time of impact t in [0, 1] (the contact center being p + t * d) with
+the contact normal, t being inf for the circles that do not hit. A circle
+already touching a shape only collides while it moves into it, so a ball
+resting against a surface after a bounce is free to leave.
+"""
+import math
+
+import numpy as np
+
+
+def _first_hit(t, nx, ny):
+    """Pick, for every circle, the candidate with the smallest (t, nx, ny)."""
+    t, nx, ny = np.stack(t, axis=1), np.stack(nx, axis=1), np.stack(ny, axis=1)
+    first = np.lexsort((ny, nx, t), axis=1)[:, :1]
+    return (
+        np.take_along_axis(t, first, axis=1)[:, 0],
+        np.take_along_axis(nx, first, axis=1)[:, 0],
+        np.take_along_axis(ny, first, axis=1)[:, 0]
+    )
+
+
+def sweep_points(px, py, dx, dy, r, qx, qy):
+    """
+    Sweep circles against a point (or against a circle, with r the sum of
+    both radii).
+
+    Args:
+        px, py (numpy.ndarray): Circle centers at the start of the step.
+        dx, dy (numpy.ndarray): Displacements over the step.
+        r (numpy.ndarray | float): Circle radii.
+        qx, qy (float): The point.
+
+    Returns:
+        tuple: (t, nx, ny) arrays, the normals pointing to the circles.
+    """
+    t = np.full(px.shape, np.inf)
+    nx = np.zeros(px.shape)
+    ny = np.zeros(px.shape)
+
+    fx, fy = px - qx, py - qy
+    c = fx * fx + fy * fy - r * r
+    length = np.hypot(fx, fy)
+    touching = c <= 0
+    moving_in = touching & (length > 0) & (fx * dx + fy * dy < 0)
+    t[moving_in] = 0.0
+    nx[moving_in] = fx[moving_in] / length[moving_in]
+    ny[moving_in] = fy[moving_in] / length[moving_in]
+
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    disc = b * b - 4 * a * c
+    ok = ~touching & (a > 0) & (b < 0) & (disc >= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        impact = (-b - np.sqrt(np.where(ok, disc, 0.0))) / (2 * a)
+    ok &= impact <= 1
+
+    cx = fx[ok] + impact[ok] * dx[ok]
+    cy = fy[ok] + impact[ok] * dy[ok]
+    length = np.hypot(cx, cy)
+    t[ok] = impact[ok]
+    nx[ok] = cx / length
+    ny[ok] = cy / length
+    return t, nx, ny
+
+
+def sweep_segments(px, py, dx, dy, r, ax, ay, bx, by, endpoints=True):
+    """
+    Sweep circles against a segment.
+
+    Args:
+        px, py (numpy.ndarray): Circle centers at the start of the step.
+        dx, dy (numpy.ndarray): Displacements over the step.
+        r (numpy.ndarray | float): Circle radii.
+        ax, ay, bx, by (float): Segment endpoints.
+        endpoints (bool): Also test the endpoints; False only tests the
+            face of the segment.
+
+    Returns:
+        tuple: (t, nx, ny) arrays, the normals pointing to the circles.
+    """
+    hits = []
+    if endpoints:
+        hits = [sweep_points(px, py, dx, dy, r, ax, ay), sweep_points(px, py, dx, dy, r, bx, by)]
+
+    ex, ey = bx - ax, by - ay
+    length_sq = ex * ex + ey * ey
+    if length_sq > 0:
+        length = math.sqrt(length_sq)
+        nx = np.full(px.shape, -ey / length)
+        ny = np.full(px.shape, ex / length)
+        dist = (px - ax) * nx + (py - ay) * ny
+        flip = dist < 0
+        nx[flip], ny[flip], dist[flip] = -nx[flip], -ny[flip], -dist[flip]
+
+        speed = dx * nx + dy * ny
+        ok = speed < 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            impact = np.maximum(0.0, (dist - r) / -speed)
+            s = ((px + impact * dx - ax) * ex + (py + impact * dy - ay) * ey) / length_sq
+        ok &= impact <= 1
+        ok &= (s >= 0) & (s <= 1)
+        hits.append((np.where(ok, impact, np.inf), np.where(ok, nx, 0.0), np.where(ok, ny, 0.0)))
+
+    if not hits:
+        return np.full(px.shape, np.inf), np.zeros(px.shape), np.zeros(px.shape)
+    return _first_hit(*zip(*hits))
+
+
+def sweep_aabbs(px, py, dx, dy, r, rect):
+    """
+    Sweep circles against an axis-aligned box. Circles whose center starts
+    inside are pushed out through the nearest face.
+
+    Args:
+        px, py (numpy.ndarray): Circle centers at the start of the step.
+        dx, dy (numpy.ndarray): Displacements over the step.
+        r (numpy.ndarray | float): Circle radii.
+        rect (tuple): (xmin, ymin, xmax, ymax) box.
+
+    Returns:
+        tuple: (t, nx, ny) arrays, the normals pointing out of the box.
+    """
+    xmin, ymin, xmax, ymax = rect
+    corners = ((xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax))
+    candidates = [sweep_points(px, py, dx, dy, r, x, y) for x, y in corners]
+    candidates += [
+        sweep_segments(px, py, dx, dy, r, ax, ay, bx, by, endpoints=False)
+        for (ax, ay), (bx, by) in zip(corners, corners[1:] + corners[:1])
+    ]
+    t, nx, ny = _first_hit(*zip(*candidates))
+
+    inside = (px > xmin) & (px < xmax) & (py > ymin) & (py < ymax)
+    if inside.any():
+        n = px.shape
+        _, fnx, fny = _first_hit(
+            [px - xmin, xmax - px, py - ymin, ymax - py],
+            [np.full(n, -1.0), np.full(n, 1.0), np.zeros(n), np.zeros(n)],
+            [np.zeros(n), np.zeros(n), np.full(n, -1.0), np.full(n, 1.0)]
+        )
+        moving_in = inside & (dx * fnx + dy * fny < 0)
+        t = np.where(inside, np.where(moving_in, 0.0, np.inf), t)
+        nx = np.where(inside, np.where(moving_in, fnx, 0.0), nx)
+        ny = np.where(inside, np.where(moving_in, fny, 0.0), ny)
+    return t, nx, ny
+
+
+def sweep_ellipses(px, py, dx, dy, xc, yc, a, b):
+    """
+    Sweep points into an ellipse.
+
+    Args:
+        px, py (numpy.ndarray): Points at the start of the step.
+        dx, dy (numpy.ndarray): Displacements over the step.
+        xc, yc (float): Ellipse center.
+        a, b (float): Ellipse semi-axes.
+
+    Returns:
+        numpy.ndarray: Times the points enter the ellipse, inf for the
+            points not entering it during the step or starting inside.
+    """
+    # In ellipse units the ellipse is the unit circle
+    ux, uy = (px - xc) / a, (py - yc) / b
+    vx, vy = dx / a, dy / b
+    c = ux * ux + uy * uy - 1
+
+    qa = vx * vx + vy * vy
+    qb = 2 * (ux * vx + uy * vy)
+    disc = qb * qb - 4 * qa * c
+    ok = (c > 0) & (qa > 0) & (qb < 0) & (disc >= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (-qb - np.sqrt(np.where(ok, disc, 0.0))) / (2 * qa)
+    ok &= t <= 1
+    return np.where(ok, t, np.inf)
+
+
+def reflect_many(vx, vy, nx, ny, restitution):
+    """
+    Bounce velocities off surfaces.
+
+    Args:
+        vx, vy (numpy.ndarray): Velocities.
+        nx, ny (numpy.ndarray): Unit surface normals.
+        restitution (numpy.ndarray | float): Fraction of the normal speed kept.
+
+    Returns:
+        tuple: (vx, vy) arrays after the bounce, unchanged where moving away.
+    """
+    vn = vx * nx + vy * ny
+    k = np.where(vn < 0, (1 + restitution) * vn, 0.0)
+    return vx - k * nx, vy - k * ny
@@ -1,6 +1,13 @@
 import pygame
-from graphic.shapes import draw_polygon
-from graphic.scan_line import scanline_texture
+
+from graphic.backends import PixelBackend
+from graphic.drawlist import DirectDraw
+from graphic.shapes import draw_polygon_clipping
+from graphic.scan_line import scanline_polygon_clipping
+
+# Colorkey of the tiles, for the pixels above the ground
+TILE_COLORKEY = (255, 0, 255)
+
 
 class Ground:
     """
@@ -8,7 +15,10 @@ class Ground:
     Bresenham line drawing and scanline filling.
     """
 
-    def __init__(self, ground_y, width, height):
+    TEXTURE_PERIOD = (112.5, 5.0)  # World pixels covered by one repeat of the texture (x, y)
+    TILE_WIDTH = 128  # Width of the cached ground tiles
+
+    def __init__(self, ground_y, width, height, texture=None, backend=None):
         """
         Initialize the ground polygon.
 
@@ -16,8 +26,16 @@ class Ground:
             ground_y (int): Y coordinate where the ground starts.
             width (int): Screen width.
             height (int): Screen height.
+            texture (pygame.Surface | callable | None): Grass texture, or a
+                function returning it, waiting for it if it is still loading
+                (such as AssetHandle.wait). None loads it right away.
+            backend (PixelBackend | DrawListBackend | None): Rasterization
+                backend of the tiles. Defaults to the pixel algorithms.
         """
-        self.texture = pygame.image.load("game/textures/grass.jpg").convert()
+        if texture is None:
+            texture = pygame.image.load("game/textures/grass.jpg")
+        self._texture = texture
+        self.backend = backend if backend is not None else PixelBackend()
         self.points = [
             (0, ground_y),
             (width, ground_y),
@@ -29,23 +47,97 @@ class Ground:
             "fill": (80, 160, 80)     # Light Green
         }
 
+    def layer_key(self):
+        """Return the state the cached ground layer depends on."""
+        return tuple(self.points), tuple(self.colors.items()), self.texture
+
     def draw(self, surface):
         """
         Draw the ground polygon outline and fill it using scanline.
         """
+        painter = DirectDraw(surface)
+
         # Draw polygon outline
-        draw_polygon(surface, self.points, self.colors["border"])
-
-        # Setting up texture UVs and repeating
-        tex_w, tex_h = self.texture.get_size()
-        repeat_x = 8
-        repeat_y = 4
-
-        uvs = [
-            (0, 0),
-            (repeat_x, 0),
-            (repeat_x, repeat_y),
-            (0, repeat_y)
-        ]
+        painter.polygon(self.points, self.colors["border"])
+
         # Fill polygon with texture using scanline texture fill
-        scanline_texture(surface, self.points, uvs, self.texture, tex_w, tex_h)
+        painter.texture_polygon(self.points, self.uvs(self.points), self.texture)
+
+    @property
+    def texture(self):
+        """Grass texture, waiting for it if it is still loading."""
+        return self._texture() if callable(self._texture) else self._texture
+
+    def uvs(self, points):
+        """
+        Texture coordinates of world points: the texture repeats every
+        TEXTURE_PERIOD pixels from the top-left corner of the ground, so
+        pieces of the ground line up.
+        """
+        x0, y0 = self.points[0]
+        period_x, period_y = self.TEXTURE_PERIOD
+        return [((x - x0) / period_x, (y - y0) / period_y) for x, y in points]
+
+    def render_tile(self, xmin, xmax, lookup=None):
+        """
+        Rasterize the columns [xmin, xmax) of the ground on a tile, with the
+        same outline and texture as draw().
+
+        Args:
+            xmin, xmax (int): World columns of the tile.
+            lookup (callable | None): lookup(rasterize) returning the tile
+                surface, mapped from a cache or else made by rasterize().
+                None rasterizes it.
+
+        Returns:
+            tuple | None: (surface, y) colorkeyed tile and the world y of its
+                top row, None if the ground does not reach the tile.
+        """
+        left, top = self.points[0]
+        right, bottom = self.points[2]
+        if xmax <= left or xmin > right:
+            return None
+        if lookup is None:
+            return self._rasterize_tile(xmin, xmax), top
+
+        surface = lookup(lambda: self._rasterize_tile(xmin, xmax))
+        # Caches keep the pixels only
+        surface.set_colorkey(TILE_COLORKEY)
+        return surface, top
+
+    def _rasterize_tile(self, xmin, xmax):
+        """Rasterize the columns [xmin, xmax) of the ground."""
+        left, top = self.points[0]
+        right, bottom = self.points[2]
+        surface = pygame.Surface((xmax - xmin, bottom - top + 1))
+        surface.fill(TILE_COLORKEY)
+        surface.set_colorkey(TILE_COLORKEY)
+        self.backend.paint(surface, lambda painter: self._paint_tile(painter, xmin, xmax))
+        return surface
+
+    def _paint_tile(self, painter, xmin, xmax):
+        """Issue the drawing calls of the columns [xmin, xmax), in tile coordinates."""
+        top = self.points[0][1]
+        bottom = self.points[2][1]
+
+        # Whole ground polygon in tile coordinates: the spans and texture
+        # coordinates are those of draw(), and only the tile's pixels land
+        local = [(x - xmin, y - top) for x, y in self.points]
+        painter.polygon_clipping(local, (0, 0, xmax - xmin - 1, bottom - top), self.colors["border"])
+        painter.texture_polygon(local, self.uvs(self.points), self.texture)
+
+    def draw_viewport(self, surface, viewport):
+        """
+        Draw the ground through a viewport transform, clipped with
+        Cohen-Sutherland to the viewport window. Uses the flat fill color,
+        the texture is not visible at viewport scale.
+
+        Args:
+            surface: The viewport surface.
+            viewport (Viewport): Viewport providing the transform and clip window.
+        """
+        points = [viewport.to_viewport(x, y) for x, y in self.points]
+        xmin, ymin, xmax, ymax = viewport.clip
+
+        draw_polygon_clipping(surface, points, viewport.clip, self.colors["fill"])
+        scanline_polygon_clipping(surface, points, self.colors["fill"], xmin, ymin, xmax, ymax)
@@ -1,15 +1,30 @@
 """Module for drawing a basketball hoop using Pygame."""
-from graphic.scan_line import hoop_scanline, scanline_polygon
-from graphic.shapes import draw_ellipse, draw_hoop_net_basic, draw_line_bresenham, draw_polygon, draw_polygon_clipping
+import numpy as np
+
+from game.collision import sweep_aabbs, sweep_ellipses, sweep_points
+from graphic.clipping import cohen_sutherland
+from graphic.drawlist import DirectDraw
+from graphic.scan_line import hoop_scanline, scanline_polygon_clipping
+from graphic.shapes import draw_ellipse_clipping, draw_line_bresenham, draw_polygon_clipping
 
 
 class BasketHoop:
     """Class representing a basketball hoop."""
+
+    # Fraction of the normal speed kept when bouncing off each part
+    BACKBOARD_RESTITUTION = 0.7
+    POLE_RESTITUTION = 0.6
+    RIM_RESTITUTION = 0.5
+
     def __init__(self, xc, yc, ground_y=600):
         self.a_outer = 30 # Outer ellipse semi-major axis
         self.b_outer = 8 # Outer ellipse semi-minor axis
         self.a_inner = 26  # Inner ellipse semi-major axis
         self.b_inner = 6 # Inner ellipse semi-minor axis
+        # Semi-axes of the scoring window, the ellipse the ball center must
+        # enter while falling; tunable without moving the rim
+        self.score_a = self.a_inner
+        self.score_b = self.b_inner
         self.xc = xc
         self.yc = yc
         self.ground_y = ground_y  # Y coordinate of the ground
@@ -31,44 +46,73 @@ class BasketHoop:
             "backboard_border": (255, 0, 0)  # Red border
         }
 
-    def draw(self, surface):
-        """Draw the basketball hoop on the given surface."""
-        
-        # Draw the backboard (behind everything)
+    def layer_key(self):
+        """Return the state the cached hoop layer depends on."""
+        return (
+            self.xc, self.yc, self.ground_y,
+            self.a_outer, self.b_outer, self.a_inner, self.b_inner,
+            self.pole_width, self.net_height,
+            self.backboard_width, self.backboard_height, self.backboard_thickness,
+            tuple(self.colors.items())
+        )
+
+    def backboard_points(self):
+        """Return the four corners of the backboard."""
         backboard_x = self.xc + self.a_outer - 5
         backboard_y = self.yc - self.backboard_height // 2 - 10  # Moved up by 10 pixels
-        
-        backboard_points = [
+        return [
             (backboard_x, backboard_y),
             (backboard_x + self.backboard_thickness, backboard_y),
             (backboard_x + self.backboard_thickness, backboard_y + self.backboard_height),
             (backboard_x, backboard_y + self.backboard_height)
         ]
+
+    def pole_points(self):
+        """Return the four corners of the pole, from the top of the hoop to the ground."""
+        pole_top_y = self.yc - self.b_outer
+        return [
+            (self.xc + self.a_outer, pole_top_y),  # Top right
+            (self.xc + self.a_outer + self.pole_width, pole_top_y),  # Top right outer
+            (self.xc + self.a_outer + self.pole_width, self.ground_y),  # Bottom right
+            (self.xc + self.a_outer, self.ground_y)  # Bottom left
+        ]
+
+    def zoom_window(self):
+        """Return the world window around the hoop used by the zoom viewport."""
+        return (self.xc - 50, self.yc - 40, self.xc + 50, self.yc + 40)
+
+    def draw(self, surface):
+        """Draw the basketball hoop on the given surface."""
+        self.paint(DirectDraw(surface))
+
+    def paint(self, painter):
+        """
+        Issue the drawing calls of the hoop.
+
+        Args:
+            painter (DirectDraw | DrawList): Draws right away, or records
+                the calls for a rasterization backend.
+        """
+        # Draw the backboard (behind everything)
+        backboard_points = self.backboard_points()
         
         # Draw backboard border
-        draw_polygon(surface, backboard_points, self.colors["backboard_border"])
+        painter.polygon(backboard_points, self.colors["backboard_border"])
         
         # Fill the backboard
-        scanline_polygon(surface, backboard_points, self.colors["backboard"])
+        painter.fill_polygon(backboard_points, self.colors["backboard"])
         
         # Draw the pole (behind the hoop)
         # Pole goes from the top of the hoop to the ground
-        pole_top_y = self.yc - self.b_outer
-        pole_points = [
-            (self.xc + self.a_outer, pole_top_y),  # Top right
-            (self.xc + self.a_outer + self.pole_width, pole_top_y),  # Top right outer
-            (self.xc + self.a_outer + self.pole_width, self.ground_y),  # Bottom right
-            (self.xc + self.a_outer, self.ground_y)  # Bottom left
-        ]
+        pole_points = self.pole_points()
         
         # Draw pole outline
-        draw_polygon(surface, pole_points, self.colors["border"])
+        painter.polygon(pole_points, self.colors["border"])
         
         # Fill the pole
-        scanline_polygon(surface, pole_points, self.colors["pole"])
+        painter.fill_polygon(pole_points, self.colors["pole"])
 
-        draw_hoop_net_basic(
-            surface,
+        painter.hoop_net(
             self.xc,
             self.yc + self.b_inner,
             self.a_inner,
@@ -77,8 +121,7 @@ class BasketHoop:
         )
 
         # Draw outer and inner ellipses
-        draw_ellipse(
-            surface,
+        painter.ellipse(
             self.xc,
             self.yc,
             self.a_outer,
@@ -86,8 +129,7 @@ class BasketHoop:
             self.colors["border"]
         )
 
-        draw_ellipse(
-            surface,
+        painter.ellipse(
             self.xc,
             self.yc,
             self.a_inner,
@@ -96,84 +138,198 @@ class BasketHoop:
         )
 
         # Scan-line fill the hoop shape
-        hoop_scanline(
-            surface, self.xc, self.yc,
+        painter.fill_hoop(
+            self.xc, self.yc,
             self.a_outer, self.b_outer,
             self.a_inner, self.b_inner,
             self.colors["fill"], self.colors["border"]
         )
 
-        
 
-    def check_score(self, ball):
-        """Check if the ball passed through the hoop to score."""
-        # Check if ball is in the horizontal range of the hoop
-        if abs(ball.xc - self.xc) <= self.a_inner:
-            # Check if ball is at the hoop level and moving downward
-            if (self.yc - 5 <= ball.yc <= self.yc + 15 and 
-                ball.velocity[1] > 0):
-                return True
-        return False
-
-    def check_backboard_collision(self, ball):
+    def draw_viewport(self, surface, viewport):
         """
-        Check and handle collision between ball and backboard.
-        
+        Draw the hoop through a viewport transform, clipped with
+        Cohen-Sutherland to the viewport window.
+
+        Args:
+            surface: The viewport surface.
+            viewport (Viewport): Viewport providing the transform and clip window.
+        """
+        xmin, ymin, xmax, ymax = viewport.clip
+        sx, sy = viewport.scale
+
+        # Pole (visible part)
+        pole_points = [viewport.to_viewport(x, y) for x, y in self.pole_points()]
+        draw_polygon_clipping(surface, pole_points, viewport.clip, self.colors["border"])
+        scanline_polygon_clipping(surface, pole_points, self.colors["pole"], xmin, ymin, xmax, ymax)
+
+        # Backboard
+        backboard_points = [viewport.to_viewport(x, y) for x, y in self.backboard_points()]
+        draw_polygon_clipping(surface, backboard_points, viewport.clip, self.colors["backboard_border"])
+        scanline_polygon_clipping(surface, backboard_points, self.colors["backboard"], xmin, ymin, xmax, ymax)
+
+        # Net, only when zoomed in enough for the mesh to be visible
+        if min(sx, sy) >= 0.5:
+            net_yc = self.yc + self.b_inner
+            spacing = 6
+            max_offset = 4
+
+            for x in range(self.xc - self.a_inner, self.xc + self.a_inner + 1, spacing):
+                for i in range(0, self.net_height, spacing):
+                    t = i / self.net_height
+                    offset = int(max_offset * (1 - t))
+
+                    # Right (\) and left (/) slanting lines
+                    for x0 in (x + offset, x - offset):
+                        zx0, zy0 = viewport.to_viewport(x0, net_yc + i)
+                        zx1, zy1 = viewport.to_viewport(x, net_yc + i + spacing)
+                        visible, cx0, cy0, cx1, cy1 = cohen_sutherland(zx0, zy0, zx1, zy1, xmin, ymin, xmax, ymax)
+                        if visible:
+                            draw_line_bresenham(surface, int(cx0), int(cy0), int(cx1), int(cy1), self.colors["net"])
+
+        # Rim (ellipses)
+        hoop_x, hoop_y = viewport.to_viewport(self.xc, self.yc)
+        a_outer = max(1, int(self.a_outer * sx))
+        b_outer = max(1, int(self.b_outer * sy))
+        a_inner = max(1, int(self.a_inner * sx))
+        b_inner = max(1, int(self.b_inner * sy))
+
+        draw_ellipse_clipping(surface, hoop_x, hoop_y, a_outer, b_outer, xmin, ymin, xmax, ymax, self.colors["border"])
+        draw_ellipse_clipping(surface, hoop_x, hoop_y, a_inner, b_inner, xmin, ymin, xmax, ymax, self.colors["border"])
+        hoop_scanline(surface, hoop_x, hoop_y, a_outer, b_outer, a_inner, b_inner, self.colors["fill"], self.colors["border"])
+
+    def rim_points(self):
+        """Return the centers of the left and right ends of the rim."""
+        offset = (self.a_outer + self.a_inner) / 2
+        return [(self.xc - offset, self.yc), (self.xc + offset, self.yc)]
+
+    def colliders(self):
+        """
+        Return the solid parts of the hoop.
+
+        Returns:
+            list: (kind, shape, restitution) with kind "aabb" and shape
+                (xmin, ymin, xmax, ymax), or kind "point" and shape (x, y, radius).
+        """
+        backboard = self.backboard_points()
+        pole = self.pole_points()
+        rim_radius = (self.a_outer - self.a_inner) / 2
+        return [
+            ("aabb", (backboard[0][0], backboard[0][1], backboard[2][0], backboard[2][1]),
+             self.BACKBOARD_RESTITUTION),
+            ("aabb", (pole[0][0], pole[0][1], pole[2][0], pole[2][1]), self.POLE_RESTITUTION),
+        ] + [("point", (x, y, rim_radius), self.RIM_RESTITUTION) for x, y in self.rim_points()]
+
+    def bounds(self):
+        """Return the (xmin, ymin, xmax, ymax) box around the parts of the hoop and its scoring zone."""
+        boxes = [(self.xc - self.score_a, self.yc - self.score_b, self.xc + self.score_a, self.yc + self.score_b)]
+        for kind, shape, _ in self.colliders():
+            if kind == "aabb":
+                boxes.append(shape)
+            else:
+                x, y, radius = shape
+                boxes.append((x - radius, y - radius, x + radius, y + radius))
+        return (
+            min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes)
+        )
+
+    def touching_many(self, px, py, r, margin=1.0):
+        """
+        Find the balls in contact with a solid part of the hoop.
+
+        Args:
+            px, py (numpy.ndarray): Ball centers.
+            r (numpy.ndarray): Ball radii.
+            margin (float): Gap still counted as contact, in pixels.
+
+        Returns:
+            numpy.ndarray: Boolean mask of the touching balls.
+        """
+        touching = np.zeros(px.shape, dtype=bool)
+        for kind, shape, _ in self.colliders():
+            if kind == "aabb":
+                xmin, ymin, xmax, ymax = shape
+                gap_x = np.clip(px, xmin, xmax) - px
+                gap_y = np.clip(py, ymin, ymax) - py
+                touching |= np.hypot(gap_x, gap_y) <= r + margin
+            else:
+                x, y, radius = shape
+                touching |= np.hypot(px - x, py - y) <= r + radius + margin
+        return touching
+
+    def sweep_many(self, px, py, dx, dy, r):
+        """
+        Find the first part of the hoop hit by each moving ball. Only the
+        balls whose swept bounds reach a part are tested exactly.
+
         Args:
-            ball: The basketball object to check collision with.
-            
+            px, py (numpy.ndarray): Ball centers at the start of the step.
+            dx, dy (numpy.ndarray): Ball displacements over the step.
+            r (numpy.ndarray): Ball radii.
+
         Returns:
-            bool: True if collision occurred, False otherwise.
+            tuple: (t, nx, ny, restitution) arrays, t = inf for the balls
+                hitting nothing.
         """
-        backboard_x = self.xc + self.a_outer - 5
-        backboard_y = self.yc - self.backboard_height // 2 - 10  # Same offset as in draw method
-        backboard_right = backboard_x + self.backboard_thickness
-        backboard_bottom = backboard_y + self.backboard_height
-        
-        # Check if ball is colliding with the backboard (front face)
-        if (backboard_x - ball.r <= ball.xc <= backboard_right + ball.r and
-            backboard_y - ball.r <= ball.yc <= backboard_bottom + ball.r):
-            
-            # Ball is approaching from the left (front of backboard)
-            if ball.velocity[0] > 0 and ball.xc < backboard_x + ball.r:
-                ball.xc = backboard_x - ball.r
-                ball.velocity[0] = -ball.velocity[0] * 0.7  # Bounce back with some energy loss
-                return True
-                
-        return False
-
-    def check_pole_collision(self, ball):
+        best_t = np.full(px.shape, np.inf)
+        best_nx = np.zeros(px.shape)
+        best_ny = np.zeros(px.shape)
+        best_e = np.zeros(px.shape)
+
+        # Swept bounds of every ball
+        left = np.minimum(px, px + dx) - r
+        right = np.maximum(px, px + dx) + r
+        top = np.minimum(py, py + dy) - r
+        bottom = np.maximum(py, py + dy) + r
+
+        for kind, shape, restitution in self.colliders():
+            if kind == "aabb":
+                xmin, ymin, xmax, ymax = shape
+            else:
+                x, y, radius = shape
+                xmin, ymin, xmax, ymax = x - radius, y - radius, x + radius, y + radius
+            near = np.flatnonzero((right >= xmin) & (left <= xmax) & (bottom >= ymin) & (top <= ymax))
+            if len(near) == 0:
+                continue
+
+            args = (px[near], py[near], dx[near], dy[near], r[near])
+            if kind == "aabb":
+                t, nx, ny = sweep_aabbs(*args, shape)
+            else:
+                t, nx, ny = sweep_points(*args[:4], args[4] + radius, x, y)
+            first = t < best_t[near]
+            hit = near[first]
+            best_t[hit] = t[first]
+            best_nx[hit] = nx[first]
+            best_ny[hit] = ny[first]
+            best_e[hit] = restitution
+        return best_t, best_nx, best_ny, best_e
+
+    def sweep_score_many(self, px, py, dx, dy):
         """
-        Check and handle collision between ball and pole.
-        
+        Find when each moving ball passes down through the hoop, that is
+        when its center enters the scoring window (score_a, score_b) while
+        falling.
+
         Args:
-            ball: The basketball object to check collision with.
-            
+            px, py (numpy.ndarray): Ball centers at the start of the step.
+            dx, dy (numpy.ndarray): Ball displacements over the step.
+
         Returns:
-            bool: True if collision occurred, False otherwise.
+            numpy.ndarray: Times of the scores, inf for the balls not scoring.
         """
-        pole_top_y = self.yc - self.b_outer
-        pole_left = self.xc + self.a_outer
-        pole_right = pole_left + self.pole_width
-        
-        # Check if ball is colliding with the pole
-        if (pole_left - ball.r <= ball.xc <= pole_right + ball.r and
-            pole_top_y - ball.r <= ball.yc <= self.ground_y):
-            
-            # Determine which side of the pole the ball hit
-            ball_center_x = ball.xc
-            pole_center_x = (pole_left + pole_right) / 2
-            
-            # Ball is approaching from the left
-            if ball.velocity[0] > 0 and ball_center_x < pole_center_x:
-                ball.xc = pole_left - ball.r
-                ball.velocity[0] = -ball.velocity[0] * 0.6  # Bounce back
-                return True
-            
-            # Ball is approaching from the right
-            elif ball.velocity[0] < 0 and ball_center_x > pole_center_x:
-                ball.xc = pole_right + ball.r
-                ball.velocity[0] = -ball.velocity[0] * 0.6  # Bounce back
-                return True
-                
-        return False
+        t = np.full(px.shape, np.inf)
+        near = np.flatnonzero(
+            (dy > 0)
+            & (np.maximum(px, px + dx) >= self.xc - self.score_a)
+            & (np.minimum(px, px + dx) <= self.xc + self.score_a)
+            & (py + dy >= self.yc - self.score_b)
+            & (py <= self.yc + self.score_b)
+        )
+        if len(near):
+            t[near] = sweep_ellipses(
+                px[near], py[near], dx[near], dy[near],
+                self.xc, self.yc, self.score_a, self.score_b
+            )
+        return t
@@ -1,5 +1,5 @@
 """Module to manage and display the game score using Pygame."""
-import pygame
+from graphic.text import get_font, render_text
 
 class ScoreBoard:
     """Class to manage and display the game score."""
@@ -7,9 +7,12 @@ class ScoreBoard:
         self.x = x
         self.y = y
         self.color = color
-        self.font = pygame.font.SysFont(None, font_size)
+        self.font = get_font(None, font_size)
         self.score = 0
         self.lives = 5
+        self.rect = None  # Region covered by the last draw
+        self.image = None  # Text of the last draw
+        self._shown = None  # (score, lives) the image shows
 
     def set_score(self, value):
         """Set the score to a specific value."""
@@ -29,7 +32,18 @@ class ScoreBoard:
         return self.lives <= 0
 
     def draw(self, surface):
-        """Draw the score and lives on the given surface."""
-        text = f"Points: {self.score}  Lives: {self.lives}"
-        text_surface = self.font.render(text, True, self.color)
-        surface.blit(text_surface, (self.x, self.y))
+        """
+        Draw the score and lives on the given surface. The text is rendered
+        again only when the score or the lives changed.
+        """
+        shown = (self.score, self.lives)
+        if shown != self._shown:
+            text = f"Points: {self.score}  Lives: {self.lives}"
+            self.image = render_text(text, self.font, self.color)
+            self._shown = shown
+        self.rect = surface.blit(self.image, (self.x, self.y))
+
+    def get_bounds(self):
+        """Get the screen region covered by the last drawn text."""
+        return self.rect
+
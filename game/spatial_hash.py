@@ -0,0 +1,129 @@
+"""Uniform-grid spatial hash over the balls of a BallSystem.
+
+Every slot is hashed to the integer key of its grid cell, and the slots are
+kept sorted by key, so the balls of a cell are a contiguous run found with a
+binary search. Between steps most balls stay in their cell: the update only
+recomputes the keys and re-sorts the previous order, which is already nearly
+sorted. Queries return candidates only; the narrowphase tests stay with the
+caller.
+"""
+import numpy as np
+
+_OFFSET = 1 << 20  # Shift of the cell coordinates, so negative cells hash too
+_STRIDE = 1 << 21  # Key distance between two columns of cells
+_EMPTY = np.iinfo(np.int64).max  # Key of the inactive slots, sorted last
+
+# Cell offsets visited once per pair of neighbouring cells: own cell, then
+# the right column and the cell below
+_FORWARD = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class SpatialHash:
+    """Class hashing ball centers into a uniform grid of square cells."""
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_size (float): Cell side in pixels. Neighbour queries only see
+                the adjacent cells, so it must be at least the largest
+                interaction distance (twice the largest radius for ball-ball).
+        """
+        self.cell_size = cell_size
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+        self.moved = 0
+
+    def cell_keys(self, x, y):
+        """Return the keys of the cells containing points."""
+        cx = np.floor_divide(x, self.cell_size).astype(np.int64) + _OFFSET
+        cy = np.floor_divide(y, self.cell_size).astype(np.int64) + _OFFSET
+        return cx * _STRIDE + cy
+
+    def update(self, position, active):
+        """
+        Rehash the balls after they moved.
+
+        Args:
+            position (numpy.ndarray): (n, 2) ball centers.
+            active (numpy.ndarray): (n,) mask of the slots in use.
+        """
+        keys = np.where(active, self.cell_keys(position[:, 0], position[:, 1]), _EMPTY)
+        if len(keys) != len(self.keys):
+            # Capacity changed: start over from the slot order
+            self.order = np.arange(len(keys))
+            self.moved = int(active.sum())
+        else:
+            changed = keys != self.keys
+            self.moved = int(changed.sum())
+            if not self.moved:
+                return
+
+        # Stable re-sort of the previous order, fast on nearly sorted keys
+        self.keys = keys
+        self.order = self.order[np.argsort(keys[self.order], kind="stable")]
+        self.sorted_keys = keys[self.order]
+
+    def query_rect(self, xmin, ymin, xmax, ymax):
+        """
+        Find the balls whose cell overlaps a rectangle.
+
+        Args:
+            xmin, ymin, xmax, ymax (float): World rectangle.
+
+        Returns:
+            numpy.ndarray: Candidate slots.
+        """
+        size = self.cell_size
+        cx0, cx1 = int(xmin // size) + _OFFSET, int(xmax // size) + _OFFSET
+        cy0, cy1 = int(ymin // size) + _OFFSET, int(ymax // size) + _OFFSET
+
+        # Every column of cells is a single run of keys
+        starts = np.arange(cx0, cx1 + 1, dtype=np.int64) * _STRIDE
+        left = np.searchsorted(self.sorted_keys, starts + cy0, side="left")
+        right = np.searchsorted(self.sorted_keys, starts + cy1, side="right")
+        if not (right > left).any():
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.order[l:r] for l, r in zip(left, right)])
+
+    def pairs(self):
+        """
+        Find every pair of balls in the same or in adjacent cells, once.
+
+        Returns:
+            tuple: (i, j) arrays of candidate slot pairs.
+        """
+        count = int(np.searchsorted(self.sorted_keys, _EMPTY))
+        keys = self.sorted_keys[:count]
+        index = np.arange(count)
+        first, second = [], []
+
+        # Same cell: every later ball of the run
+        end = np.searchsorted(keys, keys, side="right")
+        a, b = _expand(index, index + 1, end)
+        first.append(a)
+        second.append(b)
+
+        # Forward neighbour cells: their whole run
+        for dx, dy in _FORWARD:
+            target = keys + dx * _STRIDE + dy
+            start = np.searchsorted(keys, target, side="left")
+            stop = np.searchsorted(keys, target, side="right")
+            a, b = _expand(index, start, stop)
+            first.append(a)
+            second.append(b)
+
+        first = np.concatenate(first)
+        second = np.concatenate(second)
+        return self.order[first], self.order[second]
+
+
+def _expand(index, start, stop):
+    """Expand per-item ranges [start, stop) into flat (item, position) pairs."""
+    counts = np.maximum(stop - start, 0)
+    total = int(counts.sum())
+    items = np.repeat(index, counts)
+    positions = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(start, counts)
+    return items, positions
@@ -0,0 +1,219 @@
+"""Closed-form prediction of a shot, shared by the aiming preview and the AI.
+
+The game applies gravity once per tick and then moves the ball in a straight
+line for the tick, so after n ticks of duration dt the ball center is
+
+    p(n) = p0 + dt * (n * v0 + g * dt * n * (n + 1) / 2)
+
+a discrete parabola whose chords are exactly the segments the physics
+sweeps. The predictor evaluates it for every tick at once, solves where it
+reaches the ground and leaves the game area, and sweeps the chords against
+the hoop with the same tests as the BallSystem, so the preview stops where
+the real shot first scores or bounces.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from graphic.scan_line import circle_scanline
+from graphic.shapes import draw_circle
+from util.lru import LRUCache
+
+# Names of the hoop colliders, in the order of BasketHoop.colliders()
+_PARTS = ("backboard", "pole", "rim", "rim")
+
+Prediction = namedtuple("Prediction", "points ticks event contact")
+Prediction.__doc__ = """Predicted flight of a ball until its first event.
+
+points: (m, 2) ball centers at every tick, ending at the contact.
+ticks: Ticks (of the predictor's duration) until the event.
+event: "score", "backboard", "pole", "rim", "ground", "out", or None when
+    nothing happens within the horizon.
+contact: (x, y) ball center at the event.
+"""
+
+
+def parabola(x, y, vx, vy, gravity, dt, n):
+    """
+    Evaluate the discrete parabola of a launched ball.
+
+    Args:
+        x, y (float): Launch position.
+        vx, vy (float): Launch velocity, per reference tick.
+        gravity (float): Gravity acceleration, per reference tick.
+        dt (float): Tick duration, in reference ticks.
+        n: Tick count, or array of them.
+
+    Returns:
+        tuple: (x, y) ball centers after n ticks.
+    """
+    n = np.asarray(n, dtype=float)
+    return x + dt * n * vx, y + dt * (n * vy + gravity * dt * n * (n + 1) / 2)
+
+
+class TrajectoryPredictor:
+    """Class predicting shots with a cache keyed by the launch parameters."""
+
+    def __init__(self, hoop, ground_y, gravity=0.5, dt=1.0, width=800, height=600,
+                 margin=50, horizon=600, capacity=64):
+        """
+        Initialize the predictor of a court.
+
+        Args:
+            hoop (BasketHoop): Hoop to bounce on and score in.
+            ground_y (float): Y coordinate of the ground.
+            gravity (float): Gravity acceleration, per reference tick.
+            dt (float): Tick duration, in reference ticks.
+            width, height (int): Game area; a ball further than margin
+                outside of it is out.
+            margin (float): Distance outside the area before a ball is out.
+            horizon (float): Longest prediction, in reference ticks.
+            capacity (int): Predictions kept in the cache.
+        """
+        self.hoop = hoop
+        self.ground_y = ground_y
+        self.gravity = gravity
+        self.dt = dt
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.horizon = horizon
+        self.cache = LRUCache(self._solve, capacity)
+
+    def predict(self, x, y, vx, vy, r):
+        """
+        Predict a shot, reusing the result of an identical one.
+
+        Args:
+            x, y (float): Launch position of the ball center.
+            vx, vy (float): Launch velocity, per reference tick.
+            r (float): Ball radius.
+
+        Returns:
+            Prediction: The flight until the first event.
+        """
+        return self.cache.get(float(x), float(y), float(vx), float(vy), float(r))
+
+    def _last_tick(self, x, y, vx, vy, r):
+        """Return the tick after which the parabola is surely on the ground or out."""
+        dt = self.dt
+        last = self.horizon / dt
+
+        # Ground: solve y(n) = ground_y - r, a quadratic in n
+        qa = self.gravity * dt * dt / 2
+        qb = dt * vy + qa
+        qc = y - (self.ground_y - r)
+        if qa > 0 and qc < 0:
+            last = min(last, (-qb + math.sqrt(qb * qb - 4 * qa * qc)) / (2 * qa))
+
+        # Sides: x(n) is linear
+        if vx > 0:
+            last = min(last, (self.width + self.margin - x) / (dt * vx))
+        elif vx < 0:
+            last = min(last, (x + self.margin) / (dt * -vx))
+        return max(1, math.ceil(last) + 1)
+
+    def _solve(self, x, y, vx, vy, r):
+        """Compute the prediction of a shot (cache miss)."""
+        hoop = self.hoop
+        px, py = parabola(x, y, vx, vy, self.gravity, self.dt, np.arange(self._last_tick(x, y, vx, vy, r) + 1))
+
+        # Chords travelled during every tick
+        sx, sy = px[:-1], py[:-1]
+        dx, dy = np.diff(px), np.diff(py)
+        count = len(sx)
+
+        t_hoop = hoop.sweep_many(sx, sy, dx, dy, np.full(count, r))[0]
+        t_score = hoop.sweep_score_many(sx, sy, dx, dy)
+        scoring = t_score <= t_hoop
+        t_hoop[scoring] = np.inf
+
+        # The ground and the area are checked at the end of the ticks
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_ground = np.where(py[1:] + r >= self.ground_y, (self.ground_y - r - sy) / dy, np.inf)
+        # A ball rolling on the ground (dy = 0) is there from the start of the tick
+        t_ground = np.clip(np.nan_to_num(t_ground, nan=0.0, posinf=np.inf), 0.0, np.inf)
+        # Like the physics, a tick resolves its hoop contacts before the ground
+        t_ground[np.isfinite(t_hoop) | np.isfinite(t_score)] = np.inf
+        ex, ey = px[1:], py[1:]
+        outside = (
+            (ex < -self.margin) | (ex > self.width + self.margin)
+            | (ey < -self.margin) | (ey > self.height + self.margin)
+        )
+        t_out = np.where(outside, 1.0, np.inf)
+
+        times = np.stack((t_score, t_hoop, t_ground, t_out))
+        first = np.argmin(times, axis=0)
+        t = times[first, np.arange(count)]
+        events = np.flatnonzero(np.isfinite(t))
+        if len(events) == 0:
+            points = np.column_stack((px, py))
+            return Prediction(points, float(count), None, (float(px[-1]), float(py[-1])))
+
+        k = int(events[0])
+        tk = float(t[k])
+        contact = (float(sx[k] + tk * dx[k]), float(sy[k] + tk * dy[k]))
+        event = ("score", None, "ground", "out")[first[k]]
+        if event is None:
+            event = self._part(*contact)
+        points = np.vstack((np.column_stack((px[:k + 1], py[:k + 1])), contact))
+        return Prediction(points, k + tk, event, contact)
+
+    def _part(self, x, y):
+        """Name the part of the hoop nearest to a contact center."""
+        nearest = None
+        for name, (kind, shape, _) in zip(_PARTS, self.hoop.colliders()):
+            if kind == "aabb":
+                xmin, ymin, xmax, ymax = shape
+                distance = math.hypot(x - min(max(x, xmin), xmax), y - min(max(y, ymin), ymax))
+            else:
+                qx, qy, radius = shape
+                distance = math.hypot(x - qx, y - qy) - radius
+            if nearest is None or distance < nearest[0]:
+                nearest = (distance, name)
+        return nearest[1]
+
+
+def draw_trajectory(surface, prediction, color, spacing=5, radius=3, contact_color=None,
+                    offset=(0, 0)):
+    """
+    Draw a prediction as a dotted line, with a ring on its contact point.
+
+    Args:
+        surface (pygame.Surface): Surface to draw on.
+        prediction (Prediction): The predicted flight.
+        color (tuple): Dot color.
+        spacing (int): Ticks between two dots.
+        radius (int): Dot radius.
+        contact_color (tuple | None): Ring color, None to skip the ring.
+        offset (tuple): (dx, dy) added to the world points, the camera
+            translation.
+
+    Returns:
+        tuple | None: (xmin, ymin, xmax, ymax) bounds of the drawing, None
+            if nothing was drawn.
+    """
+    points = prediction.points[:-1:max(1, spacing)] + offset
+    width, height = surface.get_width(), surface.get_height()
+    bounds = None
+    for x, y in np.rint(points).astype(int).tolist():
+        if not (0 <= x < width and 0 <= y < height):
+            continue
+        circle_scanline(surface, x, y, radius, color, None)
+        bounds = _union(bounds, (x - radius, y - radius, x + radius, y + radius))
+
+    if contact_color is not None and prediction.event is not None:
+        x, y = (int(round(c + o)) for c, o in zip(prediction.contact, offset))
+        ring = radius * 3
+        draw_circle(surface, x, y, ring, contact_color)
+        bounds = _union(bounds, (x - ring, y - ring, x + ring, y + ring))
+    return bounds
+
+
+def _union(bounds, box):
+    """Grow (xmin, ymin, xmax, ymax) bounds to include a box."""
+    if bounds is None:
+        return box
+    return (min(bounds[0], box[0]), min(bounds[1], box[1]),
+            max(bounds[2], box[2]), max(bounds[3], box[3]))
@@ -0,0 +1,88 @@
+"""Rasterization backends the game can draw its scenery with.
+
+Scene objects draw through a painter, an object with the drawing methods of
+DrawList. The pixel backend hands them a DirectDraw, which runs the
+pixel-by-pixel algorithms of graphic/ right away; the other backends hand
+them a DrawList and rasterize it with the array kernels, on a thread pool
+(tiled) or on a process pool over shared memory (banded). Every backend
+produces the same pixels.
+"""
+from graphic.banded import BandRasterizer
+from graphic.drawlist import DirectDraw, DrawList
+from graphic.tiled import TiledRenderer
+
+BACKENDS = ("pixels", "tiled", "banded")
+
+
+class PixelBackend:
+    """Backend drawing right away with the pixel-by-pixel algorithms."""
+
+    name = "pixels"
+
+    def paint(self, surface, draw):
+        """
+        Draw on a surface.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            draw (callable): draw(painter) issuing the drawing calls.
+        """
+        draw(DirectDraw(surface))
+
+    def close(self):
+        """Nothing to release."""
+
+
+class DrawListBackend:
+    """Backend recording a draw list and rasterizing it with a parallel renderer."""
+
+    def __init__(self, name, renderer):
+        """
+        Initialize the backend.
+
+        Args:
+            name (str): Backend name.
+            renderer: TiledRenderer or BandRasterizer, with
+                render(drawlist, surface) and close().
+        """
+        self.name = name
+        self.renderer = renderer
+        self.textures = {}  # Texture pixels, converted once for every draw list
+
+    def paint(self, surface, draw):
+        """
+        Record the drawing calls in a draw list and rasterize it on a surface.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            draw (callable): draw(painter) issuing the drawing calls.
+        """
+        drawlist = DrawList(*surface.get_size(), textures=self.textures)
+        draw(drawlist)
+        self.renderer.render(drawlist, surface)
+
+    def close(self):
+        """Stop the renderer's workers."""
+        self.renderer.close()
+
+
+def create_backend(name, width, height, workers=None):
+    """
+    Create a rasterization backend.
+
+    Args:
+        name (str): One of BACKENDS.
+        width, height (int): Largest surface drawn on, for the shared
+            framebuffer of the banded backend.
+        workers (int | None): Threads or processes. Defaults to the CPU count.
+
+    Returns:
+        PixelBackend | DrawListBackend: The backend.
+    """
+    if name == "pixels":
+        return PixelBackend()
+    if name == "tiled":
+        return DrawListBackend(name, TiledRenderer(workers=workers))
+    if name == "banded":
+        return DrawListBackend(name, BandRasterizer(width, height, workers=workers))
+    raise ValueError(f"unknown rasterization backend: {name}")
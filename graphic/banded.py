@@ -0,0 +1,158 @@
+"""Process-pool rasterization over a shared memory framebuffer.
+
+The framebuffer lives in multiprocessing.shared_memory and is split into
+horizontal bands. Every frame the draw list is binned by band and sent to a
+pool of worker processes, which rasterize their band directly into the
+shared pixels with the kernels of graphic/drawlist.py. Workers attach to the
+framebuffer once and persist across frames, so only the draw list crosses
+the process boundary. Bands never overlap and each band keeps the draw
+order, so the result is pixel-identical to serial rendering.
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from graphic.drawlist import rasterize
+
+
+class SharedFramebuffer:
+    """RGB framebuffer stored in a shared memory block."""
+
+    def __init__(self, width, height, name=None):
+        """
+        Create a framebuffer, or attach to an existing one by name.
+
+        Args:
+            width (int): Framebuffer width.
+            height (int): Framebuffer height.
+            name (str | None): Name of an existing block to attach to.
+        """
+        self.width = width
+        self.height = height
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=width * height * 3)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        # Row-major storage keeps every band contiguous in memory; the
+        # transposed view is indexed [x, y] like pygame.surfarray
+        self.rows = np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.shm.buf)
+        self.pixels = self.rows.transpose(1, 0, 2)
+
+    @property
+    def name(self):
+        """Name of the shared memory block."""
+        return self.shm.name
+
+    def fill(self, color):
+        """Fill the whole framebuffer with a color."""
+        self.rows[:] = color[:3]
+
+    def load(self, surface):
+        """Copy a surface into the framebuffer."""
+        self.pixels[:] = pygame.surfarray.pixels3d(surface)
+
+    def blit_to(self, surface):
+        """Show the framebuffer on a surface."""
+        pygame.surfarray.blit_array(surface, self.pixels)
+
+    def close(self):
+        """Detach from the block, and release it if this instance created it."""
+        self.rows = None
+        self.pixels = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# Framebuffer attached by each worker process
+_worker_framebuffer = None
+
+
+def _attach_worker(name, width, height):
+    """Pool initializer: attach the worker to the shared framebuffer once."""
+    global _worker_framebuffer
+    _worker_framebuffer = SharedFramebuffer(width, height, name)
+
+
+def _rasterize_band(task):
+    """Rasterize the commands of one band into the shared framebuffer."""
+    commands, rect = task
+    rasterize(_worker_framebuffer.pixels, commands, rect)
+
+
+class BandRasterizer:
+    """Class rasterizing draw lists in horizontal bands on a process pool."""
+
+    def __init__(self, width, height, workers=None, bands=None):
+        """
+        Create the shared framebuffer and start the worker processes.
+
+        Args:
+            width (int): Framebuffer width.
+            height (int): Framebuffer height.
+            workers (int | None): Number of processes. Defaults to the CPU count.
+            bands (int | None): Number of bands. Defaults to twice the workers,
+                so a band with heavy content does not stall the frame.
+        """
+        self.width = width
+        self.height = height
+        self.workers = workers or os.cpu_count() or 1
+        self.bands = bands or 2 * self.workers
+        self.framebuffer = SharedFramebuffer(width, height)
+        self._pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_attach_worker,
+            initargs=(self.framebuffer.name, width, height)
+        )
+
+        band_height = (height + self.bands - 1) // self.bands
+        self._band_rects = [
+            (0, y, width, min(y + band_height, height))
+            for y in range(0, height, band_height)
+        ]
+
+    def render(self, drawlist, surface=None):
+        """
+        Rasterize a draw list into the shared framebuffer.
+
+        Args:
+            drawlist (DrawList): Commands to draw.
+            surface (pygame.Surface | None): Surface to draw on instead of
+                the framebuffer: it is copied into the top-left corner of
+                the framebuffer, rasterized there and copied back. It cannot
+                be larger than the framebuffer.
+        """
+        width, height = self.width, self.height
+        if surface is not None:
+            width, height = surface.get_size()
+            if width > self.width or height > self.height:
+                raise ValueError(
+                    f"surface {width}x{height} larger than the framebuffer {self.width}x{self.height}"
+                )
+            target = pygame.surfarray.pixels3d(surface)
+            self.framebuffer.pixels[:width, :height] = target
+
+        tasks = []
+        for x0, y0, x1, y1 in self._band_rects:
+            rect = (x0, y0, min(x1, width), min(y1, height))
+            if rect[1] >= rect[3]:
+                continue
+            commands = [c for c in drawlist.commands if c[1][1] < rect[3] and c[1][3] > rect[1]]
+            if commands:
+                tasks.append((commands, rect))
+        self._pool.map(_rasterize_band, tasks)
+
+        if surface is not None:
+            target[:] = self.framebuffer.pixels[:width, :height]
+            del target
+
+    def close(self):
+        """Stop the workers and release the framebuffer."""
+        self._pool.close()
+        self._pool.join()
+        self.framebuffer.close()
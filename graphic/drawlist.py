@@ -0,0 +1,449 @@
+"""Deferred draw list and array kernels to rasterize it.
+
+A DrawList records draw calls instead of drawing them. The list is plain
+data (tuples, numpy arrays), so it can be binned into tiles, sent to other
+threads or pickled to other processes. The kernels rasterize commands into a
+numpy pixel array restricted to a rectangle and produce exactly the pixels of
+the pixel-by-pixel algorithms in graphic/ (the outline primitives are even
+generated by running them).
+
+DirectDraw has the same drawing methods and runs the pixel algorithms right
+away, so scene code written against one of them draws through either.
+"""
+import numpy as np
+import pygame
+
+from graphic.scan_line import circle_scanline, hoop_scanline, scanline_polygon, scanline_texture
+from graphic.shapes import (
+    draw_arc, draw_circle, draw_ellipse, draw_hoop_net_basic, draw_line_bresenham, draw_polygon,
+    draw_polygon_clipping
+)
+
+# Command opcodes
+OP_POINTS = "points"              # Precomputed pixel list (lines and outlines)
+OP_FILL_POLYGON = "fill_polygon"  # scanline_polygon
+OP_FILL_CIRCLE = "fill_circle"    # circle_scanline
+OP_FILL_HOOP = "fill_hoop"        # hoop_scanline
+OP_TEXTURE_POLYGON = "texture_polygon"  # scanline_texture
+
+
+class _PointRecorder:
+    """Surface stand-in collecting the pixels set by a drawing algorithm."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.points = []
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def set_at(self, pos, color):
+        self.points.append(pos)
+
+
+class DrawList:
+    """Class recording draw calls as serializable commands."""
+
+    def __init__(self, width, height, textures=None):
+        """
+        Initialize an empty draw list.
+
+        Args:
+            width (int): Width of the target framebuffer.
+            height (int): Height of the target framebuffer.
+            textures (dict | None): Pixel arrays of the texture surfaces
+                already converted, shared between draw lists.
+        """
+        self.width = width
+        self.height = height
+        self.commands = []
+        self.textures = textures if textures is not None else {}
+
+    def __len__(self):
+        return len(self.commands)
+
+    def clear(self):
+        """Remove every command."""
+        self.commands = []
+
+    def _add_points(self, draw, color, *args):
+        """Run an outline algorithm on a recorder and store its pixels."""
+        recorder = _PointRecorder(self.width, self.height)
+        draw(recorder, *args, color)
+        if not recorder.points:
+            return
+        points = np.array(recorder.points, dtype=np.int32)
+        bbox = (
+            int(points[:, 0].min()), int(points[:, 1].min()),
+            int(points[:, 0].max()) + 1, int(points[:, 1].max()) + 1
+        )
+        self.commands.append((OP_POINTS, bbox, points, tuple(color[:3])))
+
+    def line(self, x0, y0, x1, y1, color):
+        """Record draw_line_bresenham."""
+        self._add_points(draw_line_bresenham, color, x0, y0, x1, y1)
+
+    def polygon(self, points, color):
+        """Record draw_polygon (outline)."""
+        self._add_points(draw_polygon, color, points)
+
+    def polygon_clipping(self, points, window, color):
+        """Record draw_polygon_clipping (outline)."""
+        self._add_points(draw_polygon_clipping, color, points, window)
+
+    def circle(self, xc, yc, r, color):
+        """Record draw_circle (outline)."""
+        self._add_points(draw_circle, color, xc, yc, r)
+
+    def ellipse(self, xc, yc, a, b, color):
+        """Record draw_ellipse (outline)."""
+        self._add_points(draw_ellipse, color, xc, yc, a, b)
+
+    def arc(self, cx, cy, r_arc, ball_cx, ball_cy, ball_r, color):
+        """Record draw_arc."""
+        self._add_points(draw_arc, color, cx, cy, r_arc, ball_cx, ball_cy, ball_r)
+
+    def hoop_net(self, xc, yc, a, net_height, color):
+        """Record draw_hoop_net_basic."""
+        self._add_points(draw_hoop_net_basic, color, xc, yc, a, net_height)
+
+    def fill_polygon(self, points, color):
+        """Record scanline_polygon."""
+        points = tuple((p[0], p[1]) for p in points)
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        bbox = (int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1)
+        self.commands.append((OP_FILL_POLYGON, bbox, points, tuple(color[:3])))
+
+    def fill_circle(self, xc, yc, r, fill_color, border_color):
+        """Record circle_scanline (without clip window)."""
+        bbox = (xc - r, yc - r + 1, xc + r + 1, yc + r)
+        self.commands.append((OP_FILL_CIRCLE, bbox, xc, yc, r, tuple(fill_color[:3]), tuple(border_color[:3])))
+
+    def fill_hoop(self, xc, yc, a_outer, b_outer, a_inner, b_inner, fill_color, border_color):
+        """Record hoop_scanline."""
+        bbox = (xc - a_outer, yc - b_outer, xc + a_outer + 1, yc + b_outer + 1)
+        self.commands.append((
+            OP_FILL_HOOP, bbox, xc, yc, a_outer, b_outer, a_inner, b_inner,
+            tuple(fill_color[:3]), tuple(border_color[:3])
+        ))
+
+    def texture_polygon(self, points, uvs, texture):
+        """
+        Record scanline_texture.
+
+        Args:
+            points (list): Polygon vertices.
+            uvs (list): Texture coordinates of every vertex.
+            texture (numpy.ndarray | pygame.Surface): (tex_w, tex_h, 3)
+                texture pixels, as returned by pygame.surfarray.array3d, or
+                the texture surface.
+        """
+        if isinstance(texture, pygame.Surface):
+            texture = self._texture_pixels(texture)
+        points = tuple((p[0], p[1]) for p in points)
+        uvs = tuple((uv[0], uv[1]) for uv in uvs)
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        bbox = (int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1)
+        self.commands.append((OP_TEXTURE_POLYGON, bbox, points, uvs, texture))
+
+    def _texture_pixels(self, texture):
+        """Return the pixel array of a texture surface, converting it once."""
+        entry = self.textures.get(id(texture))
+        # The surface is kept in the entry so its id is not reused
+        if entry is None or entry[0] is not texture:
+            entry = self.textures[id(texture)] = (texture, pygame.surfarray.array3d(texture))
+        return entry[1]
+
+
+class DirectDraw:
+    """Surface wrapper with the DrawList methods, drawing right away with the pixel algorithms."""
+
+    def __init__(self, surface):
+        """
+        Initialize the wrapper.
+
+        Args:
+            surface (pygame.Surface): Surface drawn on.
+        """
+        self.surface = surface
+        self.width, self.height = surface.get_size()
+
+    def line(self, x0, y0, x1, y1, color):
+        """Draw with draw_line_bresenham."""
+        draw_line_bresenham(self.surface, x0, y0, x1, y1, color)
+
+    def polygon(self, points, color):
+        """Draw with draw_polygon (outline)."""
+        draw_polygon(self.surface, points, color)
+
+    def polygon_clipping(self, points, window, color):
+        """Draw with draw_polygon_clipping (outline)."""
+        draw_polygon_clipping(self.surface, points, window, color)
+
+    def circle(self, xc, yc, r, color):
+        """Draw with draw_circle (outline)."""
+        draw_circle(self.surface, xc, yc, r, color)
+
+    def ellipse(self, xc, yc, a, b, color):
+        """Draw with draw_ellipse (outline)."""
+        draw_ellipse(self.surface, xc, yc, a, b, color)
+
+    def arc(self, cx, cy, r_arc, ball_cx, ball_cy, ball_r, color):
+        """Draw with draw_arc."""
+        draw_arc(self.surface, cx, cy, r_arc, ball_cx, ball_cy, ball_r, color)
+
+    def hoop_net(self, xc, yc, a, net_height, color):
+        """Draw with draw_hoop_net_basic."""
+        draw_hoop_net_basic(self.surface, xc, yc, a, net_height, color)
+
+    def fill_polygon(self, points, color):
+        """Fill with scanline_polygon."""
+        scanline_polygon(self.surface, points, color)
+
+    def fill_circle(self, xc, yc, r, fill_color, border_color):
+        """Fill with circle_scanline."""
+        circle_scanline(self.surface, xc, yc, r, fill_color, border_color)
+
+    def fill_hoop(self, xc, yc, a_outer, b_outer, a_inner, b_inner, fill_color, border_color):
+        """Fill with hoop_scanline."""
+        hoop_scanline(self.surface, xc, yc, a_outer, b_outer, a_inner, b_inner, fill_color, border_color)
+
+    def texture_polygon(self, points, uvs, texture):
+        """Fill with scanline_texture; texture is a surface."""
+        tex_w, tex_h = texture.get_size()
+        scanline_texture(self.surface, points, uvs, texture, tex_w, tex_h)
+
+
+def _points_kernel(pixels, rect, points, color):
+    """Write a precomputed pixel list, keeping the pixels inside rect."""
+    x0, y0, x1, y1 = rect
+    px = points[:, 0]
+    py = points[:, 1]
+    inside = (px >= x0) & (px < x1) & (py >= y0) & (py < y1)
+    pixels[px[inside], py[inside]] = color
+
+
+def _fill_polygon_kernel(pixels, rect, points, color):
+    """
+    Scan-line fill a polygon inside rect, with the same spans as
+    scanline_polygon: the edge intersections of every row are computed for
+    all rows at once, sorted, and filled in pairs.
+    """
+    x0, y0, x1, y1 = rect
+    ys = [p[1] for p in points]
+    row_start = max(int(min(ys)), y0)
+    row_end = min(int(max(ys)), y1)
+    if row_start >= row_end:
+        return
+
+    y = np.arange(row_start, row_end, dtype=np.float64)
+    n = len(points)
+    crossings = []
+    for i in range(n):
+        ex0, ey0 = points[i]
+        ex1, ey1 = points[(i + 1) % n]
+
+        # Ignore horizontal edges
+        if ey0 == ey1:
+            continue
+
+        # Ensure ey0 < ey1
+        if ey0 > ey1:
+            ex0, ey0, ex1, ey1 = ex1, ey1, ex0, ey0
+
+        # Edge interpolation, only on rows satisfying the inclusion rule
+        t = (y - ey0) / (ey1 - ey0)
+        x = ex0 + t * (ex1 - ex0)
+        x[(y < ey0) | (y >= ey1)] = np.inf
+        crossings.append(x)
+
+    if not crossings:
+        return
+
+    crossings = np.sort(np.stack(crossings, axis=1), axis=1)
+    count = np.isfinite(crossings).sum(axis=1)
+
+    columns = np.arange(x0, x1)[:, None]
+    mask = np.zeros((x1 - x0, row_end - row_start), dtype=bool)
+    for k in range(0, crossings.shape[1] - 1, 2):
+        valid = count > k + 1
+        start = np.trunc(np.where(valid, crossings[:, k], 0)).astype(np.int64)
+        end = np.trunc(np.where(valid, crossings[:, k + 1], -1)).astype(np.int64)
+        mask |= (columns >= start[None, :]) & (columns <= end[None, :]) & valid[None, :]
+
+    pixels[x0:x1, row_start:row_end][mask] = color
+
+
+def _fill_circle_kernel(pixels, rect, xc, yc, r, color, border_color):
+    """
+    Scan-line fill a circle inside rect like circle_scanline, skipping the
+    pixels that already have the border color.
+    """
+    x0, y0, x1, y1 = rect
+    row_start = max(yc - r + 1, y0)
+    row_end = min(yc + r, y1)
+    col_start = max(xc - r, x0)
+    col_end = min(xc + r + 1, x1)
+    if row_start >= row_end or col_start >= col_end:
+        return
+
+    dx = np.arange(col_start, col_end)[:, None] - xc
+    dy = np.arange(row_start, row_end)[None, :] - yc
+    region = pixels[col_start:col_end, row_start:row_end]
+    mask = (dx * dx + dy * dy <= r * r) & np.any(region != border_color, axis=2)
+    region[mask] = color
+
+
+def _fill_hoop_kernel(pixels, rect, xc, yc, a_outer, b_outer, a_inner, b_inner, color, border_color):
+    """
+    Fill the rim between two ellipses inside rect like hoop_scanline: on
+    every row, the span of the outer ellipse minus the span of the inner
+    one, skipping the pixels that already have the border color.
+    """
+    x0, y0, x1, y1 = rect
+    row_start = max(yc - b_outer, y0)
+    row_end = min(yc + b_outer + 1, y1)
+    if row_start >= row_end:
+        return
+
+    # Spans are found on the whole width of the ellipse, then cut to rect
+    xs = np.arange(xc - a_outer, xc + a_outer + 1)
+    dx = (xs - xc)[:, None]
+    dy = (np.arange(row_start, row_end) - yc)[None, :]
+    outer = (dx * dx) / (a_outer * a_outer) + (dy * dy) / (b_outer * b_outer) <= 1
+    inner = (dx * dx) / (a_inner * a_inner) + (dy * dy) / (b_inner * b_inner) <= 1
+
+    def span(mask):
+        """Return the first and last x of the mask on every row, and the rows it covers."""
+        first = xs[np.argmax(mask, axis=0)]
+        last = xs[len(xs) - 1 - np.argmax(mask[::-1], axis=0)]
+        return first, last, mask.any(axis=0)
+
+    columns = xs[:, None]
+    left_outer, right_outer, has_outer = span(outer)
+    left_inner, right_inner, has_inner = span(inner)
+    mask = (columns >= left_outer) & (columns <= right_outer) & has_outer
+    mask &= ~((columns >= left_inner) & (columns <= right_inner) & has_inner)
+
+    col_start = max(xc - a_outer, x0)
+    col_end = min(xc + a_outer + 1, x1)
+    if col_start >= col_end:
+        return
+    mask = mask[col_start - xs[0]:col_end - xs[0]]
+    region = pixels[col_start:col_end, row_start:row_end]
+    mask &= np.any(region != border_color, axis=2)
+    region[mask] = color
+
+
+def _texture_polygon_kernel(pixels, rect, points, uvs, texture):
+    """
+    Texture-map a polygon inside rect like scanline_texture: x, u and v are
+    interpolated along the edges for all rows at once, then across each span.
+    """
+    x0, y0, x1, y1 = rect
+    ys = [p[1] for p in points]
+    row_start = max(int(min(ys)), y0)
+    row_end = min(int(max(ys)), y1)
+    if row_start >= row_end:
+        return
+
+    y = np.arange(row_start, row_end, dtype=np.float64)
+    n = len(points)
+    crossings = []
+    for i in range(n):
+        ex0, ey0 = points[i]
+        ex1, ey1 = points[(i + 1) % n]
+        u0, v0 = uvs[i]
+        u1, v1 = uvs[(i + 1) % n]
+
+        if ey0 == ey1:
+            continue
+
+        if ey0 > ey1:
+            ex0, ey0, ex1, ey1 = ex1, ey1, ex0, ey0
+            u0, v0, u1, v1 = u1, v1, u0, v0
+
+        t = (y - ey0) / (ey1 - ey0)
+
+        # Edge interpolation
+        x = ex0 + t * (ex1 - ex0)
+        x[(y < ey0) | (y >= ey1)] = np.inf
+        crossings.append((x, u0 + t * (u1 - u0), v0 + t * (v1 - v0)))
+
+    if not crossings:
+        return
+
+    x = np.stack([c[0] for c in crossings], axis=1)
+    u = np.stack([c[1] for c in crossings], axis=1)
+    v = np.stack([c[2] for c in crossings], axis=1)
+
+    # Stable sort by x, like list.sort with a key
+    order = np.argsort(x, axis=1, kind="stable")
+    x = np.take_along_axis(x, order, axis=1)
+    u = np.take_along_axis(u, order, axis=1)
+    v = np.take_along_axis(v, order, axis=1)
+    count = np.isfinite(x).sum(axis=1)
+
+    tex_w, tex_h = texture.shape[0], texture.shape[1]
+    columns = np.arange(x0, x1, dtype=np.float64)[:, None]
+    region = pixels[x0:x1, row_start:row_end]
+    for k in range(0, x.shape[1] - 1, 2):
+        valid = (count > k + 1) & (x[:, k] != x[:, k + 1])
+        if not valid.any():
+            continue
+        x_start = np.where(valid, x[:, k], 0.0)[None, :]
+        x_end = np.where(valid, x[:, k + 1], 1.0)[None, :]
+        inside = (
+            (columns >= np.trunc(x_start)) & (columns <= np.trunc(x_end)) & valid[None, :]
+        )
+
+        t = (columns - x_start) / (x_end - x_start)
+        tu = u[:, k][None, :] + t * (u[:, k + 1] - u[:, k])[None, :]
+        tv = v[:, k][None, :] + t * (v[:, k + 1] - v[:, k])[None, :]
+        tx = np.trunc((tu % 1.0) * tex_w)
+        ty = np.trunc((tv % 1.0) * tex_h)
+        inside &= (tx >= 0) & (tx < tex_w) & (ty >= 0) & (ty < tex_h)
+
+        region[inside] = texture[tx[inside].astype(np.intp), ty[inside].astype(np.intp)]
+
+
+KERNELS = {
+    OP_POINTS: _points_kernel,
+    OP_FILL_POLYGON: _fill_polygon_kernel,
+    OP_FILL_CIRCLE: _fill_circle_kernel,
+    OP_FILL_HOOP: _fill_hoop_kernel,
+    OP_TEXTURE_POLYGON: _texture_polygon_kernel,
+}
+
+
+def rasterize(pixels, commands, rect):
+    """
+    Rasterize commands, in order, into the part of a pixel array inside rect.
+
+    Args:
+        pixels (numpy.ndarray): (width, height, 3) pixel array, as returned
+            by pygame.surfarray.pixels3d.
+        commands (list): DrawList commands.
+        rect (tuple): (x0, y0, x1, y1) half-open region to write.
+    """
+    width, height = pixels.shape[0], pixels.shape[1]
+    x0, y0, x1, y1 = rect
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = min(x1, width), min(y1, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    for command in commands:
+        bx0, by0, bx1, by1 = command[1]
+        # Rect of this command inside the region
+        cx0, cy0 = max(x0, bx0), max(y0, by0)
+        cx1, cy1 = min(x1, bx1), min(y1, by1)
+        if cx0 >= cx1 or cy0 >= cy1:
+            continue
+        KERNELS[command[0]](pixels, (cx0, cy0, cx1, cy1), *command[2:])
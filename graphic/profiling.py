@@ -0,0 +1,231 @@
+"""Opt-in per-primitive instrumentation of the rasterizers.
+
+Enabling the profiler swaps every rasterization primitive, in every module
+that imported it, for a wrapper counting its calls and wall time, and swaps
+set_pixel for one charging each pixel write to the innermost primitive
+running. Disabling puts the original functions back, so a disabled profiler
+costs nothing: there is no flag tested in the drawing code.
+
+Times are inclusive (a polygon includes its lines); self times exclude the
+nested primitives. Only the main thread, which draws the frames, is
+counted: rasterizers running on the asset loader threads or in worker
+processes (graphic.banded) are not seen. Pixels are only counted on
+surfaces, so recording a DrawList, which writes nothing, adds calls and
+time but no pixels.
+"""
+import functools
+import importlib
+import inspect
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+import pygame
+
+from graphic import shapes
+from graphic.text import draw_text, get_font
+
+# Modules whose public functions are primitives
+INSTRUMENTED = ("graphic.shapes", "graphic.scan_line", "graphic.floodfill", "graphic.clipping")
+
+# Helpers called once per pixel or per point: wrapping them would measure the wrapper
+PER_PIXEL = ("set_pixel", "color_interpolate", "space_code")
+
+# Counter slots of a primitive
+CALLS, PIXELS, TIME, SELF_TIME = range(4)
+
+
+class Profiler:
+    """Class collecting per-primitive statistics, frame by frame."""
+
+    def __init__(self, history=600):
+        """
+        Initialize a disabled profiler.
+
+        Args:
+            history (int | None): Finished frames kept, None keeps them all.
+        """
+        self.enabled = False
+        self.frame = {}  # Primitive name -> [calls, pixels, time, self time]
+        self.frames = deque(maxlen=history)
+        self.frame_count = 0
+        self.totals = {}
+        self._stack = []  # [counters, nested time] of the running primitives
+        self._thread = threading.main_thread().ident
+        self._patches = []  # (module namespace, attribute, original function)
+
+    @staticmethod
+    def primitives():
+        """
+        List the instrumented functions.
+
+        Returns:
+            list: (name, function) pairs.
+        """
+        found = []
+        for module_name in INSTRUMENTED:
+            module = importlib.import_module(module_name)
+            for name, function in inspect.getmembers(module, inspect.isfunction):
+                if function.__module__ == module_name and not name.startswith("_") and name not in PER_PIXEL:
+                    found.append((name, function))
+        return found
+
+    def enable(self):
+        """Swap the wrappers in, in every loaded module."""
+        if self.enabled:
+            return
+        replacements = {id(function): self._wrap(name, function) for name, function in self.primitives()}
+        replacements[id(shapes.set_pixel)] = self._wrap_set_pixel(shapes.set_pixel)
+        for module in list(sys.modules.values()):
+            namespace = getattr(module, "__dict__", None)
+            if namespace is None:
+                continue
+            for attribute, value in list(namespace.items()):
+                wrapper = replacements.get(id(value))
+                if wrapper is not None and wrapper.__wrapped__ is value:
+                    namespace[attribute] = wrapper
+                    self._patches.append((namespace, attribute, value))
+        self.enabled = True
+
+    def disable(self):
+        """Put the original functions back."""
+        for namespace, attribute, original in reversed(self._patches):
+            namespace[attribute] = original
+        self._patches = []
+        self.enabled = False
+
+    def _counters(self, name):
+        """Return the counters of a primitive in the current frame."""
+        counters = self.frame.get(name)
+        if counters is None:
+            counters = self.frame[name] = [0, 0, 0.0, 0.0]
+        return counters
+
+    def _wrap(self, name, function):
+        """Return a primitive wrapped to count its calls and time."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # The frame is only updated from the main thread, without a lock
+            if threading.get_ident() != self._thread:
+                return function(*args, **kwargs)
+            stack = self._stack
+            # [counters, time spent in nested primitives]
+            entry = [self._counters(name), 0.0]
+            stack.append(entry)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                counters = entry[0]
+                counters[CALLS] += 1
+                counters[TIME] += elapsed
+                counters[SELF_TIME] += elapsed - entry[1]
+                if stack:
+                    stack[-1][1] += elapsed
+        return wrapper
+
+    def _wrap_set_pixel(self, set_pixel):
+        """
+        Return set_pixel wrapped to charge its writes to the running
+        primitive. Surface stand-ins, such as the DrawList point recorder,
+        are not counted: nothing reaches the screen through them.
+        """
+        @functools.wraps(set_pixel)
+        def wrapper(surface, x, y, color):
+            if isinstance(surface, pygame.Surface) and threading.get_ident() == self._thread:
+                stack = self._stack
+                counters = stack[-1][0] if stack else self._counters("set_pixel")
+                counters[PIXELS] += 1
+            set_pixel(surface, x, y, color)
+        return wrapper
+
+    def end_frame(self):
+        """Close the current frame and start a new one."""
+        for name, counters in self.frame.items():
+            total = self.totals.setdefault(name, [0, 0, 0.0, 0.0])
+            for slot, value in enumerate(counters):
+                total[slot] += value
+        self.frames.append((self.frame_count, self.frame))
+        self.frame_count += 1
+        self.frame = {}
+
+    @property
+    def last_frame(self):
+        """Counters of the last finished frame, by primitive name."""
+        return self.frames[-1][1] if self.frames else {}
+
+    @staticmethod
+    def rows(counters):
+        """
+        Sort counters by decreasing time.
+
+        Returns:
+            list: (name, calls, pixels, time, self time) tuples.
+        """
+        rows = [(name,) + tuple(values) for name, values in counters.items()]
+        return sorted(rows, key=lambda row: row[1 + TIME], reverse=True)
+
+    def to_json(self):
+        """Return the frames and totals as a JSON-serializable dict."""
+        def primitives(counters):
+            return {
+                name: {
+                    "calls": values[CALLS],
+                    "pixels": values[PIXELS],
+                    "time_ms": values[TIME] * 1000,
+                    "self_ms": values[SELF_TIME] * 1000,
+                }
+                for name, values in counters.items()
+            }
+
+        return {
+            "frame_count": self.frame_count,
+            "totals": primitives(self.totals),
+            "frames": [{"frame": index, "primitives": primitives(counters)} for index, counters in self.frames],
+        }
+
+    def export(self, path):
+        """Write the frames and totals to a JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.to_json(), file, indent=1)
+
+
+def draw_profile_overlay(surface, profiler, x=10, y=140, rows=8):
+    """
+    Draw the costliest primitives of the last frame in a translucent panel.
+
+    Args:
+        surface (pygame.Surface): Target surface.
+        profiler (Profiler): Source of the statistics.
+        x, y (int): Top-left corner of the panel.
+        rows (int): Primitives listed.
+
+    Returns:
+        pygame.Rect: Region covered by the panel.
+    """
+    font = get_font(None, 18)
+    counters = profiler.rows(profiler.last_frame)
+    total = sum(row[1 + SELF_TIME] for row in counters) * 1000
+    table = [("primitive", "calls", "pixels", "ms")]
+    for name, calls, pixels, elapsed, _ in counters[:rows]:
+        table.append((name, str(calls), str(pixels), f"{elapsed * 1000:.2f}"))
+
+    line_height = font.get_linesize()
+    panel = pygame.Surface((320, line_height * (len(table) + 1) + 8), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 170))
+    rect = surface.blit(panel, (x, y))
+
+    color = (255, 255, 255)
+    draw_text(surface, f"primitives: {total:.1f} ms, frame {profiler.frame_count}", font, color,
+              topleft=(x + 4, y + 4))
+    for index, (name, calls, pixels, elapsed) in enumerate(table, 1):
+        top = y + 4 + index * line_height
+        draw_text(surface, name, font, color, topleft=(x + 4, top))
+        # Numbers right-aligned on their column
+        for text, right in ((calls, x + 210), (pixels, x + 268), (elapsed, x + 316)):
+            draw_text(surface, text, font, color, topright=(right, top))
+    return rect
@@ -0,0 +1,153 @@
+"""Image resampling used to build viewports from an offscreen frame.
+
+The project rules forbid ready-made scalers (pygame.transform.scale and
+smoothscale), so the resampling is done here directly on the pixel arrays.
+"""
+import numpy as np
+import pygame
+
+
+def _clip_viewport(viewport, surface):
+    """
+    Clip an inclusive viewport rectangle to the bounds of a surface.
+
+    Args:
+        viewport (tuple): (xmin, ymin, xmax, ymax) inclusive pixel bounds.
+        surface (pygame.Surface): Surface the viewport lives on.
+
+    Returns:
+        tuple | None: Clipped (xmin, ymin, xmax, ymax) or None if empty.
+    """
+    width, height = surface.get_size()
+    vxmin, vymin, vxmax, vymax = (int(v) for v in viewport)
+    vxmin, vymin = max(vxmin, 0), max(vymin, 0)
+    vxmax, vymax = min(vxmax, width - 1), min(vymax, height - 1)
+    if vxmin > vxmax or vymin > vymax:
+        return None
+    return vxmin, vymin, vxmax, vymax
+
+
+def _nearest_indices(w_min, w_max, size, limit):
+    """
+    Map each destination pixel to the source pixel under its center.
+
+    Args:
+        w_min (float): Window start in source coordinates.
+        w_max (float): Window end in source coordinates.
+        size (int): Number of destination pixels.
+        limit (int): Source size, used to clamp the indices.
+
+    Returns:
+        numpy.ndarray: Source index for every destination pixel.
+    """
+    scale = (w_max - w_min) / size
+    idx = np.floor(w_min + (np.arange(size) + 0.5) * scale).astype(np.intp)
+    return np.clip(idx, 0, limit - 1)
+
+
+def _box_ranges(w_min, w_max, size, limit):
+    """
+    Compute the half-open source range covered by each destination pixel.
+
+    Every destination pixel covers at least one source pixel, so upscaling
+    degrades gracefully into nearest neighbour.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: (start, end) source indices.
+    """
+    scale = (w_max - w_min) / size
+    edges = w_min + np.arange(size + 1) * scale
+    start = np.clip(np.floor(edges[:-1]).astype(np.intp), 0, limit - 1)
+    end = np.clip(np.floor(edges[1:]).astype(np.intp), 0, limit)
+    end = np.maximum(end, start + 1)
+    return start, end
+
+
+def resample_nearest(src, window, dst, viewport):
+    """
+    Resample a window of the source surface into a viewport of the
+    destination surface using nearest neighbour sampling.
+
+    Args:
+        src (pygame.Surface): Source surface (usually the offscreen frame).
+        window (tuple): (xmin, ymin, xmax, ymax) region of the source.
+        dst (pygame.Surface): Destination surface.
+        viewport (tuple): (xmin, ymin, xmax, ymax) inclusive pixel bounds on dst.
+    """
+    clipped = _clip_viewport(viewport, dst)
+    if clipped is None:
+        return
+    vxmin, vymin, vxmax, vymax = clipped
+
+    # Compute the mapping for the full viewport, then keep the visible part
+    full_w = int(viewport[2]) - int(viewport[0]) + 1
+    full_h = int(viewport[3]) - int(viewport[1]) + 1
+    src_w, src_h = src.get_size()
+    xs = _nearest_indices(window[0], window[2], full_w, src_w)
+    ys = _nearest_indices(window[1], window[3], full_h, src_h)
+    xs = xs[vxmin - int(viewport[0]):vxmax - int(viewport[0]) + 1]
+    ys = ys[vymin - int(viewport[1]):vymax - int(viewport[1]) + 1]
+
+    src_pixels = pygame.surfarray.pixels3d(src)
+    dst_pixels = pygame.surfarray.pixels3d(dst)
+    dst_pixels[vxmin:vxmax + 1, vymin:vymax + 1] = src_pixels[xs[:, None], ys[None, :]]
+
+    # Release the surface locks
+    del src_pixels
+    del dst_pixels
+
+
+def resample_box(src, window, dst, viewport):
+    """
+    Resample a window of the source surface into a viewport of the
+    destination surface averaging every source pixel covered by each
+    destination pixel (box filter). Averages are computed with a
+    summed-area table, so the cost does not depend on the reduction factor.
+
+    Args:
+        src (pygame.Surface): Source surface (usually the offscreen frame).
+        window (tuple): (xmin, ymin, xmax, ymax) region of the source.
+        dst (pygame.Surface): Destination surface.
+        viewport (tuple): (xmin, ymin, xmax, ymax) inclusive pixel bounds on dst.
+    """
+    clipped = _clip_viewport(viewport, dst)
+    if clipped is None:
+        return
+    vxmin, vymin, vxmax, vymax = clipped
+
+    full_w = int(viewport[2]) - int(viewport[0]) + 1
+    full_h = int(viewport[3]) - int(viewport[1]) + 1
+    src_w, src_h = src.get_size()
+    x0, x1 = _box_ranges(window[0], window[2], full_w, src_w)
+    y0, y1 = _box_ranges(window[1], window[3], full_h, src_h)
+    visible_x = slice(vxmin - int(viewport[0]), vxmax - int(viewport[0]) + 1)
+    visible_y = slice(vymin - int(viewport[1]), vymax - int(viewport[1]) + 1)
+    x0, x1 = x0[visible_x], x1[visible_x]
+    y0, y1 = y0[visible_y], y1[visible_y]
+
+    # Only the covered part of the source goes into the table
+    sx_lo, sx_hi = int(x0.min()), int(x1.max())
+    sy_lo, sy_hi = int(y0.min()), int(y1.max())
+    x0, x1 = x0 - sx_lo, x1 - sx_lo
+    y0, y1 = y0 - sy_lo, y1 - sy_lo
+
+    src_pixels = pygame.surfarray.pixels3d(src)
+    region = src_pixels[sx_lo:sx_hi, sy_lo:sy_hi]
+
+    # Summed-area table with a zero row/column in front
+    sat = np.zeros((sx_hi - sx_lo + 1, sy_hi - sy_lo + 1, 3), dtype=np.int32)
+    sat[1:, 1:] = region.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+    del region
+    del src_pixels
+
+    total = (
+        sat[x1[:, None], y1[None, :]]
+        - sat[x0[:, None], y1[None, :]]
+        - sat[x1[:, None], y0[None, :]]
+        + sat[x0[:, None], y0[None, :]]
+    )
+    area = ((x1 - x0)[:, None] * (y1 - y0)[None, :])[:, :, None]
+
+    dst_pixels = pygame.surfarray.pixels3d(dst)
+    dst_pixels[vxmin:vxmax + 1, vymin:vymax + 1] = (total // area).astype(np.uint8)
+    del dst_pixels
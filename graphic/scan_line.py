@@ -1,3 +1,5 @@
+import math
+
 from graphic.shapes import set_pixel
 from graphic.clipping import space_code, INSIDE
 
@@ -234,6 +236,34 @@ def scanline_polygon(surface, points, fill_color):
                     set_pixel(surface, x, y, fill_color)
 
 
+def scanline_thick_line(surface, x0, y0, x1, y1, width, color):
+    """
+    Draw a line of the given width as a scan-line filled quad.
+
+    Args:
+        surface: The surface to draw on.
+        x0, y0 (float): Start of the line.
+        x1, y1 (float): End of the line.
+        width (float): Line width, in pixels.
+        color: Fill color.
+
+    Returns:
+        tuple: Inclusive (xmin, ymin, xmax, ymax) bounds of the pixels the
+            quad may cover; the scan lines stop before its bottom edge.
+    """
+    dx, dy = x1 - x0, y1 - y0
+    length = math.hypot(dx, dy)
+    if length == 0:
+        dx, dy, length = 1, 0, 1
+    # Half-width offset along the normal
+    ox, oy = -dy / length * width / 2, dx / length * width / 2
+    points = [(x0 + ox, y0 + oy), (x1 + ox, y1 + oy), (x1 - ox, y1 - oy), (x0 - ox, y0 - oy)]
+    scanline_polygon(surface, points, color)
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return math.floor(min(xs)), math.floor(min(ys)), math.floor(max(xs)), math.ceil(max(ys)) - 1
+
+
 def scanline_polygon_clipping(surface, points, fill_color, xmin, ymin, xmax, ymax):
     """
     Scan-line fill a polygon defined by a list of points
@@ -357,7 +387,8 @@ def scanline_texture(surface, points, uvs, texture, tex_w, tex_h):
             if x_start == x_end:
                 continue
 
-            for x in range(int(x_start), int(x_end) + 1):
+            # Columns off the surface would be dropped by set_pixel
+            for x in range(max(int(x_start), 0), min(int(x_end) + 1, surface.get_width())):
                 t = (x - x_start) / (x_end - x_start)
 
                 u = u_start + t * (u_end - u_start)
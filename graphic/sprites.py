@@ -0,0 +1,149 @@
+"""Pre-rendered sprites and a bounded cache to reuse them.
+
+A sprite is rasterized once with the project's own algorithms on a small
+colorkeyed surface. Drawing it is a single clipped stamp of that image,
+whatever the algorithms that produced it.
+"""
+import pygame
+
+from util.lru import LRUCache
+
+# Candidate colorkeys, the first one not used by the sprite is picked
+_COLORKEYS = ((255, 0, 255), (0, 255, 0), (0, 0, 255))
+
+
+class Sprite:
+    """Colorkeyed image with an origin."""
+
+    def __init__(self, image, origin):
+        """
+        Initialize a sprite.
+
+        Args:
+            image (pygame.Surface): Sprite pixels, transparent where colorkeyed.
+            origin (tuple): (x, y) pixel of the sprite placed on the stamp position.
+        """
+        self.image = image
+        self.origin = origin
+        self.width, self.height = image.get_size()
+
+    @classmethod
+    def render(cls, width, height, origin, draw, colors=()):
+        """
+        Rasterize a sprite with a drawing function.
+
+        Args:
+            width (int): Sprite width.
+            height (int): Sprite height.
+            origin (tuple): (x, y) pixel of the sprite placed on the stamp position.
+            draw (callable): draw(surface) drawing the sprite on a surface.
+            colors (tuple): Colors used by draw, so the colorkey can differ.
+
+        Returns:
+            Sprite: The rasterized sprite.
+        """
+        key = next(k for k in _COLORKEYS if k not in colors)
+        image = pygame.Surface((width, height), depth=32)
+        image.fill(key)
+        draw(image)
+        image.set_colorkey(key)
+        return cls(image, origin)
+
+    def stamp(self, surface, x, y, clip=None):
+        """
+        Copy the sprite on a surface, clipped to a window.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            x (int): Target x of the sprite origin.
+            y (int): Target y of the sprite origin.
+            clip (tuple | None): Inclusive (xmin, ymin, xmax, ymax) clip window.
+                Defaults to the whole surface.
+
+        Returns:
+            pygame.Rect | None: Region written, None if the sprite is hidden.
+        """
+        left = x - self.origin[0]
+        top = y - self.origin[1]
+        if clip is None:
+            clip = (0, 0, surface.get_width() - 1, surface.get_height() - 1)
+        xmin, ymin, xmax, ymax = clip
+
+        x0, y0 = max(left, xmin, 0), max(top, ymin, 0)
+        x1 = min(left + self.width, xmax + 1, surface.get_width())
+        y1 = min(top + self.height, ymax + 1, surface.get_height())
+        if x0 >= x1 or y0 >= y1:
+            return None
+
+        area = (x0 - left, y0 - top, x1 - x0, y1 - y0)
+        return surface.blit(self.image, (x0, y0), area)
+
+
+class IndexedSprite(Sprite):
+    """
+    Palette-indexed sprite: the shape is rasterized once into an index
+    image and the colors are only looked up in the palette when stamped,
+    so recoloring a sprite costs nothing.
+    """
+
+    TRANSPARENT = 0  # Index of the uncovered pixels
+
+    @classmethod
+    def render(cls, width, height, origin, draw, colors=1):
+        """
+        Rasterize the index image of a sprite.
+
+        Args:
+            width (int): Sprite width.
+            height (int): Sprite height.
+            origin (tuple): (x, y) pixel of the sprite placed on the stamp position.
+            draw (callable): draw(surface, indices) drawing the sprite, where
+                indices[i] is the color to draw palette entry i + 1 with.
+            colors (int): Number of palette entries used by draw.
+
+        Returns:
+            IndexedSprite: The rasterized sprite.
+        """
+        # Entry i is drawn with the color (i, 0, 0), so its red channel is the index
+        surface = pygame.Surface((width, height), depth=32)
+        surface.fill((cls.TRANSPARENT, 0, 0))
+        draw(surface, [(i, 0, 0) for i in range(1, colors + 1)])
+
+        image = pygame.Surface((width, height), depth=8)
+        image.set_palette([(0, 0, 0)] * 256)
+        pygame.surfarray.blit_array(image, pygame.surfarray.pixels_red(surface))
+        image.set_colorkey(cls.TRANSPARENT)
+        return cls(image, origin)
+
+    def stamp(self, surface, x, y, palette=(), clip=None):
+        """
+        Copy the sprite on a surface with a palette, clipped to a window.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            x (int): Target x of the sprite origin.
+            y (int): Target y of the sprite origin.
+            palette (sequence): Colors of the palette entries 1, 2, ...
+            clip (tuple | None): Inclusive (xmin, ymin, xmax, ymax) clip window.
+                Defaults to the whole surface.
+
+        Returns:
+            pygame.Rect | None: Region written, None if the sprite is hidden.
+        """
+        for i, color in enumerate(palette, 1):
+            self.image.set_palette_at(i, color[:3])
+        return super().stamp(surface, x, y, clip)
+
+
+class SpriteCache(LRUCache):
+    """Lazily filled sprite cache with least-recently-used eviction."""
+
+    def __init__(self, render, capacity=256):
+        """
+        Initialize an empty cache.
+
+        Args:
+            render (callable): render(*key) returning the Sprite of a key.
+            capacity (int): Maximum number of sprites kept.
+        """
+        super().__init__(render, capacity)
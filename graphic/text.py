@@ -0,0 +1,69 @@
+"""Cached text rendering: fonts loaded once and rendered strings reused.
+
+Looking a system font up is by far the slowest part of pygame's text
+rendering, followed by rasterizing the string. Every font is loaded once,
+and the rendered strings are kept in an LRU cache keyed by (text, font,
+color), so a text that does not change costs a single blit per frame.
+"""
+import pygame
+
+from util.lru import LRUCache
+
+_fonts = {}
+_strings = LRUCache(lambda text, font, color: font.render(text, True, color), 256)
+
+
+def get_font(name=None, size=24, bold=False):
+    """
+    Return a system font, loading it only the first time.
+
+    Args:
+        name (str | None): System font name, None for pygame's default font.
+        size (int): Font size.
+        bold (bool): Bold variant.
+
+    Returns:
+        pygame.font.Font: The shared font.
+    """
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, font, color):
+    """
+    Return the surface of a string, reusing the one of an identical call.
+
+    The surface is shared: blit it, do not draw on it.
+
+    Args:
+        text (str): Text to render.
+        font (pygame.font.Font): Font, from get_font.
+        color (tuple): RGB text color.
+
+    Returns:
+        pygame.Surface: Antialiased text on a transparent surface.
+    """
+    return _strings.get(text, font, tuple(color))
+
+
+def draw_text(surface, text, font, color, **anchor):
+    """
+    Blit a cached string on a surface.
+
+    Args:
+        surface (pygame.Surface): Target surface.
+        text (str): Text to draw.
+        font (pygame.font.Font): Font, from get_font.
+        color (tuple): RGB text color.
+        **anchor: Position of the text as a pygame.Rect attribute, like
+            topleft=(x, y) or center=(x, y). Defaults to topleft=(0, 0).
+
+    Returns:
+        pygame.Rect: Region of the surface covered by the text.
+    """
+    image = render_text(text, font, color)
+    return surface.blit(image, image.get_rect(**anchor))
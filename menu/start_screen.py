@@ -1,36 +1,67 @@
-"""Module for the start screen with title animation and music."""
+"""Module for the start screen with title animation and music.
+
+The background, the stars and the controls line never change: they are
+rasterized once on a cached surface. Every frame blits it and composites
+the animated elements on top, the title texts being their white rendering
+multiplied by the fade color.
+"""
+import io
+import os
+
+import numpy as np
 import pygame
 
+from core.assets import AssetManager
 from game.ball import BasketBall
 from graphic.scan_line import circle_scanline
 from graphic.shapes import draw_circle, draw_polygon
 from graphic.floodfill import flood_fill
+from graphic.text import draw_text, get_font, render_text
 
 
 class StartScreen:
     """Class representing the start screen with animated title."""
     
-    def __init__(self, width=800, height=600):
-        """Initialize the start screen."""
+    def __init__(self, width=800, height=600, music=True, assets=None):
+        """
+        Initialize the start screen.
+
+        Args:
+            width (int): Screen width.
+            height (int): Screen height.
+            music (bool): Initialize the mixer and play the background music.
+            assets (AssetManager | None): Manager loading the music in the
+                background; its progress is shown until every asset arrived.
+                None loads the music right away.
+        """
         self.width = width
         self.height = height
         self.alpha = 0  # For fade in/out animation
         self.alpha_direction = 1  # 1 for fading in, -1 for fading out
         self.alpha_speed = 3
         self.start_pressed = False
+        self.music = music
+        self.assets = assets if assets is not None else AssetManager(workers=0)
+        self.background = None  # Static layer, rasterized on the first draw
+
+        # Basketball icon drawn at every icon position, recolored with the fade
+        self.icon = BasketBall(0, 0, 25, (100, 0, 0), (20, 30, 80))
         
-        # Load and play background music
+        # Load background music, it starts playing when ready
+        if not music:
+            return
+        self.assets.submit("music", _read_music, "menu/spacejam.mp3",
+                           finish=_open_music).on_ready(self._play_music)
+
+    def _play_music(self, loaded):
+        """Start the loaded music, quietly if the game already started."""
+        if not loaded:
+            return
         try:
-            pygame.mixer.init()
-            # To add music to your game:
-            # 1. Place a music file (mp3, ogg, or wav) in the project directory
-            # 2. Uncomment the lines below and update the path
-            pygame.mixer.music.load("menu/spacejam.mp3")  # Change to your music file path
-            pygame.mixer.music.set_volume(1)  # Set volume (0.0 to 1.0)
+            pygame.mixer.music.set_volume(0.2 if self.start_pressed else 1)  # Set volume (0.0 to 1.0)
             pygame.mixer.music.play(-1)  # Loop indefinitely (-1) or specify number of times
         except Exception as e:
-            print(f"Could not load music: {e}")
-            pass  # If music file not found, continue without music
+            print(f"Could not play music: {e}")
     
     def draw_background(self, surface):
         """Draw the background using floodfill."""
@@ -72,7 +103,7 @@ class StartScreen:
     def draw_title(self, surface):
         """Draw the game title with animation."""
         # Main title
-        font = pygame.font.SysFont('arial', 72, bold=True)
+        font = get_font('arial', 72, bold=True)
         title_text = "BASKETBALL"
         
         # Calculate color with alpha animation
@@ -80,18 +111,16 @@ class StartScreen:
         title_color = (color_value, color_value, 255)
         
         # Render title
-        text_surface = font.render(title_text, True, title_color)
-        text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 3))
-        surface.blit(text_surface, text_rect)
+        title = _tint(render_text(title_text, font, (255, 255, 255)), title_color)
+        surface.blit(title, title.get_rect(center=(self.width // 2, self.height // 3)))
         
         # Subtitle
-        subtitle_font = pygame.font.SysFont('arial', 36)
+        subtitle_font = get_font('arial', 36)
         subtitle_text = "ARCADE"
         subtitle_color = (color_value, 255, color_value)
         
-        subtitle_surface = subtitle_font.render(subtitle_text, True, subtitle_color)
-        subtitle_rect = subtitle_surface.get_rect(center=(self.width // 2, self.height // 3 + 70))
-        surface.blit(subtitle_surface, subtitle_rect)
+        subtitle = _tint(render_text(subtitle_text, subtitle_font, (255, 255, 255)), subtitle_color)
+        surface.blit(subtitle, subtitle.get_rect(center=(self.width // 2, self.height // 3 + 70)))
         
         # Draw basketball icon near title
         self._draw_basketball_icon(surface, self.width // 2 - 180, 1, color_value)
@@ -103,32 +132,40 @@ class StartScreen:
         self._draw_basketball_icon(surface, self.width // 2, self.height // 2 + 60 , color_value)
     
     def _draw_basketball_icon(self, surface, x, y, alpha):
-        """Draw a small basketball icon using the shapes functions."""
-        r = 25
+        """Draw a small basketball icon, recolored through its sprite palette."""
         color = (min(255, alpha + 100), min(165, int(alpha * 0.65)), 0)  # Orange color
         
         # Draw basketball circle
-        ball = BasketBall(x, y, r, color, (20, 30, 80) )
-        ball.draw(surface)
+        self.icon.colors["fill"] = color
+        self.icon.xc, self.icon.yc = x, y
+        self.icon.draw(surface)
     
     def draw_instructions(self, surface):
         """Draw instructions for starting the game."""
-        font = pygame.font.SysFont('arial', 32)
+        font = get_font('arial', 32)
         
         # Make "Press SPACE to start" blink
         if self.alpha > 128:
             text = "Press SPACE to start"
             color = (255, 255, 255)
-            text_surface = font.render(text, True, color)
-            text_rect = text_surface.get_rect(center=(self.width // 2, self.height * 2 // 3 + 50))
-            surface.blit(text_surface, text_rect)
-        
-        # Controls info
-        controls_font = pygame.font.SysFont('arial', 20)
+            draw_text(surface, text, font, color, center=(self.width // 2, self.height * 2 // 3 + 50))
+
+        # Loading progress, until every asset arrived
+        loaded, total = self.assets.progress
+        if loaded < total:
+            draw_text(
+                surface, f"Loading assets... {loaded}/{total}", get_font('arial', 20), (200, 200, 200),
+                center=(self.width // 2, self.height - 30)
+            )
+    
+    def _draw_controls(self, surface):
+        """Draw the controls info."""
+        controls_font = get_font('arial', 20)
         controls_text = "Controls: Mouse to aim and shoot | R to reset"
-        controls_surface = controls_font.render(controls_text, True, (200, 200, 200))
-        controls_rect = controls_surface.get_rect(center=(self.width // 2, self.height * 2 // 3 + 100))
-        surface.blit(controls_surface, controls_rect)
+        draw_text(
+            surface, controls_text, controls_font, (200, 200, 200),
+            center=(self.width // 2, self.height * 2 // 3 + 100)
+        )
     
     def update_animation(self):
         """Update the fade in/out animation."""
@@ -142,9 +179,17 @@ class StartScreen:
             self.alpha = 0
             self.alpha_direction = 1
     
+    def _build_background(self):
+        """Rasterize the static layer: background, stars and controls info."""
+        self.background = pygame.Surface((self.width, self.height))
+        self.draw_background(self.background)
+        self._draw_controls(self.background)
+
     def draw(self, surface):
         """Draw the complete start screen."""
-        self.draw_background(surface)
+        if self.background is None:
+            self._build_background()
+        surface.blit(self.background, (0, 0))
         self.draw_title(surface)
         self.draw_instructions(surface)
     
@@ -154,6 +199,8 @@ class StartScreen:
             if event.key == pygame.K_SPACE:
                 self.start_pressed = True
                 # Stop music when starting
+                if not self.music:
+                    return True
                 try:
                     pygame.mixer.music.set_volume(0.2)  # Fade out over 1 second
                 except:
@@ -164,3 +211,57 @@ class StartScreen:
     def is_start_pressed(self):
         """Check if the start button was pressed."""
         return self.start_pressed
+
+
+def _read_music(path):
+    """
+    Read the bytes of a music file (loader thread).
+
+    Returns:
+        tuple | None: (bytes, extension), None if the file can't be read.
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read(), os.path.splitext(path)[1].lstrip(".")
+    except OSError as e:
+        print(f"Could not load music: {e}")
+        return None  # If music file not found, continue without music
+
+
+def _open_music(music):
+    """
+    Initialize the mixer and load the music read by _read_music (main
+    thread: SDL audio must not be set up from a loader thread).
+
+    Returns:
+        bool: True if the music can be played.
+    """
+    if music is None:
+        return False
+    data, extension = music
+    try:
+        pygame.mixer.init()
+        # To add music to your game:
+        # 1. Place a music file (mp3, ogg, or wav) in the project directory
+        # 2. Update the path
+        pygame.mixer.music.load(io.BytesIO(data), extension)
+        return True
+    except Exception as e:
+        print(f"Could not load music: {e}")
+        return False
+
+
+def _tint(image, color):
+    """
+    Return a copy of a white image multiplied, pixel by pixel, by a color.
+
+    Args:
+        image (pygame.Surface): White image with per-pixel alpha.
+        color (tuple): RGB multiplier.
+    """
+    tinted = image.copy()
+    # Multiply every RGB channel in place; the alpha channel is kept
+    pixels = pygame.surfarray.pixels3d(tinted)
+    pixels[...] = pixels.astype(np.uint16) * np.array(color[:3], dtype=np.uint16) // 255
+    del pixels  # Unlock the surface
+    return tinted
@@ -0,0 +1,50 @@
+"""Bounded cache of computed values, evicting the least recently used."""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Lazily filled cache with least-recently-used eviction."""
+
+    def __init__(self, compute, capacity=256):
+        """
+        Initialize an empty cache.
+
+        Args:
+            compute (callable): compute(*key) returning the value of a key.
+            capacity (int): Maximum number of values kept.
+        """
+        self.compute = compute
+        self.capacity = capacity
+        self._values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, *key):
+        """
+        Return the value of a key, computing it on first use.
+
+        Args:
+            *key: Hashable parameters, passed to compute on a miss.
+
+        Returns:
+            The cached value.
+        """
+        value = self._values.get(key)
+        if value is not None:
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = self.compute(*key)
+        self._values[key] = value
+        if len(self._values) > self.capacity:
+            self._values.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Remove every value."""
+        self._values.clear()